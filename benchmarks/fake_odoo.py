@@ -0,0 +1,490 @@
+"""
+Local stand-in for the Odoo XML-RPC API, to benchmark `OdooClient`,
+`AsyncOdooClient`, `OdooService` and the sync tasks without a live Odoo.
+
+Serves `/xmlrpc/2/common` (`authenticate`, `version`) and `/xmlrpc/2/object`
+(`execute_kw` with `search_read`, `search_count`, `search`, `read`, `create`,
+`write`, `unlink`) over generated `res.partner` and `account.move` datasets.
+Records are generated on the fly from their id and only writes are stored, so a
+million records take little memory. Domains (prefix notation, `&`/`|`/`!`) and
+`order` specs are evaluated, search results are cached until the model is
+written to, so paging through a large dataset costs a slice per page, like an
+index would. Top-level `id` leaves (`>`, `>=`, `in`) narrow the scanned ids,
+like the primary key would for keyset pages.
+
+Latency can be injected per call and per returned record, and a share of the
+calls can be answered with `503 Service Unavailable`. Call counters are served
+on `/xmlrpc/2/fake` (`stats`, `reset`).
+
+Usage:
+```
+uv run python -m benchmarks.fake_odoo --contacts 100000 --invoices 100000 \\
+    --latency-ms 20 --port 8069
+```
+and point the API/worker at it with
+`ODOO_PROTOCOL=http ODOO_HOST=127.0.0.1 ODOO_PORT=8069`.
+"""
+
+import argparse
+import itertools
+import random
+import threading
+import time
+import xmlrpc.client
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+from socketserver import ThreadingMixIn
+from typing import Any, Callable, Iterable, Iterator, Optional
+from xmlrpc.server import (
+    MultiPathXMLRPCServer,
+    SimpleXMLRPCDispatcher,
+    SimpleXMLRPCRequestHandler,
+)
+
+FAKE_UID = 2
+EPOCH = datetime(2024, 1, 1)
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+COMPANY_EVERY = 50  # every 50th partner is a company
+SEARCH_CACHE_SIZE = 32
+
+Domain = list
+Predicate = Callable[[dict], bool]
+
+
+def _write_date(seconds: int) -> str:
+    return (EPOCH + timedelta(seconds=seconds)).strftime(DATETIME_FORMAT)
+
+
+def make_partner(id_: int) -> dict:
+    is_company = id_ % COMPANY_EVERY == 0
+    company = (id_ // COMPANY_EVERY + 1) * COMPANY_EVERY
+    return {
+        "id": id_,
+        "name": f"Company {id_}" if is_company else f"Contact {id_}",
+        "display_name": f"Contact {id_}",
+        "email": f"contact{id_}@example.com",
+        "is_company": is_company,
+        "company_id": False if is_company else [company, f"Company {company}"],
+        "write_date": _write_date(id_),
+    }
+
+
+def make_invoice(id_: int) -> dict:
+    partner = id_ % 1000 + 1
+    return {
+        "id": id_,
+        "name": f"INV/2024/{id_:07d}",
+        "partner_id": [partner, f"Contact {partner}"],
+        "invoice_date": (EPOCH + timedelta(days=id_ % 365)).strftime("%Y-%m-%d"),
+        "amount_total": round(100 + (id_ % 997) * 1.5, 2),
+        "state": "posted" if id_ % 7 else "draft",
+        "move_type": "in_invoice" if id_ % 10 == 0 else "out_invoice",
+        "write_date": _write_date(id_),
+    }
+
+
+OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "=": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    "in": lambda a, b: a in b,
+    "not in": lambda a, b: a not in b,
+    "like": lambda a, b: str(b) in str(a),
+    "ilike": lambda a, b: str(b).lower() in str(a).lower(),
+}
+
+
+def _leaf(field: str, operator: str, value: Any) -> Predicate:
+    compare = OPERATORS[operator]
+
+    def predicate(record: dict) -> bool:
+        current = record.get(field, False)
+        # many2one fields are [id, name], domains compare the id
+        if isinstance(current, list) and current and not isinstance(value, list):
+            current = current[0]
+        if current is False and operator not in ("=", "!=", "in", "not in"):
+            return False
+        return compare(current, value)
+
+    return predicate
+
+
+def compile_domain(domain: Domain) -> Predicate:
+    """
+    Odoo domain in prefix notation to a predicate, leaves are implicitly and-ed.
+    """
+    stack: list[Predicate] = []
+    for term in reversed(domain):
+        if term == "!":
+            operand = stack.pop()
+            stack.append(lambda r, p=operand: not p(r))
+        elif term in ("&", "|"):
+            left, right = stack.pop(), stack.pop()
+            if term == "&":
+                stack.append(lambda r, a=left, b=right: a(r) and b(r))
+            else:
+                stack.append(lambda r, a=left, b=right: a(r) or b(r))
+        else:
+            stack.append(_leaf(*term))
+    return lambda record: all(predicate(record) for predicate in stack)
+
+
+def top_level_leaves(domain: Domain) -> list[tuple]:
+    """Leaves and-ed with the whole domain, i.e. not operands of an operator."""
+    leaves: list[tuple] = []
+    expected = 0  # operands missing to close the current top-level term
+    for term in domain:
+        arity = 1 if term == "!" else 2 if term in ("&", "|") else 0
+        if expected:
+            expected -= 1
+        elif not arity:
+            leaves.append(tuple(term))
+        expected += arity
+    return leaves
+
+
+def sort_ids(records: list[dict], order: Optional[str]) -> list[int]:
+    """Sort by an Odoo `order` spec, e.g. `write_date desc, id desc`."""
+    keys = [part.split() for part in (order or "id").split(",")]
+    # stable sorts, least significant key first
+    for key in reversed(keys):
+        field, direction = key[0], key[1].lower() if len(key) > 1 else "asc"
+        records.sort(key=lambda r: r.get(field) or 0, reverse=direction == "desc")
+    return [record["id"] for record in records]
+
+
+class FakeModel:
+    """
+    Generated records of one model, `size` of them with ids 1..size, plus the
+    created, written and unlinked ones.
+    """
+
+    def __init__(self, name: str, size: int, make_record: Callable[[int], dict]):
+        self.name = name
+        self.size = size
+        self.make_record = make_record
+        self._lock = threading.Lock()
+        self._search_lock = threading.Lock()
+        self._changed: dict[int, dict] = {}
+        self._deleted: set[int] = set()
+        self._next_id = size + 1
+        self._clock = size  # write_date seconds of the next write
+        # (domain, order) -> sorted ids, cleared on writes
+        self._searches: OrderedDict[tuple[str, str], list[int]] = OrderedDict()
+
+    def _ids(self, start: int = 1) -> Iterator[int]:
+        for id_ in range(start, self.size + 1):
+            if id_ not in self._deleted:
+                yield id_
+        first_created = max(start, self.size + 1)
+        yield from (id_ for id_ in list(self._changed) if id_ >= first_created)
+
+    def _candidate_ids(self, domain: Domain) -> Iterable[int]:
+        for field, operator, value in top_level_leaves(domain):
+            if field != "id":
+                continue
+            if operator == "in":
+                return sorted(set(value))
+            if operator in (">", ">="):
+                return self._ids(value + 1 if operator == ">" else value)
+        return self._ids()
+
+    def get(self, id_: int) -> Optional[dict]:
+        if id_ in self._deleted:
+            return None
+        if id_ in self._changed:
+            return self._changed[id_]
+        if 1 <= id_ <= self.size:
+            return self.make_record(id_)
+        return None
+
+    def _scan(self, domain: Domain) -> Iterator[dict]:
+        predicate = compile_domain(domain)
+        records = map(self.get, self._candidate_ids(domain))
+        return (record for record in records if record and predicate(record))
+
+    def _cached_search(self, key: tuple[str, str]) -> Optional[list[int]]:
+        with self._lock:
+            ids = self._searches.get(key)
+            if ids is not None:
+                self._searches.move_to_end(key)
+            return ids
+
+    def search(
+        self, domain: Domain, order: Optional[str] = None, limit: Optional[int] = None
+    ) -> list[int]:
+        by_ids = any(leaf[:2] == ("id", "in") for leaf in top_level_leaves(domain))
+        if (order or "id") in ("id", "id asc") and (limit or by_ids):
+            # keyset pages: few candidates in id order, scanned without the cache
+            matches = (record["id"] for record in self._scan(domain))
+            return list(itertools.islice(matches, limit))
+        key = (repr(domain), order or "id")
+        ids = self._cached_search(key)
+        if ids is not None:
+            return ids
+        # concurrent pages of the same search wait for a single scan
+        with self._search_lock:
+            ids = self._cached_search(key)
+            if ids is not None:
+                return ids
+            ids = sort_ids(list(self._scan(domain)), order)
+            with self._lock:
+                self._searches[key] = ids
+                while len(self._searches) > SEARCH_CACHE_SIZE:
+                    self._searches.popitem(last=False)
+            return ids
+
+    def _touch(self) -> str:
+        self._clock += 1
+        self._searches.clear()
+        return _write_date(self._clock)
+
+    def create(self, values: dict) -> int:
+        with self._lock:
+            id_ = self._next_id
+            self._next_id += 1
+            record = {**self.make_record(id_), **values, "id": id_}
+            record["write_date"] = self._touch()
+            self._changed[id_] = record
+            return id_
+
+    def write(self, ids: list[int], values: dict) -> bool:
+        with self._lock:
+            for id_ in ids:
+                record = self.get(id_)
+                if record is None:
+                    raise xmlrpc.client.Fault(2, f"Record {self.name}({id_}) missing")
+                self._changed[id_] = {**record, **values, "write_date": self._touch()}
+            return True
+
+    def unlink(self, ids: list[int]) -> bool:
+        with self._lock:
+            for id_ in ids:
+                self._changed.pop(id_, None)
+                self._deleted.add(id_)
+            self._touch()
+            return True
+
+
+class FakeOdoo:
+    """XML-RPC handlers of the fake Odoo, with call counters."""
+
+    def __init__(
+        self,
+        contacts: int = 1000,
+        invoices: int = 1000,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        record_latency_us: float = 0.0,
+        api_key: Optional[str] = None,
+    ):
+        self.models = {
+            "res.partner": FakeModel("res.partner", contacts, make_partner),
+            "account.move": FakeModel("account.move", invoices, make_invoice),
+        }
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.record_latency_us = record_latency_us
+        self.api_key = api_key
+        self._lock = threading.Lock()
+        self.calls: Counter[str] = Counter()
+        self.records = 0
+
+    def _count(self, name: str, records: int = 0) -> None:
+        with self._lock:
+            self.calls[name] += 1
+            self.records += records
+
+    def _sleep(self, records: int = 0) -> None:
+        delay = self.latency_ms / 1000 + records * self.record_latency_us / 1e6
+        if self.jitter_ms:
+            delay += random.uniform(0, self.jitter_ms) / 1000
+        if delay:
+            time.sleep(delay)
+
+    def authenticate(self, db: str, login: str, api_key: str, _env: dict) -> Any:
+        self._count("common.authenticate")
+        self._sleep()
+        if self.api_key and api_key != self.api_key:
+            return False
+        return FAKE_UID
+
+    def version(self) -> dict:
+        self._count("common.version")
+        return {"server_version": "17.0-fake", "protocol_version": 1}
+
+    def execute_kw(
+        self,
+        db: str,
+        uid: int,
+        api_key: str,
+        model: str,
+        method: str,
+        args: list,
+        kwargs: Optional[dict] = None,
+    ) -> Any:
+        if uid != FAKE_UID or (self.api_key and api_key != self.api_key):
+            raise xmlrpc.client.Fault(3, "Access Denied")
+        if model not in self.models:
+            raise xmlrpc.client.Fault(2, f"Object {model} doesn't exist")
+        handler = getattr(self, f"_{method}", None)
+        if handler is None:
+            raise xmlrpc.client.Fault(2, f"Method {method} not supported")
+
+        result = handler(self.models[model], *args, **(kwargs or {}))
+        records = len(result) if method in ("search_read", "read") else 0
+        self._count(f"{model}.{method}", records)
+        self._sleep(records)
+        return result
+
+    @staticmethod
+    def _project(record: dict, fields: Optional[list[str]]) -> dict:
+        if not fields:
+            return record
+        return {"id": record["id"], **{f: record.get(f, False) for f in fields}}
+
+    def _search_read(
+        self,
+        model: FakeModel,
+        domain: Domain,
+        fields: Optional[list[str]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        order: Optional[str] = None,
+    ) -> list[dict]:
+        ids = model.search(domain, order)
+        page = ids[offset : offset + limit if limit else None]
+        return [self._project(model.get(id_), fields) for id_ in page]
+
+    def _search_count(self, model: FakeModel, domain: Domain) -> int:
+        return len(model.search(domain))
+
+    def _search(
+        self,
+        model: FakeModel,
+        domain: Domain,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        order: Optional[str] = None,
+    ) -> list[int]:
+        end = offset + limit if limit else None
+        return model.search(domain, order, end)[offset:end]
+
+    def _read(
+        self, model: FakeModel, ids: list[int], fields: Optional[list[str]] = None
+    ) -> list[dict]:
+        records = (model.get(id_) for id_ in ids)
+        return [self._project(record, fields) for record in records if record]
+
+    def _create(self, model: FakeModel, values: dict | list[dict]) -> int | list[int]:
+        if isinstance(values, list):
+            return [model.create(item) for item in values]
+        return model.create(values)
+
+    def _write(self, model: FakeModel, ids: list[int], values: dict) -> bool:
+        return model.write(ids, values)
+
+    def _unlink(self, model: FakeModel, ids: list[int]) -> bool:
+        return model.unlink(ids)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"calls": dict(self.calls), "records": self.records}
+
+    def reset(self) -> bool:
+        with self._lock:
+            self.calls.clear()
+            self.records = 0
+        return True
+
+
+class _RequestHandler(SimpleXMLRPCRequestHandler):
+    rpc_paths = ("/xmlrpc/2/common", "/xmlrpc/2/object", "/xmlrpc/2/fake")
+    # keep-alive, like Odoo behind a proxy
+    protocol_version = "HTTP/1.1"
+    error_rate = 0.0
+
+    def do_POST(self):
+        if self.error_rate and random.random() < self.error_rate:
+            length = int(self.headers.get("content-length", 0))
+            self.rfile.read(length)
+            self.send_response(503, "Service Unavailable")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        super().do_POST()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeOdooServer(ThreadingMixIn, MultiPathXMLRPCServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def build_server(
+    odoo: FakeOdoo, host: str = "127.0.0.1", port: int = 8069, error_rate: float = 0.0
+) -> FakeOdooServer:
+    handler = type("RequestHandler", (_RequestHandler,), {"error_rate": error_rate})
+    server = FakeOdooServer(
+        (host, port), requestHandler=handler, logRequests=False, allow_none=True
+    )
+    endpoints = {
+        "/xmlrpc/2/common": (odoo.authenticate, odoo.version),
+        "/xmlrpc/2/object": (odoo.execute_kw,),
+        "/xmlrpc/2/fake": (odoo.stats, odoo.reset),
+    }
+    for path, functions in endpoints.items():
+        dispatcher = SimpleXMLRPCDispatcher(allow_none=True)
+        for function in functions:
+            dispatcher.register_function(function)
+        server.add_dispatcher(path, dispatcher)
+    return server
+
+
+def serve(
+    contacts: int,
+    invoices: int,
+    host: str = "127.0.0.1",
+    port: int = 8069,
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    record_latency_us: float = 0.0,
+    error_rate: float = 0.0,
+    ready: Optional[threading.Event] = None,
+) -> None:
+    """Run the fake Odoo until interrupted, `ready` is set once it listens."""
+    odoo = FakeOdoo(contacts, invoices, latency_ms, jitter_ms, record_latency_us)
+    server = build_server(odoo, host, port, error_rate)
+    if ready is not None:
+        ready.set()
+    with server:
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8069)
+    parser.add_argument("--contacts", type=int, default=1000)
+    parser.add_argument("--invoices", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--record-latency-us", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    print(f"fake odoo listening on http://{args.host}:{args.port}/xmlrpc/2")
+    serve(
+        args.contacts,
+        args.invoices,
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        record_latency_us=args.record_latency_us,
+        error_rate=args.error_rate,
+    )
@@ -0,0 +1,161 @@
+"""
+HTTP load test of the API: p50/p95/p99 latency, throughput and SQL statements
+per request of `/api/contacts`, `/api/invoices`, `/api/auth/login` and
+`/api/auth/me`, written into a JSON baseline to diff between commits.
+
+Runs against the Postgres/Redis of the `.env` settings, e.g. the docker-compose
+services (`POSTGRES_PORT=5439`, Redis on 6380) with the migrations applied.
+
+Usage:
+```
+uv run python -m benchmarks.load seed --contacts 100000 --invoices 100000
+uv run python -m benchmarks.load run --rps 200 --duration 30 --output before.json
+uv run python -m benchmarks.load run --rps 200 --duration 30 --output after.json
+uv run python -m benchmarks.load compare before.json after.json
+```
+`run` boots `main:app` itself, `--url` targets an already running API instead
+(SQL statements are not counted then).
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+import httpx
+
+from benchmarks.load.runner import default_scenarios, login, run_scenario
+from benchmarks.load.seed import seed
+from benchmarks.load.server import AppServer, QueryCounter
+
+COMPARED_METRICS = ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_all(
+    url: str, args: argparse.Namespace, queries: Optional[QueryCounter]
+) -> dict[str, Any]:
+    scenarios = [
+        scenario
+        for scenario in default_scenarios(args.username, args.password)
+        if not args.endpoints or scenario.name in args.endpoints
+    ]
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    results = {}
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        headers = {
+            "Authorization": f"Bearer {await login(client, args.username, args.password)}"
+        }
+        for scenario in scenarios:
+            result = await run_scenario(
+                client,
+                scenario,
+                headers,
+                rps=args.rps,
+                duration=args.duration,
+                concurrency=args.concurrency,
+                warmup=args.warmup,
+                queries=queries,
+            )
+            results[scenario.name] = result
+            print(
+                f"{scenario.name:<16} {result['requests']:>7} req "
+                f"{result['throughput_rps']:>8.1f} req/s  p50 {result['p50_ms']:>8.2f}"
+                f"  p95 {result['p95_ms']:>8.2f}  p99 {result['p99_ms']:>8.2f} ms  "
+                f"errors {result['errors']}  queries/req "
+                f"{result['db_queries_per_request']}"
+            )
+    return results
+
+
+def run(args: argparse.Namespace) -> None:
+    if args.url:
+        endpoints = asyncio.run(run_all(args.url, args, queries=None))
+    else:
+        with AppServer(port=args.port) as server:
+            endpoints = asyncio.run(run_all(server.url, args, server.queries))
+
+    baseline = {
+        "commit": _git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "rps": args.rps,
+        "duration": args.duration,
+        "concurrency": args.concurrency,
+        "endpoints": endpoints,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"baseline written to {args.output}")
+
+
+def compare(args: argparse.Namespace) -> None:
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+    print(f"{before.get('commit')} -> {after.get('commit')}")
+    for name, result in after["endpoints"].items():
+        previous = before["endpoints"].get(name)
+        if previous is None:
+            print(f"{name:<16} new")
+            continue
+        deltas = []
+        for metric in (*COMPARED_METRICS, "db_queries_per_request"):
+            old, new = previous.get(metric), result.get(metric)
+            if old is None or new is None:
+                continue
+            change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+            deltas.append(f"{metric} {old} -> {new} ({change})")
+        print(f"{name:<16} " + ", ".join(deltas))
+
+
+def seed_command(args: argparse.Namespace) -> None:
+    asyncio.run(seed(args.contacts, args.invoices, args.username, args.password))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = subparsers.add_parser("seed", help="seed the database")
+    seed_parser.add_argument("--contacts", type=int, default=100_000)
+    seed_parser.add_argument("--invoices", type=int, default=100_000)
+    seed_parser.set_defaults(handler=seed_command)
+
+    run_parser = subparsers.add_parser("run", help="run the load test")
+    run_parser.add_argument("--url", help="already running API, e.g. http://localhost")
+    run_parser.add_argument("--port", type=int, default=8001)
+    run_parser.add_argument(
+        "--rps", type=float, default=100, help="request rate, 0 for max throughput"
+    )
+    run_parser.add_argument("--duration", type=float, default=20)
+    run_parser.add_argument("--warmup", type=float, default=2)
+    run_parser.add_argument("--concurrency", type=int, default=50)
+    run_parser.add_argument("--endpoints", nargs="+", help="scenario names to run")
+    run_parser.add_argument("--output", help="write the baseline to this JSON file")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = subparsers.add_parser("compare", help="diff two baselines")
+    compare_parser.add_argument("before")
+    compare_parser.add_argument("after")
+    compare_parser.set_defaults(handler=compare)
+
+    for subparser in (seed_parser, run_parser):
+        subparser.add_argument("--username", default="loadtest")
+        subparser.add_argument("--password", default="loadtest-password")
+
+    args = parser.parse_args()
+    args.handler(args)
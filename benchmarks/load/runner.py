@@ -0,0 +1,197 @@
+"""
+Load driver: runs each endpoint scenario at a fixed request rate (open loop) or
+as fast as `concurrency` allows (closed loop), and summarizes latencies.
+
+Open-loop latencies are measured from the time a request was scheduled, not
+sent, so a saturated server shows up as queueing delay instead of silently
+lowering the request rate.
+"""
+
+import asyncio
+import statistics
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import httpx
+
+from benchmarks.load.server import QueryCounter
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    path: str
+    params: dict[str, Any] = field(default_factory=dict)
+    # form fields, sent url-encoded
+    data: Optional[dict[str, str]] = None
+    authenticated: bool = True
+
+
+def default_scenarios(username: str, password: str) -> list[Scenario]:
+    return [
+        Scenario("contacts", "GET", "/api/contacts", {"page": 1, "per_page": 100}),
+        Scenario(
+            "contacts_cursor",
+            "GET",
+            "/api/contacts",
+            {"pagination": "cursor", "per_page": 100},
+        ),
+        Scenario("invoices", "GET", "/api/invoices", {"page": 1, "per_page": 100}),
+        Scenario("auth_me", "GET", "/api/auth/me"),
+        Scenario(
+            "auth_login",
+            "POST",
+            "/api/auth/login",
+            data={"username": username, "password": password},
+            authenticated=False,
+        ),
+    ]
+
+
+@dataclass
+class Samples:
+    latencies: list[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    cache: Counter = field(default_factory=Counter)
+
+
+async def login(client: httpx.AsyncClient, username: str, password: str) -> str:
+    response = await client.post(
+        "/api/auth/login", data={"username": username, "password": password}
+    )
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def _request(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    headers: dict[str, str],
+    samples: Samples,
+    started: float,
+) -> None:
+    try:
+        response = await client.request(
+            scenario.method,
+            scenario.path,
+            params=scenario.params,
+            data=scenario.data,
+            headers=headers if scenario.authenticated else None,
+        )
+        samples.statuses[str(response.status_code)] += 1
+        samples.cache[response.headers.get("x-cache", "none")] += 1
+    except httpx.HTTPError as e:
+        samples.statuses[type(e).__name__] += 1
+    samples.latencies.append(time.perf_counter() - started)
+
+
+async def _open_loop(
+    client, scenario, headers, samples, rps: float, duration: float, concurrency
+) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(scheduled: float) -> None:
+        async with semaphore:
+            await _request(client, scenario, headers, samples, scheduled)
+
+    start = time.perf_counter()
+    tasks = []
+    for i in range(int(rps * duration)):
+        scheduled = start + i / rps
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(send(scheduled)))
+    await asyncio.gather(*tasks)
+
+
+async def _closed_loop(
+    client, scenario, headers, samples, duration: float, concurrency: int
+) -> None:
+    deadline = time.perf_counter() + duration
+
+    async def worker() -> None:
+        while time.perf_counter() < deadline:
+            await _request(client, scenario, headers, samples, time.perf_counter())
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+def summarize(samples: Samples, seconds: float) -> dict[str, Any]:
+    latencies = sorted(samples.latencies)
+    if len(latencies) > 1:
+        quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = quantiles[49], quantiles[94], quantiles[98]
+    else:
+        p50 = p95 = p99 = latencies[0] if latencies else 0.0
+    errors = sum(
+        count
+        for status, count in samples.statuses.items()
+        if not status.startswith("2")
+    )
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / seconds, 1) if seconds else 0.0,
+        "p50_ms": round(p50 * 1000, 2),
+        "p95_ms": round(p95 * 1000, 2),
+        "p99_ms": round(p99 * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        "statuses": dict(samples.statuses),
+        "cache": dict(samples.cache),
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    headers: dict[str, str],
+    rps: float,
+    duration: float,
+    concurrency: int,
+    warmup: float = 1.0,
+    queries: Optional[QueryCounter] = None,
+) -> dict[str, Any]:
+    """
+    Args:
+        client: client of the app, its connection limit should allow `concurrency`
+        scenario: the endpoint request
+        headers: sent with authenticated scenarios
+        rps: request rate, 0 for as fast as `concurrency` allows
+        duration: seconds of measured load
+        concurrency: max in-flight requests
+        warmup: seconds of load before the measurement, not recorded
+        queries: SQL statement counter of the app process, when it's local
+    Returns:
+        dict: request count, throughput, latency percentiles, statuses, `X-Cache`
+            values and SQL statements per request
+    """
+
+    async def drive(samples: Samples, seconds: float) -> None:
+        if rps:
+            await _open_loop(
+                client, scenario, headers, samples, rps, seconds, concurrency
+            )
+        else:
+            await _closed_loop(client, scenario, headers, samples, seconds, concurrency)
+
+    if warmup:
+        await drive(Samples(), warmup)
+
+    samples = Samples()
+    if queries is not None:
+        queries.value = 0
+    started = time.perf_counter()
+    await drive(samples, duration)
+    seconds = time.perf_counter() - started
+
+    result = summarize(samples, seconds)
+    result["db_queries_per_request"] = (
+        round(queries.value / result["requests"], 2)
+        if queries is not None and result["requests"]
+        else None
+    )
+    return result
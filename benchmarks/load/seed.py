@@ -0,0 +1,78 @@
+"""
+Seeds the database the load test runs against: generated contacts and invoices
+(the records of `benchmarks.fake_odoo`, COPY-loaded through the staging tables
+of the initial import) and the benchmark user.
+"""
+
+import logging
+from typing import Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.fake_odoo import make_invoice, make_partner
+from src.celery.tasks import _cache_invalidator, _contact_to_row, _invoice_to_row
+from src.db.session import async_session
+from src.repositories.contacts import odoo_contact_staging_loader
+from src.repositories.invoices import odoo_invoice_staging_loader
+from src.repositories.staging import StagingTableLoader
+from src.repositories.users import user_repository
+from src.utils.auth import password_hasher
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 10_000
+
+
+async def _load(
+    db: AsyncSession,
+    loader: StagingTableLoader,
+    size: int,
+    make_record: Callable[[int], dict],
+    to_row: Callable[[dict], dict],
+) -> int:
+    await loader.reset(db)
+    for start in range(1, size + 1, CHUNK_SIZE):
+        stop = min(start + CHUNK_SIZE, size + 1)
+        await loader.copy(db, [to_row(make_record(id_)) for id_ in range(start, stop)])
+    merged = await loader.merge(db)
+    await loader.analyze(db)
+    await loader.drop(db)
+    await db.commit()
+    return merged
+
+
+async def seed_user(db: AsyncSession, username: str, password: str) -> None:
+    if await user_repository.get_by_username(db, username=username):
+        return
+    await user_repository.create(
+        db,
+        obj_in={
+            "username": username,
+            "email": f"{username}@example.com",
+            "hashed_password": await password_hasher.hash(password),
+        },
+    )
+
+
+async def seed(contacts: int, invoices: int, username: str, password: str) -> None:
+    """
+    Idempotent, records are upserted by their Odoo id and the user is only
+    created when missing. Cached API responses of the tables are invalidated.
+    """
+    async with async_session() as db:
+        merged = await _load(
+            db, odoo_contact_staging_loader, contacts, make_partner, _contact_to_row
+        )
+        logger.info(f"seeded {contacts} contacts, {merged} rows changed")
+        merged = await _load(
+            db, odoo_invoice_staging_loader, invoices, make_invoice, _invoice_to_row
+        )
+        logger.info(f"seeded {invoices} invoices, {merged} rows changed")
+        await seed_user(db, username, password)
+
+    tables = (
+        odoo_contact_staging_loader.model.__tablename__,
+        odoo_invoice_staging_loader.model.__tablename__,
+    )
+    async with _cache_invalidator(*tables) as invalidate:
+        await invalidate()
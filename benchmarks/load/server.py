@@ -0,0 +1,85 @@
+"""
+Boots `main:app` with uvicorn in a child process, counting the SQL statements
+the app executes into a counter shared with the load driver.
+"""
+
+import multiprocessing
+import time
+from multiprocessing.sharedctypes import Synchronized
+from typing import Optional
+
+import httpx
+
+# statements executed by the app process, reset by the driver per scenario
+QueryCounter = Synchronized
+
+
+def _serve(host: str, port: int, queries: QueryCounter) -> None:
+    import uvicorn
+    from sqlalchemy import event
+
+    from main import app
+    from src.db.session import engine
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_query(*args, **kwargs):
+        with queries.get_lock():
+            queries.value += 1
+
+    config = uvicorn.Config(
+        app, host=host, port=port, log_config=None, access_log=False
+    )
+    uvicorn.Server(config).run()
+
+
+class AppServer:
+    """
+    Usage:
+    ```
+    with AppServer(port=8001) as server:
+        ...
+        server.queries.value
+    ```
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8001):
+        self.host = host
+        self.port = port
+        self.context = multiprocessing.get_context("spawn")
+        self.queries: QueryCounter = self.context.Value("q", 0)
+        self.process: Optional[multiprocessing.Process] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self, timeout: float = 60.0) -> None:
+        self.process = self.context.Process(
+            target=_serve, args=(self.host, self.port, self.queries), daemon=True
+        )
+        self.process.start()
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if not self.process.is_alive():
+                raise RuntimeError("app server exited during startup")
+            try:
+                if httpx.get(f"{self.url}/health").status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.2)
+        self.stop()
+        raise RuntimeError(f"app server didn't start within {timeout}s")
+
+    def stop(self) -> None:
+        if self.process is not None:
+            self.process.terminate()
+            self.process.join()
+            self.process = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
@@ -0,0 +1,104 @@
+"""
+Per-request overhead of `PaginationMiddleware`, compared with the previous
+`BaseHTTPMiddleware` implementation and with no middleware at all.
+
+Requests are driven straight through the ASGI interface, without a server or
+HTTP client, so the numbers only contain the middleware and routing cost.
+
+Usage:
+```
+uv run python -m benchmarks.middleware_overhead --requests 20000
+```
+"""
+
+import argparse
+import asyncio
+import time
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from src.middleware.pagination import PaginationMiddleware, request_object
+
+
+class BaseHTTPPaginationMiddleware(BaseHTTPMiddleware):
+    """The previous implementation, kept here as the baseline."""
+
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        request_object.set(request)
+        response = await call_next(request)
+        return response
+
+
+async def endpoint(request: Request) -> JSONResponse:
+    request_object.get(None)
+    return JSONResponse({"items": []})
+
+
+def build_app(middleware: list[Middleware]) -> Starlette:
+    return Starlette(routes=[Route("/items", endpoint)], middleware=middleware)
+
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/items",
+    "raw_path": b"/items",
+    "query_string": b"page=2&per_page=100",
+    "root_path": "",
+    "headers": [(b"host", b"localhost")],
+    "client": ("127.0.0.1", 12345),
+    "server": ("localhost", 80),
+}
+
+
+async def receive() -> dict:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message: dict) -> None:
+    pass
+
+
+async def measure(app: Starlette, requests: int) -> float:
+    """Returns microseconds per request."""
+    for _ in range(min(requests, 1000)):  # warm up
+        await app(dict(SCOPE), receive, send)
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(SCOPE), receive, send)
+    return (time.perf_counter() - started) / requests * 1_000_000
+
+
+async def main(requests: int) -> None:
+    apps = {
+        "no middleware": build_app([]),
+        "BaseHTTPMiddleware (before)": build_app(
+            [Middleware(BaseHTTPPaginationMiddleware)]
+        ),
+        "pure ASGI (after)": build_app([Middleware(PaginationMiddleware)]),
+    }
+    baseline = None
+    for name, app in apps.items():
+        per_request = await measure(app, requests)
+        baseline = baseline or per_request
+        print(
+            f"{name:<30} {per_request:8.1f} us/request"
+            f"  ({per_request - baseline:+.1f} us)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
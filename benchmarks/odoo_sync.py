@@ -0,0 +1,204 @@
+"""
+End-to-end throughput of the Odoo sync against the fake Odoo server
+(`benchmarks.fake_odoo`), per dataset size.
+
+For every size a fake Odoo is started in a child process with that many
+partners and invoices, the worker settings are pointed at it and
+`sync_odoo_contacts` / `sync_odoo_invoices` run in-process, like a Celery
+worker would run them. Reported are the wall time, records/s (records served by
+`search_read`) and the RPC calls made, per method.
+
+Without `--fetch-only` the tasks write into the configured Postgres database
+(run the migrations first), every run is a full sync. `--fetch-only` runs the
+same paged traversal and row mapping without any database, to isolate the Odoo
+side. `--import-mode` benchmarks the COPY-based initial import instead.
+
+Usage:
+```
+uv run python -m benchmarks.odoo_sync --sizes 1000 100000 1000000 \\
+    --latency-ms 20 --output sync-baseline.json
+```
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import socket
+import time
+import xmlrpc.client
+from typing import Any, Callable
+
+from benchmarks.fake_odoo import serve
+from src.celery.tasks import (
+    SYNC_ORDER,
+    _contact_to_row,
+    _invoice_to_row,
+    sync_odoo_contacts,
+    sync_odoo_invoices,
+)
+from src.core.settings import get_settings
+from src.rpc.circuit_breaker import odoo_circuit_breaker
+from src.rpc.client import DEFAULT_INVOICE_DOMAIN
+from src.rpc.pool import odoo_client_pool
+from src.schemas.odoo.schemas import OdooContactCreate, OdooInvoiceCreate
+from src.services.traversal import OdooKeysetTraversal
+
+settings = get_settings()
+
+MODELS: dict[str, dict[str, Any]] = {
+    "contacts": {
+        "task": sync_odoo_contacts,
+        "odoo_model": "res.partner",
+        "domain": [("is_company", "=", False)],
+        "fetch_page": lambda client, domain, limit, offset: client.get_partners(
+            domain=domain, limit=limit, offset=offset, order=SYNC_ORDER
+        ),
+        "to_row": lambda record: OdooContactCreate(**_contact_to_row(record)),
+    },
+    "invoices": {
+        "task": sync_odoo_invoices,
+        "odoo_model": "account.move",
+        "domain": DEFAULT_INVOICE_DOMAIN,
+        "fetch_page": lambda client, domain, limit, offset: client.get_invoices(
+            domain=domain, limit=limit, offset=offset, order=SYNC_ORDER
+        ),
+        "to_row": lambda record: OdooInvoiceCreate(**_invoice_to_row(record)),
+    },
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_fake_odoo(size: int, args: argparse.Namespace) -> multiprocessing.Process:
+    context = multiprocessing.get_context("spawn")
+    ready = context.Event()
+    process = context.Process(
+        target=serve,
+        kwargs={
+            "contacts": size,
+            "invoices": size,
+            "port": int(settings.ODOO_PORT),
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "record_latency_us": args.record_latency_us,
+            "ready": ready,
+        },
+        daemon=True,
+    )
+    process.start()
+    if not ready.wait(timeout=30):
+        process.terminate()
+        raise RuntimeError("fake odoo didn't start")
+    return process
+
+
+async def fetch_only(model: dict[str, Any]) -> int:
+    """The traversal and row mapping of a full sync, without the DB writes."""
+    domain = model["domain"]
+    fetch_page: Callable = model["fetch_page"]
+    traversal = OdooKeysetTraversal(
+        count=lambda client: client.get_count(model["odoo_model"], domain),
+        search_ids=lambda client, after_id, limit: client.search_ids(
+            model["odoo_model"], domain + [("id", ">", after_id)], limit, order="id"
+        ),
+        fetch_ids=lambda client, ids: fetch_page(
+            client, domain + [("id", "in", ids)], len(ids), 0
+        ),
+    )
+    rows = 0
+    async for records in traversal.iter_pages():
+        rows += len([model["to_row"](record) for record in records if record["id"]])
+    return rows
+
+
+def run(name: str, size: int, args: argparse.Namespace, fake) -> dict[str, Any]:
+    model = MODELS[name]
+    fake.reset()
+    started = time.perf_counter()
+    if args.fetch_only:
+        asyncio.run(fetch_only(model))
+    else:
+        model["task"](full=True, import_mode=args.import_mode)
+    seconds = time.perf_counter() - started
+    stats = fake.stats()
+    return {
+        "model": name,
+        "size": size,
+        "seconds": round(seconds, 3),
+        "records": stats["records"],
+        "records_per_second": round(stats["records"] / seconds, 1),
+        "rpc_calls": sum(stats["calls"].values()),
+        "rpc_calls_by_method": stats["calls"],
+    }
+
+
+def main(args: argparse.Namespace) -> None:
+    settings.ODOO_PROTOCOL = "http"
+    settings.ODOO_HOST = "127.0.0.1"
+    settings.ODOO_PORT = str(args.port or free_port())
+    # measure Odoo, not the shared breaker state
+    odoo_circuit_breaker.shared = False
+    fake = xmlrpc.client.ServerProxy(
+        f"http://{settings.ODOO_HOST}:{settings.ODOO_PORT}/xmlrpc/2/fake"
+    )
+    print(
+        f"page size {settings.ODOO_SYNC_PAGE_SIZE}, {settings.ODOO_SYNC_WORKERS} "
+        f"workers, {args.latency_ms} ms latency"
+        f"{', fetch only' if args.fetch_only else ''}"
+    )
+
+    results = []
+    for size in args.sizes:
+        process = start_fake_odoo(size, args)
+        try:
+            for name in args.models:
+                result = run(name, size, args, fake)
+                results.append(result)
+                print(
+                    f"{name:<9} {size:>9,} records {result['seconds']:9.2f} s "
+                    f"{result['records_per_second']:>12,.0f} records/s "
+                    f"{result['rpc_calls']:>6} RPC calls {result['rpc_calls_by_method']}"
+                )
+        finally:
+            # pooled keep-alive connections point at the stopped server
+            odoo_client_pool.close()
+            process.terminate()
+            process.join()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "page_size": settings.ODOO_SYNC_PAGE_SIZE,
+                    "workers": settings.ODOO_SYNC_WORKERS,
+                    "latency_ms": args.latency_ms,
+                    "fetch_only": args.fetch_only,
+                    "import_mode": args.import_mode,
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000]
+    )
+    parser.add_argument(
+        "--models", nargs="+", choices=list(MODELS), default=list(MODELS)
+    )
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--record-latency-us", type=float, default=0.0)
+    parser.add_argument("--fetch-only", action="store_true")
+    parser.add_argument("--import-mode", action="store_true")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    main(parser.parse_args())
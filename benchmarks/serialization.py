@@ -0,0 +1,104 @@
+"""
+Serialization throughput of a contact list page, per page size.
+
+- `orm + jsonable_encoder`: the previous path, ORM entities walked by FastAPI's
+  `jsonable_encoder`, then rendered with the stdlib `json`
+- `rows + orjson`: column-projected rows (dicts) rendered with orjson, the path
+  of the list endpoints
+- `pydantic read schema`: rows validated into `OdooContactRead` and dumped to
+  JSON by pydantic, what a `response_model` would cost
+
+Rows are built in memory, no database is needed.
+
+Usage:
+```
+uv run python -m benchmarks.serialization --sizes 100 1000 10000
+```
+"""
+
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from src.models import OdooContact
+from src.repositories.contacts import odoo_contact_repository
+from src.schemas.odoo.schemas import OdooContactRead
+from src.utils.serialization import dumps
+
+
+def make_row(index: int) -> dict[str, Any]:
+    now = datetime.now(timezone.utc)
+    return {
+        "id": uuid.uuid4(),
+        "odoo_id": index,
+        "name": f"Contact {index}",
+        "email": f"contact{index}@example.com",
+        "company_name": "Example Company",
+        "company_id": [1, "Example Company"],
+        "is_company": False,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def page(items: list) -> dict:
+    return {"total_count": len(items), "next_page": None, "previous_page": None}
+
+
+def orm_jsonable_encoder(rows: list[dict]) -> Callable[[], bytes]:
+    entities = [OdooContact(**row) for row in rows]
+    return lambda: json.dumps(
+        jsonable_encoder({**page(entities), "items": entities})
+    ).encode()
+
+
+def rows_orjson(rows: list[dict]) -> Callable[[], bytes]:
+    return lambda: dumps({**page(rows), "items": rows})
+
+
+def pydantic_schema(rows: list[dict]) -> Callable[[], bytes]:
+    adapter = TypeAdapter(list[OdooContactRead])
+    return lambda: adapter.dump_json(adapter.validate_python(rows))
+
+
+def measure(render: Callable[[], bytes], min_seconds: float = 1.0) -> float:
+    """Returns seconds per render."""
+    render()  # warm up
+    runs, started = 0, time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < min_seconds:
+        render()
+        runs += 1
+    return elapsed / runs
+
+
+def main(sizes: list[int]) -> None:
+    assert set(odoo_contact_repository.read_columns) == set(make_row(0))
+    paths = {
+        "orm + jsonable_encoder": orm_jsonable_encoder,
+        "rows + orjson": rows_orjson,
+        "pydantic read schema": pydantic_schema,
+    }
+    for size in sizes:
+        rows = [make_row(index) for index in range(size)]
+        print(f"{size} rows per page")
+        baseline = None
+        for name, build in paths.items():
+            seconds = measure(build(rows))
+            baseline = baseline or seconds
+            print(
+                f"  {name:<24} {seconds * 1000:9.2f} ms/page "
+                f"{size / seconds:12,.0f} rows/s  x{baseline / seconds:.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    args = parser.parse_args()
+    main(args.sizes)
@@ -2,13 +2,29 @@ import logging
 from contextlib import asynccontextmanager
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.core.logger import init_logging
+from src.core.metrics import render_metrics
+from src.core.redis_client import redis_cache_client
 from src.core.settings import get_settings
+from src.db.session import engine
+from src.middleware.metrics import MetricsMiddleware
 from src.middleware.pagination import PaginationMiddleware
-from src.routers import auth_router, contacts_router, invoices_router, odoo_router
+from src.middleware.query_profiler import QueryProfilerMiddleware
+from src.middleware.request_id import RequestIdMiddleware
+from src.routers import (
+    auth_router,
+    contacts_router,
+    invoices_router,
+    jobs_router,
+    odoo_router,
+)
+from src.rpc.async_client import async_odoo_client
+from src.utils.auth import password_hasher
+from src.utils.exceptions import OdooCircuitOpenError, RedisConnectionError
+from src.utils.serialization import JSONResponse
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
@@ -25,10 +41,23 @@ async def lifespan(app: FastAPI):
         None: Used to manage startup and shutdown events.
     """
     init_logging()
+    await async_odoo_client.connect()
+    try:
+        await redis_cache_client.connect()
+    except RedisConnectionError as e:
+        logger.warning(f"serving without the redis cache: {e}")
     yield
+    await redis_cache_client.disconnect()
+    await async_odoo_client.disconnect()
+    await engine.dispose()
+    password_hasher.shutdown()
 
 
-app = FastAPI(title="Chift Odoo Test Task API", lifespan=lifespan)
+app = FastAPI(
+    title="Chift Odoo Test Task API",
+    lifespan=lifespan,
+    default_response_class=JSONResponse,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[str(origin) for origin in settings.BACKEND_CORS_ORIGINS],
@@ -37,10 +66,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 app.add_middleware(PaginationMiddleware)
+if settings.SQL_PROFILING:
+    app.add_middleware(QueryProfilerMiddleware)
+app.add_middleware(RequestIdMiddleware)
+# outermost, times the other middlewares too
+app.add_middleware(MetricsMiddleware)
 app.include_router(auth_router)
 app.include_router(contacts_router)
 app.include_router(odoo_router)
 app.include_router(invoices_router)
+app.include_router(jobs_router)
+
+
+@app.exception_handler(OdooCircuitOpenError)
+async def odoo_circuit_open_handler(request: Request, exc: OdooCircuitOpenError):
+    retry_after = int(exc.details.get("retry_after", 0)) + 1
+    return JSONResponse(
+        {"detail": exc.message},
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(retry_after)},
+    )
 
 
 @app.get("/health")
@@ -48,6 +93,12 @@ async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    content, content_type = render_metrics()
+    return Response(content, media_type=content_type)
+
+
 @app.get("/")
 async def root():
     return {"message": "Pong"}
@@ -0,0 +1,42 @@
+"""Unique odoo_id constraints
+
+Revision ID: 8f2b6c0d1e47
+Revises: 3c1d7e9a4b52
+Create Date: 2026-10-17 11:03:54.218640
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8f2b6c0d1e47"
+down_revision: Union[str, Sequence[str], None] = "3c1d7e9a4b52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("odoocontacts", "odooinvoices")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        # keep the most recently updated row of every duplicated odoo_id
+        op.execute(
+            f"""
+            DELETE FROM {table} AS t
+            USING {table} AS newer
+            WHERE t.odoo_id = newer.odoo_id
+              AND (t.updated_at, t.id) < (newer.updated_at, newer.id)
+            """
+        )
+        op.drop_index(op.f(f"ix_{table}_odoo_id"), table_name=table)
+        op.create_index(op.f(f"ix_{table}_odoo_id"), table, ["odoo_id"], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.drop_index(op.f(f"ix_{table}_odoo_id"), table_name=table)
+        op.create_index(op.f(f"ix_{table}_odoo_id"), table, ["odoo_id"], unique=False)
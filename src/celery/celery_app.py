@@ -1,5 +1,24 @@
+import asyncio
+import time
+from contextvars import Token
+from typing import Any, Coroutine, Optional
+
 from celery import Celery
+from celery.signals import (
+    task_postrun,
+    task_prerun,
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+)
+from prometheus_client import start_http_server
+
+from src.core.logger import init_logging, request_id, stop_logging
+from src.core.metrics import celery_task_duration, metrics_registry
 from src.core.settings import get_settings
+from src.db.profiler import QueryProfile, current_profile, log_profile
+from src.db.session import worker_engine
+from src.rpc.pool import odoo_client_pool
 
 # backend dedicated celery app
 settings = get_settings()
@@ -22,6 +41,81 @@ celery_app.conf.beat_schedule = {
     },
 }
 celery_app.conf.timezone = "UTC"
+# job status endpoint reports the task name and running jobs as STARTED
+celery_app.conf.result_extended = True
+celery_app.conf.task_track_started = True
 celery_app.autodiscover_tasks()
 
 celery_app.conf.worker_hijack_root_logger = False
+
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+# task id -> start time of the tasks running in this process
+_task_started_at: dict[str, float] = {}
+# task id -> context token of the task's request id
+_task_request_ids: dict[str, Token] = {}
+# task id -> SQL profile and its context token, with `SQL_PROFILING`
+_task_profiles: dict[str, tuple[QueryProfile, Token]] = {}
+
+
+def run_async(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Run a coroutine on the long-lived event loop of this worker process.
+    Unlike `asyncio.run`, the loop is not closed after each task, so pooled
+    asyncpg connections of `worker_engine` (bound to the loop) are reused.
+    Assumes the prefork/solo worker pool, i.e. one task at a time per process.
+    """
+    global _worker_loop
+    if _worker_loop is None or _worker_loop.is_closed():
+        _worker_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_worker_loop)
+    return _worker_loop.run_until_complete(coro)
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    # the log listener thread of the parent doesn't survive the fork
+    init_logging()
+    # pools are per process, connections must not be shared across forks
+    worker_engine.sync_engine.dispose(close=False)
+    odoo_client_pool.open()
+
+
+@worker_process_shutdown.connect
+def close_worker_process(**kwargs):
+    odoo_client_pool.close()
+    if _worker_loop is not None and not _worker_loop.is_closed():
+        _worker_loop.run_until_complete(worker_engine.dispose())
+        _worker_loop.close()
+    stop_logging()
+
+
+@worker_init.connect
+def start_metrics_server(**kwargs):
+    # served by the main process, aggregating the pool processes in multiprocess mode
+    if settings.CELERY_METRICS_PORT:
+        start_http_server(settings.CELERY_METRICS_PORT, registry=metrics_registry())
+
+
+@task_prerun.connect
+def before_task(task_id=None, task=None, **kwargs):
+    _task_started_at[task_id] = time.perf_counter()
+    _task_request_ids[task_id] = request_id.set(task_id)
+    if settings.SQL_PROFILING and task is not None:
+        # the worker loop's tasks copy this context when `run_async` creates them
+        profile = QueryProfile(f"task {task.name}")
+        _task_profiles[task_id] = (profile, current_profile.set(profile))
+
+
+@task_postrun.connect
+def after_task(task_id=None, task=None, state=None, **kwargs):
+    if task_id in _task_profiles:
+        profile, token = _task_profiles.pop(task_id)
+        current_profile.reset(token)
+        log_profile(profile)
+    if task_id in _task_request_ids:
+        request_id.reset(_task_request_ids.pop(task_id))
+    started = _task_started_at.pop(task_id, None)
+    if started is not None and task is not None:
+        celery_task_duration.labels(task.name, state or "UNKNOWN").observe(
+            time.perf_counter() - started
+        )
@@ -1,127 +1,450 @@
 import asyncio
 import logging
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Awaitable, Callable, Optional
 
-from src.celery.celery_app import celery_app
-from src.db.session import async_session
-from src.repositories.contacts import odoo_contact_repository
-from src.repositories.invoices import odoo_invoice_repository
-from src.schemas.odoo.schemas import (
-    OdooContactCreate,
-    OdooContactUpdate,
-    OdooInvoiceCreate,
-    OdooInvoiceUpdate,
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.celery.celery_app import celery_app, run_async
+from src.core.cache import bump_table_versions
+from src.core.metrics import odoo_sync_records
+from src.core.redis_client import AsyncRedisClient
+from src.core.settings import get_settings
+from src.db.session import worker_async_session
+from src.repositories.contacts import (
+    odoo_contact_repository,
+    odoo_contact_staging_loader,
+)
+from src.repositories.invoices import (
+    odoo_invoice_repository,
+    odoo_invoice_staging_loader,
 )
+from src.repositories.staging import StagingTableLoader
+from src.repositories.sync_state import odoo_sync_state_repository
+from src.rpc.client import DEFAULT_INVOICE_DOMAIN, OdooClient
+from src.rpc.pool import odoo_client_pool
+from src.schemas.api.odoo import InvoiceCreatePayload
+from src.schemas.odoo.schemas import OdooContactCreate, OdooInvoiceCreate
 from src.services.odoo import OdooService
+from src.services.traversal import OdooKeysetTraversal, OdooPageTraversal
+from src.utils.exceptions import RedisConnectionError
 
+settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# order of the records within a page, syncs page by id keyset
+SYNC_ORDER = "id asc"
+# odoo datetime format
+ODOO_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+# imports checkpoint on the id
+IMPORT_ORDER = "id asc"
+
+
+def _contact_to_row(contact: dict) -> dict:
+    # odoo company_id is usually [id, name] or False
+    company_id_raw = contact.get("company_id")
+    company_name = ""
+    if isinstance(company_id_raw, list) and len(company_id_raw) > 1:
+        company_name = company_id_raw[1]
+
+    return {
+        "odoo_id": contact["id"],
+        "name": contact.get("name") or "",
+        "email": contact.get("email") or "",
+        "company_name": company_name,
+        "company_id": company_id_raw,
+    }
+
+
+def _invoice_to_row(invoice: dict) -> dict:
+    return {
+        "odoo_id": invoice["id"],
+        "name": invoice.get("name"),
+        "partner_id": invoice.get("partner_id"),
+        "invoice_date": invoice.get("invoice_date"),
+        "amount_total": invoice.get("amount_total"),
+        "state": invoice.get("state"),
+        "move_type": invoice.get("move_type"),
+    }
+
+
+async def _write_contacts(db: AsyncSession, contacts: list[dict]) -> int:
+    rows = [
+        OdooContactCreate(**_contact_to_row(contact))
+        for contact in contacts
+        if contact.get("id")
+    ]
+    changed = await odoo_contact_repository.bulk_upsert(
+        db, rows, conflict_cols=["odoo_id"]
+    )
+    logger.debug("upserted %s contacts, %s changed", len(rows), changed)
+    return changed
+
+
+async def _write_invoices(db: AsyncSession, invoices: list[dict]) -> int:
+    rows = [
+        OdooInvoiceCreate(**_invoice_to_row(invoice))
+        for invoice in invoices
+        if invoice.get("id")
+    ]
+    changed = await odoo_invoice_repository.bulk_upsert(
+        db, rows, conflict_cols=["odoo_id"]
+    )
+    logger.debug("upserted %s invoices, %s changed", len(rows), changed)
+    return changed
+
+
+@asynccontextmanager
+async def _cache_invalidator(
+    *tables: str,
+) -> AsyncIterator[Callable[[], Awaitable[None]]]:
+    """
+    Yields a callable dropping the API caches derived from the synced tables,
+    to be awaited after each commit. A run-scoped Redis connection is used,
+    without Redis the caches just expire.
+    """
+    redis_client = AsyncRedisClient()
+    try:
+        await redis_client.connect()
+    except RedisConnectionError as e:
+        logger.warning(f"cache of {', '.join(tables)} won't be invalidated: {e}")
+
+    async def invalidate() -> None:
+        await bump_table_versions(*tables, client=redis_client)
+
+    try:
+        yield invalidate
+    finally:
+        await redis_client.disconnect()
+
+
+def _write_date_domain(last_write_date: str) -> list:
+    """
+    Records modified since `ODOO_SYNC_LOOKBACK_SECONDS` before the high-water
+    mark. Odoo stamps `write_date` with the start of the transaction, so a
+    record committed after the mark was read can carry an earlier `write_date`.
+    Re-read records are cheap, unchanged rows are skipped by the upsert.
+    """
+    since = datetime.strptime(last_write_date, ODOO_DATETIME_FORMAT) - timedelta(
+        seconds=settings.ODOO_SYNC_LOOKBACK_SECONDS
+    )
+    return [("write_date", ">=", since.strftime(ODOO_DATETIME_FORMAT))]
+
+
+def _get_latest_mark(odoo_model: str, domain: list) -> Optional[tuple[str, int]]:
+    """
+    `(write_date, id)` of the most recently modified record. Taken before the
+    traversal starts, records modified while it runs are picked up next time.
+    """
+    with odoo_client_pool.acquire() as client:
+        records = client.get_data(
+            odoo_model,
+            fields=["id", "write_date"],
+            domain=domain,
+            limit=1,
+            order="write_date desc, id desc",
+        )
+    if not records or not records[0].get("write_date"):
+        return None
+    return records[0]["write_date"], records[0]["id"]
+
+
+async def _sync_model(
+    odoo_model: str,
+    table: str,
+    base_domain: list,
+    fetch_page: Callable[[OdooClient, list, int, int], list[dict]],
+    write_page: Callable[[AsyncSession, list[dict]], Awaitable[int]],
+    full: bool = False,
+) -> None:
+    """
+    Sync one Odoo model, incrementally from the stored `write_date` high-water
+    mark, or fully when forced or when the periodic full reconciliation is due.
+    Pages are read by id keyset, records modified while the sync runs join or
+    leave the `write_date` domain and would shift offset pages.
+    Pages are committed as they arrive and the mark is only saved after the last
+    one, so a crashed run starts over from the previous mark. API caches of the
+    table are invalidated after every commit that changed rows.
+    Records deleted in Odoo are not removed, not even by a full reconciliation.
+    """
+    async with worker_async_session() as db, _cache_invalidator(table) as invalidate:
+        state = await odoo_sync_state_repository.get_by_model(db, odoo_model)
+        full = full or odoo_sync_state_repository.is_full_sync_due(
+            state, settings.ODOO_SYNC_FULL_RECONCILE_INTERVAL
+        )
+        domain = list(base_domain)
+        if not full:
+            domain += _write_date_domain(state.last_write_date)
+
+        mark = await asyncio.to_thread(_get_latest_mark, odoo_model, domain)
+        traversal = OdooKeysetTraversal(
+            count=lambda client: client.get_count(odoo_model, domain),
+            search_ids=lambda client, after_id, limit: client.search_ids(
+                odoo_model, domain + [("id", ">", after_id)], limit, order="id"
+            ),
+            fetch_ids=lambda client, ids: fetch_page(
+                client, domain + [("id", "in", ids)], len(ids), 0
+            ),
+        )
+        mode = "full" if full else "incremental"
+        async for records in traversal.iter_pages():
+            if await write_page(db, records):
+                await invalidate()
+            odoo_sync_records.labels(odoo_model, mode).inc(len(records))
+            logger.info(
+                f"synced {traversal.fetched_records}/{traversal.total_count}"
+                f" {odoo_model} records"
+            )
+
+        await odoo_sync_state_repository.save_mark(
+            db,
+            model=odoo_model,
+            last_write_date=mark[0] if mark else None,
+            last_odoo_id=mark[1] if mark else None,
+            full_sync=full,
+        )
+        await db.commit()
+        logger.info(
+            f"{mode} sync of {odoo_model} done, {traversal.fetched_records} records"
+        )
+
+
+async def _import_model(
+    odoo_model: str,
+    base_domain: list,
+    fetch_page: Callable[[OdooClient, list, int, int], list[dict]],
+    to_row: Callable[[dict], dict],
+    loader: StagingTableLoader,
+    on_progress: Callable[[dict], None],
+) -> None:
+    """
+    Initial import of one Odoo model through a COPY-loaded staging table.
+
+    Pages are fetched in id order and COPY-ed into the staging table, each page
+    in its own transaction. The highest Odoo id below which every page is staged
+    is checkpointed, so a crashed import resumes from there instead of starting
+    over. Once everything is staged, one set-based statement merges the staging
+    table into the model table.
+    A resumed import leaves the high-water mark alone, since changes made before
+    the resume may be missing, and the next beat run falls back to a full sync.
+    """
+    async with worker_async_session() as db:
+        state = await odoo_sync_state_repository.get_by_model(db, odoo_model)
+        checkpoint_id = state.import_checkpoint_id if state else None
+        resumed = checkpoint_id is not None
+        domain = list(base_domain)
+        if resumed:
+            await loader.create(db)
+            domain.append(("id", ">", checkpoint_id))
+            logger.info(f"resuming {odoo_model} import after odoo id {checkpoint_id}")
+        else:
+            await loader.reset(db)
+        await db.commit()
+
+        mark = None
+        if not resumed:
+            mark = await asyncio.to_thread(_get_latest_mark, odoo_model, base_domain)
+        traversal = OdooPageTraversal(
+            count=lambda client: client.get_count(odoo_model, domain),
+            fetch_page=lambda client, limit, offset: fetch_page(
+                client, domain, limit, offset
+            ),
+        )
+        # offset -> last id of a staged page that is not contiguous yet
+        staged_pages: dict[int, Optional[int]] = {}
+        next_offset = 0
+        async for offset, records in traversal.iter_indexed_pages():
+            await loader.copy(
+                db, [to_row(record) for record in records if record.get("id")]
+            )
+            staged_pages[offset] = records[-1]["id"] if records else None
+            odoo_sync_records.labels(odoo_model, "import").inc(len(records))
+
+            while next_offset in staged_pages:
+                checkpoint_id = staged_pages.pop(next_offset) or checkpoint_id
+                next_offset += traversal.page_size
+            await odoo_sync_state_repository.save_import_checkpoint(
+                db, odoo_model, checkpoint_id
+            )  # commits the staged page too
+
+            on_progress(
+                {
+                    "model": odoo_model,
+                    "stage": "staging",
+                    "staged": traversal.fetched_records,
+                    "total": traversal.total_count,
+                    "checkpoint_id": checkpoint_id,
+                }
+            )
+
+        on_progress({"model": odoo_model, "stage": "merging"})
+        merged = await loader.merge(db)
+        await loader.analyze(db)
+        await loader.drop(db)
+        await odoo_sync_state_repository.save_import_checkpoint(db, odoo_model, None)
+        if mark:
+            await odoo_sync_state_repository.save_mark(
+                db,
+                model=odoo_model,
+                last_write_date=mark[0],
+                last_odoo_id=mark[1],
+                full_sync=True,
+            )
+        await db.commit()
+        if merged:
+            async with _cache_invalidator(loader.model.__tablename__) as invalidate:
+                await invalidate()
+        logger.info(
+            f"import of {odoo_model} done, {traversal.fetched_records} records "
+            f"staged in this run, {merged} rows merged"
+        )
+
+
+def _report_progress(task) -> Callable[[dict], None]:
+    def report(meta: dict) -> None:
+        logger.info(f"import progress: {meta}")
+        if task.request.id:
+            task.update_state(state="PROGRESS", meta=meta)
+
+    return report
+
 
-@celery_app.task(name="sync_odoo_contacts")
-def sync_odoo_contacts():
+@celery_app.task(name="sync_odoo_contacts", bind=True)
+def sync_odoo_contacts(self, full: bool = False, import_mode: bool = False):
     """
     Celery beat task to sync contacts from Odoo to local database.
+    Args:
+        full: bool - ignore the high-water mark and re-read every contact
+        import_mode: bool - initial import of a large tenant through a COPY-loaded
+            staging table, resumes an interrupted import
     """
 
-    async def _sync():
-        service = OdooService()
-        try:
-            # NOTE: pagination traversal depends on the business logic, skipping it in the assignment
-            contacts = service.get_contacts_from_odoo(limit=100)
-            logger.info(f"fetched {len(contacts)} contacts from odoo")
-
-            async with async_session() as db:
-                for contact in contacts:
-                    odoo_id = contact.get("id")
-                    if not odoo_id:
-                        continue
-
-                    # prepare contact data
-                    # odoo company_id is usually [id, name] or False
-                    company_id_raw = contact.get("company_id")
-                    company_name = ""
-                    if isinstance(company_id_raw, list) and len(company_id_raw) > 1:
-                        company_name = company_id_raw[1]
-
-                    contact_data = {
-                        "odoo_id": odoo_id,
-                        "name": contact.get("name") or "",
-                        "email": contact.get("email") or "",
-                        "company_name": company_name,
-                        "company_id": company_id_raw,
-                    }
-
-                    existing_contact = await odoo_contact_repository.get_by_filters(
-                        db, odoo_id=odoo_id
-                    )
-
-                    if existing_contact:
-                        # update existing contact
-                        obj_in = OdooContactUpdate(**contact_data)
-                        await odoo_contact_repository.update(
-                            db, db_obj=existing_contact, obj_in=obj_in
-                        )
-                    else:
-                        # create new contact
-                        obj_in = OdooContactCreate(**contact_data)
-                        await service.insert_contact(db, obj_in=obj_in)
-
-                await db.commit()
-                logger.info("successfully synced odoo contacts to database")
-
-        except Exception as e:
-            logger.error(f"failed to sync odoo contacts: {str(e)}")
-            raise e
-
-    asyncio.run(_sync())
-
-
-@celery_app.task(name="sync_odoo_invoices")
-def sync_odoo_invoices():
+    def fetch_page(client: OdooClient, domain: list, limit: int, offset: int):
+        return client.get_partners(
+            domain=domain,
+            limit=limit,
+            offset=offset,
+            order=IMPORT_ORDER if import_mode else SYNC_ORDER,
+        )
+
+    base_domain = [("is_company", "=", False)]
+    try:
+        if import_mode:
+            run_async(
+                _import_model(
+                    odoo_model="res.partner",
+                    base_domain=base_domain,
+                    fetch_page=fetch_page,
+                    to_row=_contact_to_row,
+                    loader=odoo_contact_staging_loader,
+                    on_progress=_report_progress(self),
+                )
+            )
+        else:
+            run_async(
+                _sync_model(
+                    odoo_model="res.partner",
+                    table=odoo_contact_repository.model.__tablename__,
+                    base_domain=base_domain,
+                    fetch_page=fetch_page,
+                    write_page=_write_contacts,
+                    full=full,
+                )
+            )
+    except Exception as e:
+        logger.error(f"failed to sync odoo contacts: {str(e)}")
+        raise e
+
+
+@celery_app.task(name="sync_odoo_invoices", bind=True)
+def sync_odoo_invoices(self, full: bool = False, import_mode: bool = False):
     """
     Celery beat task to sync invoices from Odoo to local database.
+    Args:
+        full: bool - ignore the high-water mark and re-read every invoice
+        import_mode: bool - initial import of a large tenant through a COPY-loaded
+            staging table, resumes an interrupted import
+    """
+
+    def fetch_page(client: OdooClient, domain: list, limit: int, offset: int):
+        return client.get_invoices(
+            domain=domain,
+            limit=limit,
+            offset=offset,
+            order=IMPORT_ORDER if import_mode else SYNC_ORDER,
+        )
+
+    try:
+        if import_mode:
+            run_async(
+                _import_model(
+                    odoo_model="account.move",
+                    base_domain=DEFAULT_INVOICE_DOMAIN,
+                    fetch_page=fetch_page,
+                    to_row=_invoice_to_row,
+                    loader=odoo_invoice_staging_loader,
+                    on_progress=_report_progress(self),
+                )
+            )
+        else:
+            run_async(
+                _sync_model(
+                    odoo_model="account.move",
+                    table=odoo_invoice_repository.model.__tablename__,
+                    base_domain=DEFAULT_INVOICE_DOMAIN,
+                    fetch_page=fetch_page,
+                    write_page=_write_invoices,
+                    full=full,
+                )
+            )
+    except Exception as e:
+        logger.error(f"failed to sync odoo invoices: {str(e)}")
+        raise e
+
+
+async def _create_and_insert(create: Callable[..., Awaitable[int]], table: str) -> int:
+    async with worker_async_session() as db:
+        odoo_id = await create(db)
+    async with _cache_invalidator(table) as invalidate:
+        await invalidate()
+    return odoo_id
+
+
+@celery_app.task(name="create_odoo_contact")
+def create_odoo_contact(name: str, email: str, company_name: str) -> int:
+    """
+    Job mode of the contact create endpoint, creates a contact in Odoo and
+    inserts it into the local database.
+    Returns:
+        int: Odoo contact ID, stored in the result backend
     """
+    with odoo_client_pool.acquire() as client:
+        service = OdooService(client)
+        return run_async(
+            _create_and_insert(
+                lambda db: service.create_and_insert_contact(
+                    db, name, email, company_name
+                ),
+                table=odoo_contact_repository.model.__tablename__,
+            )
+        )
 
-    async def _sync():
-        service = OdooService()
-        try:
-            # NOTE: pagination traversal depends on the business logic, skipping it in the assignment
-            invoices = service.get_invoices_from_odoo(limit=100)
-            logger.info(f"fetched {len(invoices)} invoices from odoo")
-
-            async with async_session() as db:
-                for invoice in invoices:
-                    odoo_id = invoice.get("id")
-                    if not odoo_id:
-                        continue
-
-                    invoice_data = {
-                        "odoo_id": odoo_id,
-                        "name": invoice.get("name"),
-                        "partner_id": invoice.get("partner_id"),
-                        "invoice_date": invoice.get("invoice_date"),
-                        "amount_total": invoice.get("amount_total"),
-                        "state": invoice.get("state"),
-                        "move_type": invoice.get("move_type"),
-                    }
-
-                    existing_invoice = await odoo_invoice_repository.get_by_filters(
-                        db, odoo_id=odoo_id
-                    )
-
-                    if existing_invoice:
-                        obj_in = OdooInvoiceUpdate(**invoice_data)
-                        await odoo_invoice_repository.update(
-                            db, db_obj=existing_invoice, obj_in=obj_in
-                        )
-                    else:
-                        obj_in = OdooInvoiceCreate(**invoice_data)
-                        await service.insert_invoice(db, obj_in=obj_in)
-
-                await db.commit()
-                logger.info("successfully synced odoo invoices to database")
-
-        except Exception as e:
-            logger.error(f"failed to sync odoo invoices: {str(e)}")
-            raise e
-
-    asyncio.run(_sync())
+
+@celery_app.task(name="create_odoo_invoice")
+def create_odoo_invoice(partner_id: int, invoice_lines: list[dict]) -> int:
+    """
+    Job mode of the invoice create endpoint, creates an invoice in Odoo and
+    inserts it into the local database.
+    Returns:
+        int: Odoo invoice ID, stored in the result backend
+    """
+    lines = [InvoiceCreatePayload(**line) for line in invoice_lines]
+    with odoo_client_pool.acquire() as client:
+        service = OdooService(client)
+        return run_async(
+            _create_and_insert(
+                lambda db: service.create_and_insert_invoice(db, partner_id, lines),
+                table=odoo_invoice_repository.model.__tablename__,
+            )
+        )
@@ -3,6 +3,7 @@ from typing import Annotated
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 
+from src.core.auth.user_cache import auth_user_cache
 from src.db.session import AsyncDBSession
 from src.models import User
 from src.repositories.users import user_repository
@@ -29,9 +30,13 @@ async def get_current_user(
     email: str | None = payload.get("sub")
     if email is None:
         raise credentials_exception
+    user = await auth_user_cache.get(email, payload["exp"])
+    if user:
+        return user
     user = await user_repository.get_by_email(db, email=email)
     if user is None:
         raise credentials_exception
+    await auth_user_cache.set(email, payload["exp"], user)
     return user
 
 
@@ -0,0 +1,149 @@
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+from src.core.redis_client import AsyncRedisClient, redis_cache_client
+from src.core.settings import get_settings
+from src.models import User
+from src.utils.exceptions import RedisConnectionError
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# the password hash is deliberately left out of the cache
+USER_COLUMNS = ("id", "email", "username")
+
+
+class AuthUserCache:
+    """
+    Cache of authenticated users, so `get_current_user` only verifies the JWT.
+
+    The first tier is an in-process LRU keyed by token subject and expiry, the
+    second (optional) tier is Redis keyed by subject, shared by the API workers.
+    Entries never outlive the token and expire after `AUTH_USER_CACHE_TTL`,
+    which bounds how long another process may serve a user changed elsewhere.
+    Cached users are transient `User` copies, not attached to any session.
+    """
+
+    def __init__(
+        self,
+        redis_client: AsyncRedisClient = redis_cache_client,
+        max_size: int = settings.AUTH_USER_CACHE_SIZE,
+        ttl: int = settings.AUTH_USER_CACHE_TTL,
+        use_redis: bool = settings.AUTH_USER_CACHE_REDIS,
+    ):
+        self.redis_client = redis_client
+        self.max_size = max_size
+        self.ttl = ttl
+        self.use_redis = use_redis
+        # (subject, token expiry) -> (cache expiry, user columns)
+        self._users: OrderedDict[tuple[str, int], tuple[float, dict]] = OrderedDict()
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _redis_key(subject: str) -> str:
+        return f"auth:user:{subject}"
+
+    @staticmethod
+    def _to_columns(user: User) -> dict:
+        return {name: getattr(user, name) for name in USER_COLUMNS}
+
+    @staticmethod
+    def _to_user(columns: dict) -> User:
+        return User(**columns)
+
+    @staticmethod
+    def _dumps(columns: dict) -> str:
+        return json.dumps({**columns, "id": str(columns["id"])})
+
+    @staticmethod
+    def _loads(payload: str) -> dict:
+        columns = json.loads(payload)
+        return {**columns, "id": uuid.UUID(columns["id"])}
+
+    def _ttl(self, token_exp: int) -> float:
+        return min(self.ttl, token_exp - time.time())
+
+    async def get(self, subject: str, token_exp: int) -> Optional[User]:
+        key = (subject, token_exp)
+        entry = self._users.get(key)
+        if entry:
+            expires_at, columns = entry
+            if expires_at > time.monotonic():
+                self._users.move_to_end(key)
+                self.hits += 1
+                return self._to_user(columns)
+            del self._users[key]
+
+        if self.use_redis:
+            try:
+                cached = await self.redis_client.get_value(self._redis_key(subject))
+            except RedisConnectionError:
+                cached = None
+            except Exception as e:
+                logger.warning(f"failed to read cached user: {e}")
+                cached = None
+            if cached is not None:
+                columns = self._loads(cached)
+                self._store(key, columns)
+                self.redis_hits += 1
+                return self._to_user(columns)
+
+        self.misses += 1
+        return None
+
+    def _store(self, key: tuple[str, int], columns: dict) -> None:
+        ttl = self._ttl(key[1])
+        if ttl <= 0:
+            return
+        self._users[key] = (time.monotonic() + ttl, columns)
+        self._users.move_to_end(key)
+        while len(self._users) > self.max_size:
+            self._users.popitem(last=False)
+
+    async def set(self, subject: str, token_exp: int, user: User) -> None:
+        columns = self._to_columns(user)
+        self._store((subject, token_exp), columns)
+        ttl = int(self._ttl(token_exp))
+        if not self.use_redis or ttl <= 0:
+            return
+        try:
+            await self.redis_client.set_value(
+                self._redis_key(subject),
+                self._dumps(columns),
+                ttl_seconds=ttl,
+            )
+        except RedisConnectionError:
+            pass
+        except Exception as e:
+            logger.warning(f"failed to cache user: {e}")
+
+    async def invalidate(self, subject: str) -> None:
+        """Drop every cached token of the subject, call it after the user changed."""
+        for key in [key for key in self._users if key[0] == subject]:
+            del self._users[key]
+        if not self.use_redis:
+            return
+        try:
+            await self.redis_client.del_value(self._redis_key(subject))
+        except RedisConnectionError:
+            pass
+        except Exception as e:
+            logger.warning(f"failed to invalidate cached user: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._users),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+        }
+
+
+auth_user_cache = AuthUserCache()
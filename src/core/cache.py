@@ -0,0 +1,172 @@
+import hashlib
+import logging
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Optional, Sequence
+
+from fastapi.responses import Response
+
+from src.core.redis_client import AsyncRedisClient, redis_cache_client
+from src.core.settings import get_settings
+from src.middleware.pagination import request_object
+from src.utils.exceptions import RedisConnectionError
+from src.utils.serialization import dumps
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+TABLE_VERSION_PREFIX = "cache:version"
+
+
+def table_version_key(table: str) -> str:
+    return f"{TABLE_VERSION_PREFIX}:{table}"
+
+
+async def get_table_version(
+    table: str, client: AsyncRedisClient = redis_cache_client
+) -> Optional[int]:
+    """
+    Current version of a table's cache namespace. Cache keys embed it, so bumping
+    the version invalidates every cached entry derived from the table at once.
+
+    Returns:
+        Optional[int]: the version, None when Redis is unavailable and the
+            caller should skip the cache
+    """
+    try:
+        version = await client.get_value(table_version_key(table))
+    except RedisConnectionError as e:
+        logger.debug(f"cache of {table} skipped: {e}")
+        return None
+    except Exception as e:
+        logger.warning(f"failed to read cache version of {table}: {e}")
+        return None
+    return int(version or 0)
+
+
+async def bump_table_versions(
+    *tables: str, client: AsyncRedisClient = redis_cache_client
+) -> None:
+    """
+    Invalidate cached data of the given tables, call it after the writes are
+    committed. Failures are logged only, cached entries expire with their TTL.
+    """
+    for table in tables:
+        try:
+            await client.incr(table_version_key(table))
+        except RedisConnectionError as e:
+            logger.debug(f"cache of {table} not invalidated: {e}")
+        except Exception as e:
+            logger.warning(f"failed to invalidate cache of {table}: {e}")
+
+
+class ResponseCache:
+    """
+    Read-through cache of endpoint responses in Redis.
+
+    Keys are derived from the endpoint name, the request URL (host, path and
+    sorted query params) and the versions of the tables the response is built
+    from, so bumping a table version invalidates every response using it.
+    Responses are rendered once with orjson and stored as JSON, hits are
+    returned as is without being decoded.
+
+    Usage:
+    ```
+    return await response_cache.get_or_load(
+        "contacts",
+        tables=["odoocontacts"],
+        load=lambda: odoo_contact_repository.get_contacts(db=db),
+    )
+    ```
+    """
+
+    def __init__(
+        self,
+        client: AsyncRedisClient = redis_cache_client,
+        ttl: int = settings.RESPONSE_CACHE_TTL,
+        enabled: bool = settings.RESPONSE_CACHE_ENABLED,
+    ):
+        self.client = client
+        self.ttl = ttl
+        self.enabled = enabled
+        # endpoint name -> counter
+        self.hits: dict[str, int] = defaultdict(int)
+        self.misses: dict[str, int] = defaultdict(int)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    async def _key(self, name: str, tables: Sequence[str]) -> Optional[str]:
+        versions = []
+        for table in sorted(tables):
+            version = await get_table_version(table, client=self.client)
+            if version is None:
+                return None
+            versions.append(f"{table}:{version}")
+
+        url = request_object.get().url
+        query = sorted(url.query.split("&"))
+        digest = hashlib.sha1(
+            f"{url.netloc}{url.path}?{'&'.join(query)}".encode()
+        ).hexdigest()
+        return f"response:{name}:{','.join(versions)}:{digest}"
+
+    async def get_or_load(
+        self,
+        name: str,
+        tables: Sequence[str],
+        load: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+    ) -> Response:
+        """
+        Args:
+            name: endpoint name, prefixes the key and labels the counters
+            tables: tables the response is built from
+            load: builds the response content on a miss
+            ttl: expiry in seconds, `RESPONSE_CACHE_TTL` by default
+        Returns:
+            Response: JSON response, `X-Cache` header tells whether it was cached
+        """
+        if not self.enabled:
+            return self._response(dumps(await load()))
+        key = await self._key(name, tables)
+        if key is None:
+            self.errors[name] += 1
+            return self._response(dumps(await load()))
+
+        try:
+            cached = await self.client.get_value(key)
+        except Exception as e:
+            logger.warning(f"failed to read cached {name} response: {e}")
+            self.errors[name] += 1
+            return self._response(dumps(await load()))
+        if cached is not None:
+            self.hits[name] += 1
+            return self._response(cached, "HIT")
+
+        self.misses[name] += 1
+        body = dumps(await load())
+        try:
+            await self.client.set_value(key, body, ttl_seconds=ttl or self.ttl)
+        except Exception as e:
+            logger.warning(f"failed to cache {name} response: {e}")
+            self.errors[name] += 1
+        return self._response(body, "MISS")
+
+    @staticmethod
+    def _response(body: bytes | str, cache_status: str = "BYPASS") -> Response:
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={"X-Cache": cache_status},
+        )
+
+    def stats(self) -> dict:
+        return {
+            name: {
+                "hits": self.hits[name],
+                "misses": self.misses[name],
+                "errors": self.errors[name],
+            }
+            for name in sorted({*self.hits, *self.misses, *self.errors})
+        }
+
+
+response_cache = ResponseCache()
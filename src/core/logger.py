@@ -1,15 +1,32 @@
+import atexit
+import json
 import logging
+import os
+import queue
+import random
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
 
 from src.core.settings import get_settings
 
 settings = get_settings()
 
 LOGGER_FORMAT = logging.Formatter(
-    fmt="{asctime} | {levelname} | {name} | {message}",
+    fmt="{asctime} | {levelname} | {request_id} | {name} | {message}",
     datefmt="%d/%m/%y %H:%M:%S",
     style="{",  # Enables f-string syntax.
 )
 
+# id of the HTTP request or Celery task being handled, added to its log records
+request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Records are put on a queue by the logging thread and written by the listener
+# thread, so a slow stdout/log collector never blocks the event loop.
+_listener: Optional[QueueListener] = None
+_listener_pid: Optional[int] = None
+
 
 class NameFilter(logging.Filter):
     def filter(self, record):
@@ -20,26 +37,112 @@ class NameFilter(logging.Filter):
         return True
 
 
+class ContextFilter(logging.Filter):
+    """Stamps the request id, context vars are not visible in the listener thread."""
+
+    def filter(self, record):
+        record.request_id = request_id.get() or "-"
+        return True
+
+
+class DebugSamplingFilter(logging.Filter):
+    """Keeps a `rate` share of the DEBUG records, records above DEBUG all pass."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno > logging.DEBUG or random.random() < self.rate
+
+
+# attributes of every record, the others were passed with `extra=`
+RECORD_ATTRIBUTES = frozenset(
+    (*logging.makeLogRecord({}).__dict__, "message", "asctime", "request_id")
+)
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(
+                record.created, tz=timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+            "process": record.process,
+        }
+        for key, value in record.__dict__.items():
+            if key not in RECORD_ATTRIBUTES and key not in entry:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _QueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # unlike the default, keeps the traceback out of the message so the
+        # formatter of the listener can render it
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+def stop_logging() -> None:
+    """Flushes the queued records, the listener thread only exists in its process."""
+    global _listener
+    if _listener is not None and _listener_pid == os.getpid():
+        _listener.stop()
+    _listener = None
+
+
 def init_logging() -> logging.Logger:
-    """Init simple console logging."""
+    """
+    Init queue-based console logging, JSON lines unless `LOG_FORMAT` is text.
+    Call it again in forked processes, the listener thread isn't inherited.
+    """
+    global _listener, _listener_pid
     log_level = logging.DEBUG if settings.DEBUG else logging.INFO
 
     root_log = logging.getLogger()
     root_log.setLevel(log_level)
 
+    stop_logging()
     if root_log.hasHandlers():
         root_log.handlers.clear()
 
     handle_console = logging.StreamHandler()
     handle_console.setLevel(logging.DEBUG)
-    handle_console.setFormatter(LOGGER_FORMAT)
+    handle_console.setFormatter(
+        JSONFormatter() if settings.LOG_FORMAT == "json" else LOGGER_FORMAT
+    )
 
-    process_name_filter = NameFilter()
-    handle_console.addFilter(process_name_filter)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handle_queue = _QueueHandler(log_queue)
+    # sampled first, dropped records skip the other filters
+    if settings.LOG_DEBUG_SAMPLE_RATE < 1:
+        handle_queue.addFilter(DebugSamplingFilter(settings.LOG_DEBUG_SAMPLE_RATE))
+    handle_queue.addFilter(NameFilter())
+    handle_queue.addFilter(ContextFilter())
+    root_log.addHandler(handle_queue)
 
-    root_log.addHandler(handle_console)
+    _listener = QueueListener(log_queue, handle_console, respect_handler_level=True)
+    _listener_pid = os.getpid()
+    _listener.start()
 
     for log_name in ("websockets", "uvicorn"):
         logging.getLogger(log_name).setLevel(logging.INFO)
 
     return root_log
+
+
+atexit.register(stop_logging)
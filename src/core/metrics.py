@@ -0,0 +1,163 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Prometheus metrics of the API and the Celery workers.
+#
+# With several processes (uvicorn `--workers`, Celery prefork) every process
+# writes its samples to `PROMETHEUS_MULTIPROC_DIR` and the exposition aggregates
+# them, the env var must point to an empty directory before the processes start.
+
+# seconds, from a cache hit to a slow Odoo call
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+TASK_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency per route",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+odoo_rpc_duration = Histogram(
+    "odoo_rpc_duration_seconds",
+    "Odoo XML-RPC call latency per model and method",
+    ["model", "method"],
+    buckets=LATENCY_BUCKETS,
+)
+odoo_rpc_errors = Counter(
+    "odoo_rpc_errors_total",
+    "Failed Odoo XML-RPC calls per model, method and error",
+    ["model", "method", "error"],
+)
+db_query_duration = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement latency per engine and statement type",
+    ["engine", "operation"],
+    buckets=LATENCY_BUCKETS,
+)
+redis_command_duration = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command latency of the cache client",
+    ["command"],
+    buckets=LATENCY_BUCKETS,
+)
+redis_command_errors = Counter(
+    "redis_command_errors_total",
+    "Failed Redis commands of the cache client",
+    ["command"],
+)
+celery_task_duration = Histogram(
+    "celery_task_duration_seconds",
+    "Celery task run time per task and final state",
+    ["task", "state"],
+    buckets=TASK_BUCKETS,
+)
+odoo_sync_records = Counter(
+    "odoo_sync_records_total",
+    "Odoo records written by the sync tasks",
+    ["model", "mode"],
+)
+
+
+def odoo_rpc_labels(method: str, params: tuple) -> tuple[str, str]:
+    """
+    `(model, method)` labels of an RPC call, `execute_kw` calls are labeled
+    with the model method they run.
+    """
+    if method == "execute_kw" and len(params) >= 5:
+        return str(params[3]), str(params[4])
+    return "common", method
+
+
+@contextmanager
+def track_odoo_rpc(model: str, method: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception as err:
+        odoo_rpc_errors.labels(model, method, type(err).__name__).inc()
+        raise
+    finally:
+        odoo_rpc_duration.labels(model, method).observe(time.perf_counter() - started)
+
+
+@contextmanager
+def track_redis_command(command: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        redis_command_errors.labels(command).inc()
+        raise
+    finally:
+        redis_command_duration.labels(command).observe(time.perf_counter() - started)
+
+
+def _operation(statement: str) -> str:
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+    if keyword in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH"):
+        return keyword
+    return "OTHER"
+
+
+def instrument_engine(name: str, engine: Engine) -> None:
+    """Time every statement of `engine` (the sync engine of an async one)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        started = conn.info["query_started_at"].pop()
+        db_query_duration.labels(name, _operation(statement)).observe(
+            time.perf_counter() - started
+        )
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # after_cursor_execute is skipped for failed statements
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started_at"):
+            conn.info["query_started_at"].pop()
+
+
+def metrics_registry() -> CollectorRegistry:
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Returns the exposition of every process and its content type."""
+    return generate_latest(metrics_registry()), CONTENT_TYPE_LATEST
@@ -7,6 +7,7 @@ from redis.backoff import ExponentialBackoff
 from redis.exceptions import ConnectionError as RedisConnError
 from redis.exceptions import TimeoutError as RedisTimeoutError
 
+from src.core.metrics import track_redis_command
 from src.core.settings import get_settings
 from src.utils.exceptions import RedisConnectionError
 
@@ -88,19 +89,18 @@ class AsyncRedisClient:
         """
         if not self.client:
             raise RedisConnectionError("Client is not connected. Call 'connect' first.")
-        try:
-            await self.client.set(key, value, ex=ttl_seconds)
-        except ConnectionError:
-            logger.error("Redis connection error. Attempting to reconnect...")
-            await self.client.set(key, value, ex=ttl_seconds)
-        except Exception as e:
-            logger.debug(f"Error setting value for key '{key}': {e}")
-            raise
-
-        logger.debug(
-            f"Set '{key}' to '{value}'"
-            + (f" with {ttl_seconds}s expiry." if ttl_seconds else ".")
-        )
+        with track_redis_command("set"):
+            try:
+                await self.client.set(key, value, ex=ttl_seconds)
+            except ConnectionError:
+                logger.error("Redis connection error. Attempting to reconnect...")
+                await self.client.set(key, value, ex=ttl_seconds)
+            except Exception as e:
+                logger.debug("Error setting value for key '%s': %s", key, e)
+                raise
+
+        # lazy args, cached values can be whole pages of rows
+        logger.debug("Set '%s' (%s s expiry).", key, ttl_seconds)
 
     async def get_value(self, key: str):
         """
@@ -114,14 +114,15 @@ class AsyncRedisClient:
         """
         if not self.client:
             raise RedisConnectionError("Client is not connected. Call 'connect' first.")
-        try:
-            value = await self.client.get(key)
-        except ConnectionError:
-            logger.error("Redis connection error. Attempting to reconnect...")
-            value = await self.client.get(key)
-        except Exception as e:
-            logger.error(f"Error getting value for key '{key}': {e}")
-            raise
+        with track_redis_command("get"):
+            try:
+                value = await self.client.get(key)
+            except ConnectionError:
+                logger.error("Redis connection error. Attempting to reconnect...")
+                value = await self.client.get(key)
+            except Exception as e:
+                logger.error(f"Error getting value for key '{key}': {e}")
+                raise
 
         # logger.debug(f"Retrieved '{value}' for key '{key}'.")
         return value
@@ -129,21 +130,51 @@ class AsyncRedisClient:
     async def del_value(self, key: str):
         if not self.client:
             raise RedisConnectionError("Client is not connected. Call 'connect' first.")
-        try:
-            await self.client.delete(key)
-        except ConnectionError:
-            logger.error("Redis connection error. Attempting to reconnect...")
-            await self.client.delete(key)
-        except Exception as e:
-            logger.error(f"Error getting value for key '{key}': {e}")
-            raise
-
-        logger.debug(f"Removed key '{key}'.")
+        with track_redis_command("delete"):
+            try:
+                await self.client.delete(key)
+            except ConnectionError:
+                logger.error("Redis connection error. Attempting to reconnect...")
+                await self.client.delete(key)
+            except Exception as e:
+                logger.error(f"Error getting value for key '{key}': {e}")
+                raise
+
+        logger.debug("Removed key '%s'.", key)
         return
 
+    async def incr(self, key: str) -> int:
+        """
+        Atomically increments the integer value of a key, starting from 0.
+
+        Args:
+            key (str): The key to increment.
+
+        Returns:
+            int: The value after the increment.
+        """
+        if not self.client:
+            raise RedisConnectionError("Client is not connected. Call 'connect' first.")
+        with track_redis_command("incr"):
+            try:
+                value = await self.client.incr(key)
+            except ConnectionError:
+                logger.error("Redis connection error. Attempting to reconnect...")
+                value = await self.client.incr(key)
+            except Exception as e:
+                logger.error(f"Error incrementing key '{key}': {e}")
+                raise
+
+        logger.debug("Incremented '%s' to %s.", key, value)
+        return value
+
     async def __aenter__(self):
         await self.connect()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await self.disconnect()
+
+
+# API process cache, connected in the app lifespan
+redis_cache_client = AsyncRedisClient()
@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import Optional, Self
+from typing import Literal, Optional, Self
 
 from pydantic import Field, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -15,6 +15,42 @@ class Settings(BaseSettings):
 
     SQLALCHEMY_ASYNC_DATABASE_URI: Optional[str] = None
     SQLALCHEMY_ENABLE_ECHO: Optional[bool] = False
+    DB_USE_NULL_POOL: bool = Field(
+        False, description="Open a new connection per session instead of pooling"
+    )
+    DB_POOL_SIZE: int = Field(5, description="Persistent connections per API process")
+    DB_MAX_OVERFLOW: int = Field(
+        10, description="Extra connections per API process allowed under load"
+    )
+    DB_POOL_TIMEOUT: float = Field(
+        30.0, description="Seconds to wait for a free pooled connection"
+    )
+    DB_POOL_RECYCLE: int = Field(
+        1800, description="Seconds after which a pooled connection is replaced"
+    )
+    DB_POOL_PRE_PING: bool = Field(
+        True, description="Check pooled connections for liveness on checkout"
+    )
+    DB_STATEMENT_CACHE_SIZE: int = Field(
+        100, description="asyncpg prepared statement cache size per connection"
+    )
+    CELERY_DB_POOL_SIZE: int = Field(
+        2, description="Persistent connections per Celery worker process"
+    )
+    CELERY_DB_MAX_OVERFLOW: int = Field(
+        2, description="Extra connections per Celery worker process"
+    )
+    SQL_PROFILING: bool = Field(
+        False,
+        description="Debug mode: count queries per request/task, explain slow ones",
+    )
+    SQL_SLOW_QUERY_MS: float = Field(
+        100.0, description="Queries slower than this are logged when profiling"
+    )
+    SQL_N_PLUS_ONE_THRESHOLD: int = Field(
+        10,
+        description="Distinct parameter sets of one statement flagged as N+1",
+    )
     POSTGRES_HOST: str = Field(default="postgres")
     POSTGRES_USER: str = Field(default="postgres")
     POSTGRES_PASSWORD: str = Field(default="postgres")
@@ -22,6 +58,15 @@ class Settings(BaseSettings):
     POSTGRES_PORT: str = Field(default="5432")
 
     DEBUG: bool = Field(False)
+    LOG_FORMAT: Literal["json", "text"] = Field(
+        "json", description="JSON lines for log collectors or plain text"
+    )
+    LOG_DEBUG_SAMPLE_RATE: float = Field(
+        1.0,
+        ge=0.0,
+        le=1.0,
+        description="Share of DEBUG records emitted, e.g. 0.01 under load",
+    )
 
     REDIS_BROKER_URI: str = Field("redis://redis:6379/0")
     REDIS_BACKEND_URI: str = Field("redis://redis:6379/1")
@@ -31,12 +76,111 @@ class Settings(BaseSettings):
     ODOO_API_KEY: str
     ODOO_HOST: str
     ODOO_PORT: str
+    ODOO_PROTOCOL: Literal["https", "http"] = Field(
+        "https",
+        description="Odoo XML-RPC scheme, https for Odoo.sh/SaaS, "
+        "http for local stand-ins (see benchmarks.fake_odoo)",
+    )
     ODOO_DATABASE: str
     ODOO_USER: str
+    ODOO_POOL_MAX_SIZE: int = Field(
+        8, description="Max number of authenticated Odoo clients kept per process"
+    )
+    ODOO_POOL_ACQUIRE_TIMEOUT: float = Field(
+        30.0, description="Seconds to wait for a free Odoo client from the pool"
+    )
+    ODOO_RPC_TIMEOUT: float = Field(30.0, description="Odoo RPC timeout in seconds")
+    ODOO_RPC_RETRIES: int = Field(
+        3,
+        description="Attempts of idempotent Odoo calls (search_read, search_count, "
+        "search, read) on transient errors",
+    )
+    ODOO_RPC_RETRY_MAX_WAIT: float = Field(
+        5.0, description="Max seconds of jittered backoff between Odoo call attempts"
+    )
+    ODOO_CIRCUIT_FAILURE_THRESHOLD: int = Field(
+        5,
+        description="Consecutive transient Odoo failures opening the circuit breaker",
+    )
+    ODOO_CIRCUIT_RESET_TIMEOUT: int = Field(
+        30,
+        description="Seconds the circuit stays open before a trial call is let through",
+    )
+    ODOO_CIRCUIT_SHARED: bool = Field(
+        True,
+        description="Share the open circuit across processes through the Redis cache",
+    )
+    ODOO_CIRCUIT_SYNC_INTERVAL: float = Field(
+        1.0, description="Seconds between reads of the shared circuit state"
+    )
+    ODOO_ASYNC_MAX_CONNECTIONS: int = Field(
+        20, description="Max open HTTP connections of the async Odoo client"
+    )
+    ODOO_ASYNC_MAX_CONCURRENCY: int = Field(
+        50, description="Max in-flight RPC calls of the async Odoo client"
+    )
+    ODOO_BATCH_WINDOW_MS: float = Field(
+        5.0,
+        description="Window in ms to coalesce concurrent Odoo create/read calls, "
+        "0 disables batching",
+    )
+    ODOO_BATCH_MAX_SIZE: int = Field(
+        100, description="Max number of Odoo calls coalesced into one"
+    )
+    ODOO_BULK_CHUNK_SIZE: int = Field(
+        500, description="Records created per Odoo call by the bulk endpoints"
+    )
+    ODOO_BULK_MAX_ITEMS: int = Field(
+        10_000, description="Max number of records per bulk create request"
+    )
 
+    CELERY_METRICS_PORT: Optional[int] = Field(
+        None,
+        description="Port of the Prometheus metrics of the celery worker, disabled if unset",
+    )
     CELERY_BEAT_TASK_INTERVAL: int = Field(
         600, description="Interval in seconds to run the celery beat task"
     )
+    ODOO_SYNC_PAGE_SIZE: int = Field(
+        500, description="Number of Odoo records fetched per page during sync"
+    )
+    ODOO_SYNC_WORKERS: int = Field(
+        4, description="Number of Odoo pages fetched concurrently during sync"
+    )
+    ODOO_SYNC_LOOKBACK_SECONDS: int = Field(
+        300,
+        description="Seconds before the high-water mark re-read by incremental "
+        "syncs, for records committed after a run with an earlier write_date",
+    )
+    ODOO_SYNC_FULL_RECONCILE_INTERVAL: int = Field(
+        86400,
+        description="Interval in seconds between full syncs, incremental otherwise",
+    )
+
+    PAGINATION_COUNT_MODE: Literal["exact", "cached", "estimated", "auto", "none"] = (
+        Field(
+            "auto",
+            description="Default total count strategy of paginated listings",
+        )
+    )
+    PAGINATION_COUNT_CACHE_TTL: int = Field(
+        300, description="Seconds a cached exact total count is kept in Redis"
+    )
+    PAGINATION_COUNT_ESTIMATE_THRESHOLD: int = Field(
+        100_000,
+        description="Estimated row count above which `auto` returns the estimate",
+    )
+
+    RESPONSE_CACHE_ENABLED: bool = Field(
+        True, description="Cache contact and invoice responses in Redis"
+    )
+    RESPONSE_CACHE_TTL: int = Field(
+        60, description="Seconds a cached contact or invoice response is kept"
+    )
+
+    EXPORT_BATCH_SIZE: int = Field(
+        2000, description="Rows fetched from the DB cursor per export chunk"
+    )
 
     SECRET_KEY: str = Field(..., description="Secret key for JWT")
     ALGORITHM: str = Field("HS256", description="Algorithm for JWT")
@@ -44,6 +188,22 @@ class Settings(BaseSettings):
         60, description="Access token expiration in minutes"
     )
 
+    BCRYPT_ROUNDS: int = Field(
+        12, description="bcrypt cost factor, older hashes are upgraded on login"
+    )
+    PASSWORD_HASH_WORKERS: int = Field(
+        4, description="Max number of concurrent bcrypt hash/verify calls"
+    )
+    AUTH_USER_CACHE_SIZE: int = Field(
+        1024, description="Max number of authenticated users cached per process"
+    )
+    AUTH_USER_CACHE_TTL: int = Field(
+        60, description="Seconds an authenticated user is cached"
+    )
+    AUTH_USER_CACHE_REDIS: bool = Field(
+        True, description="Share cached authenticated users through Redis"
+    )
+
     @model_validator(mode="after")
     def build_database_uri(self) -> Self:
         if not self.SQLALCHEMY_ASYNC_DATABASE_URI:
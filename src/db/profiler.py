@@ -0,0 +1,146 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Debug-mode SQL profiler (`SQL_PROFILING`): counts the statements of every
+# request or Celery task, logs slow ones with their `EXPLAIN ANALYZE` plan and
+# flags statements repeated with different parameters, the usual N+1 shape of a
+# query per record in a loop.
+
+
+@dataclass
+class QueryProfile:
+    name: str
+    count: int = 0
+    seconds: float = 0.0
+    # statement -> hashes of the parameters it ran with
+    executions: dict[str, list[int]] = field(default_factory=dict)
+
+    def record(self, statement: str, parameters, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.executions.setdefault(statement, []).append(hash(repr(parameters)))
+
+    def repeated(self) -> dict[str, int]:
+        """
+        Statements run with at least `SQL_N_PLUS_ONE_THRESHOLD` distinct
+        parameter sets, with their execution count.
+        """
+        return {
+            statement: len(hashes)
+            for statement, hashes in self.executions.items()
+            if len(set(hashes)) >= settings.SQL_N_PLUS_ONE_THRESHOLD
+        }
+
+    def summary_header(self) -> str:
+        """`Server-Timing` value, shown per request by the browser dev tools."""
+        return (
+            f'db;dur={self.seconds * 1000:.2f};desc="{self.count} queries, '
+            f'{len(self.repeated())} repeated"'
+        )
+
+
+current_profile: ContextVar[Optional[QueryProfile]] = ContextVar(
+    "query_profile", default=None
+)
+
+
+def _shorten(statement: str, length: int = 300) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= length else statement[:length] + "..."
+
+
+@contextmanager
+def profile_queries(name: str) -> Iterator[QueryProfile]:
+    """Collects the statements run in this context and logs their summary."""
+    profile = QueryProfile(name)
+    token = current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        current_profile.reset(token)
+        log_profile(profile)
+
+
+def log_profile(profile: QueryProfile) -> None:
+    for statement, count in profile.repeated().items():
+        logger.warning(
+            f"possible N+1 in {profile.name}: {count} executions of "
+            f"{_shorten(statement)}"
+        )
+    logger.info(
+        f"{profile.name}: {profile.count} queries in {profile.seconds * 1000:.2f} ms"
+    )
+
+
+def _explain(conn, statement: str, parameters) -> str:
+    """
+    `EXPLAIN ANALYZE` of a statement on a separate cursor of the same
+    connection, in a savepoint so a failing plan doesn't abort the transaction.
+    """
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT sql_profiler_explain")
+        try:
+            cursor.execute(f"EXPLAIN ANALYZE {statement}", parameters)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        except Exception:
+            cursor.execute("ROLLBACK TO SAVEPOINT sql_profiler_explain")
+            raise
+        cursor.execute("RELEASE SAVEPOINT sql_profiler_explain")
+        return plan
+    finally:
+        cursor.close()
+
+
+def profile_engine(engine: Engine) -> None:
+    """
+    Profile every statement of `engine` (the sync engine of an async one).
+
+    Only `SELECT`s are explained, `EXPLAIN ANALYZE` runs the statement again.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        conn.info.setdefault("profiler_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        seconds = time.perf_counter() - conn.info["profiler_started_at"].pop()
+        profile = current_profile.get()
+        if profile is not None:
+            profile.record(statement, parameters, seconds)
+
+        if seconds * 1000 < settings.SQL_SLOW_QUERY_MS:
+            return
+        where = f" in {profile.name}" if profile else ""
+        if many or not statement.lstrip().upper().startswith("SELECT"):
+            logger.warning(
+                f"slow query{where} ({seconds * 1000:.2f} ms): {_shorten(statement)}"
+            )
+            return
+        try:
+            plan = _explain(conn, statement, parameters)
+        except Exception as e:
+            plan = f"EXPLAIN failed: {e}"
+        logger.warning(
+            f"slow query{where} ({seconds * 1000:.2f} ms): {_shorten(statement)}"
+            f"\n{plan}"
+        )
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("profiler_started_at"):
+            conn.info["profiler_started_at"].pop()
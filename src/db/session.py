@@ -1,25 +1,115 @@
-from typing import Annotated, AsyncGenerator
+from typing import Annotated, Any, AsyncGenerator
 
 from fastapi import Depends
-from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import NullPool
 
+from src.core.metrics import instrument_engine
 from src.core.settings import get_settings
+from src.db.profiler import profile_engine
 
 settings = get_settings()
 
-engine = create_async_engine(
-    settings.SQLALCHEMY_ASYNC_DATABASE_URI,
-    poolclass=NullPool,
-    future=True,
-    echo=settings.SQLALCHEMY_ENABLE_ECHO,
-    pool_pre_ping=True,
+# connection pool event counters per engine name
+pool_counters: dict[str, dict[str, int]] = {}
+
+
+def build_async_engine(name: str, pool_size: int, max_overflow: int) -> AsyncEngine:
+    """
+    Async engine with a pool configured from `Settings`,
+    `DB_USE_NULL_POOL` switches pooling off entirely.
+    """
+    pool_options: dict[str, Any] = {"poolclass": NullPool}
+    if not settings.DB_USE_NULL_POOL:
+        pool_options = {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+        }
+
+    async_engine = create_async_engine(
+        settings.SQLALCHEMY_ASYNC_DATABASE_URI,
+        future=True,
+        echo=settings.SQLALCHEMY_ENABLE_ECHO,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE
+        },
+        **pool_options,
+    )
+    _track_pool_events(name, async_engine)
+    instrument_engine(name, async_engine.sync_engine)
+    if settings.SQL_PROFILING:
+        profile_engine(async_engine.sync_engine)
+    return async_engine
+
+
+def _track_pool_events(name: str, async_engine: AsyncEngine) -> None:
+    counters = pool_counters[name] = {
+        "connects": 0,
+        "checkouts": 0,
+        "invalidations": 0,
+    }
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        counters["connects"] += 1
+
+    @event.listens_for(async_engine.sync_engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        counters["checkouts"] += 1
+
+    @event.listens_for(async_engine.sync_engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        counters["invalidations"] += 1
+
+
+def get_pool_stats(name: str, async_engine: AsyncEngine) -> dict[str, Any]:
+    pool = async_engine.pool
+    stats: dict[str, Any] = {
+        "pool_class": type(pool).__name__,
+        **pool_counters.get(name, {}),
+    }
+    if not isinstance(pool, NullPool):
+        stats.update(
+            {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            }
+        )
+    return stats
+
+
+engine = build_async_engine(
+    "api", pool_size=settings.DB_POOL_SIZE, max_overflow=settings.DB_MAX_OVERFLOW
 )
 async_session = async_sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Celery workers run tasks on a per-process event loop (see `run_async`), so
+# pooled connections are reused across tasks
+worker_engine = build_async_engine(
+    "worker",
+    pool_size=settings.CELERY_DB_POOL_SIZE,
+    max_overflow=settings.CELERY_DB_MAX_OVERFLOW,
+)
+worker_async_session = async_sessionmaker(
+    autocommit=False, autoflush=False, bind=worker_engine
+)
+
 sync_engine = create_engine(settings.construct_sync_uri())
+instrument_engine("sync", sync_engine)
+if settings.SQL_PROFILING:
+    profile_engine(sync_engine)
 Session = sessionmaker(bind=sync_engine)
 
 
@@ -0,0 +1,42 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.metrics import http_request_duration
+
+
+class MetricsMiddleware:
+    """
+    Observes the latency of every HTTP request in `http_request_duration_seconds`,
+    labeled with the route template (e.g. `/api/contacts/{contact_id}`) so the
+    number of series stays bounded, requests matching no route share a label.
+    The duration covers the whole response, streamed bodies included.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # set by the router on the scope it shares with the middleware
+            route = scope.get("route")
+            http_request_duration.labels(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status),
+            ).observe(time.perf_counter() - started)
@@ -1,16 +1,30 @@
 from contextvars import ContextVar
 
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 request_object: ContextVar[Request] = ContextVar("request")
 
 
-class PaginationMiddleware(BaseHTTPMiddleware):
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        request_object.set(request)
-        response = await call_next(request)
-        return response
+class PaginationMiddleware:
+    """
+    Stores the current `Request` in `request_object` for the paginators.
+
+    Plain ASGI middleware, unlike `BaseHTTPMiddleware` it neither runs the app in
+    a separate task nor wraps the response stream, so streaming responses pass
+    through untouched.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = request_object.set(Request(scope, receive))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_object.reset(token)
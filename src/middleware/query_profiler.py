@@ -0,0 +1,30 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.db.profiler import profile_queries
+
+
+class QueryProfilerMiddleware:
+    """
+    Profiles the SQL statements of every HTTP request (see `src.db.profiler`)
+    and reports them in a `Server-Timing` response header. Statements run after
+    the response started, e.g. while streaming the body, are only logged.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with profile_queries(f"{scope['method']} {scope['path']}") as profile:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", profile.summary_header())
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,39 @@
+import re
+import uuid
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.logger import request_id
+
+# ids forwarded by a proxy are kept, unless they could garble the log lines
+VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+
+class RequestIdMiddleware:
+    """
+    Sets `request_id` for the log records of every HTTP request, from the
+    `X-Request-ID` header or a new uuid, and echoes it in the response.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = dict(scope["headers"]).get(b"x-request-id", b"").decode("latin-1")
+        current_id = incoming if VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Request-ID", current_id)
+            await send(message)
+
+        token = request_id.set(current_id)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id.reset(token)
@@ -1,9 +1,12 @@
 from typing import Optional
 
+from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.db.annotations import (
     indexed_nullable_string_256,
+    nullable_datetime,
+    nullable_int,
     nullable_json_array_column,
     nullable_string_256,
     uuid_pk,
@@ -20,8 +23,13 @@ class User(Base, DateTimeMixin):
 
 
 class OdooContact(Base, DateTimeMixin):
+    __table_args__ = (
+        # keyset pagination of contacts filtered by is_company
+        Index("ix_odoocontacts_is_company_odoo_id", "is_company", "odoo_id"),
+    )
+
     id: Mapped[uuid_pk]
-    odoo_id: Mapped[int] = mapped_column(index=True)
+    odoo_id: Mapped[int] = mapped_column(index=True, unique=True)
     name: Mapped[indexed_nullable_string_256]
     email: Mapped[indexed_nullable_string_256]
     company_name: Mapped[indexed_nullable_string_256]
@@ -31,10 +39,21 @@ class OdooContact(Base, DateTimeMixin):
 
 class OdooInvoice(Base, DateTimeMixin):
     id: Mapped[uuid_pk]
-    odoo_id: Mapped[int] = mapped_column(index=True)
+    odoo_id: Mapped[int] = mapped_column(index=True, unique=True)
     name: Mapped[indexed_nullable_string_256]
     partner_id: Mapped[nullable_json_array_column]
     invoice_date: Mapped[nullable_string_256]  # odoo returns "YYYY-MM-DD"
     amount_total: Mapped[Optional[float]] = mapped_column(nullable=True)
     state: Mapped[nullable_string_256]
     move_type: Mapped[nullable_string_256]
+
+
+class OdooSyncState(Base, DateTimeMixin):
+    """High-water mark of the incremental sync, one row per Odoo model."""
+
+    id: Mapped[uuid_pk]
+    model: Mapped[str] = mapped_column(String(64), unique=True)
+    last_write_date: Mapped[nullable_string_256]  # odoo returns "YYYY-MM-DD HH:MM:SS"
+    last_odoo_id: Mapped[nullable_int]
+    last_full_sync_at: Mapped[nullable_datetime]
+    import_checkpoint_id: Mapped[nullable_int]  # odoo id staged so far by an import
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import logging
+import typing
+
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import CompileError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import get_table_version
+from src.core.redis_client import AsyncRedisClient, redis_cache_client
+from src.core.settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+CountMode = typing.Literal["exact", "cached", "estimated", "auto", "none"]
+
+
+class TotalCounter:
+    """
+    Total count strategies for paginated listings.
+
+    - `exact`: `COUNT(*)` on every request
+    - `cached`: exact count cached in Redis, invalidated when the counted tables
+      are written to (see `src.core.cache.bump_table_versions`)
+    - `estimated`: planner estimate, `pg_class.reltuples` for a whole table,
+      `EXPLAIN` row estimate for a filtered query
+    - `auto`: the estimate for large results, cached exact count below
+      `PAGINATION_COUNT_ESTIMATE_THRESHOLD`
+    - `none`: no total at all
+
+    Estimates are cached like exact counts, a cached total is returned without
+    touching the database.
+    """
+
+    def __init__(
+        self,
+        redis_client: AsyncRedisClient = redis_cache_client,
+        ttl: int = settings.PAGINATION_COUNT_CACHE_TTL,
+        estimate_threshold: int = settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD,
+    ):
+        self.redis_client = redis_client
+        self.ttl = ttl
+        self.estimate_threshold = estimate_threshold
+
+    async def count(
+        self,
+        db: AsyncSession,
+        query: Select,
+        mode: typing.Optional[CountMode] = None,
+    ) -> typing.Optional[int]:
+        """
+        Args:
+            db: AsyncSession
+            query: the listing query, ordering and paging are ignored
+            mode: count strategy, `PAGINATION_COUNT_MODE` by default
+        Returns:
+            Optional[int]: total count, None for `none`
+        """
+        mode = mode or settings.PAGINATION_COUNT_MODE
+        query = query.order_by(None).limit(None).offset(None)
+        if mode == "none":
+            return None
+        if mode == "exact":
+            return await self.exact(db, query)
+
+        sql = self._compile(query)
+        key = await self._cache_key(query, sql) if sql else None
+        if mode == "cached":
+            return await self._cached_exact(db, query, key)
+
+        # the cache is checked first, the estimate costs a DB round trip too
+        estimate_key = f"estimate:{key}" if key else None
+        for cached_key in (key, estimate_key):
+            cached = await self._read(cached_key)
+            if cached is not None:
+                return cached
+
+        estimate = await self.estimate(db, query)
+        if estimate is not None and (
+            mode == "estimated" or estimate >= self.estimate_threshold
+        ):
+            await self._write(estimate_key, estimate)
+            return estimate
+        return await self._cached_exact(db, query, key)
+
+    @staticmethod
+    async def exact(db: AsyncSession, query: Select) -> int:
+        return await db.scalar(select(func.count()).select_from(query.subquery()))
+
+    @staticmethod
+    def _compile(query: Select) -> typing.Optional[str]:
+        try:
+            return str(
+                query.compile(
+                    dialect=postgresql.dialect(),
+                    compile_kwargs={"literal_binds": True},
+                )
+            )
+        except CompileError:
+            return None
+
+    async def _cache_key(self, query: Select, sql: str) -> typing.Optional[str]:
+        tables = sorted(table.name for table in query.get_final_froms())
+        versions = []
+        for table in tables:
+            version = await get_table_version(table, client=self.redis_client)
+            if version is None:
+                return None
+            versions.append(f"{table}:{version}")
+        digest = hashlib.sha1(sql.encode()).hexdigest()
+        return f"count:{','.join(versions)}:{digest}"
+
+    async def _read(self, key: typing.Optional[str]) -> typing.Optional[int]:
+        if key is None:
+            return None
+        try:
+            cached = await self.redis_client.get_value(key)
+        except Exception as e:
+            logger.warning(f"failed to read cached count: {e}")
+            return None
+        return int(cached) if cached is not None else None
+
+    async def _write(self, key: typing.Optional[str], count: int) -> None:
+        if key is None:
+            return
+        try:
+            await self.redis_client.set_value(key, count, ttl_seconds=self.ttl)
+        except Exception as e:
+            logger.warning(f"failed to cache count: {e}")
+
+    async def _cached_exact(
+        self, db: AsyncSession, query: Select, key: typing.Optional[str]
+    ) -> int:
+        cached = await self._read(key)
+        if cached is not None:
+            return cached
+        count = await self.exact(db, query)
+        await self._write(key, count)
+        return count
+
+    async def estimate(self, db: AsyncSession, query: Select) -> typing.Optional[int]:
+        """
+        Planner row estimate, None when the query can't be rendered for `EXPLAIN`.
+        """
+        froms = query.get_final_froms()
+        if query.whereclause is None and len(froms) == 1:
+            reltuples = await db.scalar(
+                text(
+                    "SELECT reltuples::bigint FROM pg_class "
+                    "WHERE oid = CAST(:t AS regclass)"
+                ),
+                {"t": froms[0].name},
+            )
+            # -1 (or 0 on older postgres) until the table is vacuumed/analyzed
+            if reltuples and reltuples > 0:
+                return reltuples
+
+        sql = self._compile(query)
+        if sql is None:
+            return None
+        conn = await db.connection()
+        result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+
+total_counter = TotalCounter()
@@ -1,12 +1,25 @@
+import base64
+import hashlib
+import hmac
+import json
 import typing
+import uuid
+from datetime import datetime
 
+from fastapi import HTTPException, status
 from pydantic import BaseModel
-from sqlalchemy import Select, func, select
+from sqlalchemy import Select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 
+from src.core.settings import get_settings
 from src.middleware.pagination import request_object
+from src.pagination.counts import CountMode, total_counter
+
+settings = get_settings()
 
 M = typing.TypeVar("M", bound=BaseModel)
+PaginationMode = typing.Literal["offset", "cursor"]
 
 
 class BasePaginator:
@@ -37,7 +50,10 @@ class BasePaginator:
         url = self.request.url.include_query_params(page=self.page - 1)
         return str(url)
 
-    def _get_number_of_pages(self, count: int) -> int:
+    def _get_number_of_pages(self, count: typing.Optional[int], page_size: int) -> int:
+        if count is None:
+            # no total, a full page means there may be a next one
+            return self.page + 1 if page_size >= self.per_page else self.page
         rest = count % self.per_page
         quotient = count // self.per_page
         return quotient if not rest else quotient + 1
@@ -54,10 +70,12 @@ class Paginator(BasePaginator):
         query: Select,
         page: int,
         per_page: int,
+        count_mode: typing.Optional[CountMode] = None,
     ):
         super().__init__(page=page, per_page=per_page)
         self.session = session
         self.query = query
+        self.count_mode = count_mode
 
     async def get_response(
         self, cast_to: typing.Optional[typing.Type[M]] = None
@@ -67,18 +85,19 @@ class Paginator(BasePaginator):
             items = [cast_to(**item.__dict__) for item in q]
         else:
             items = [{**item.__dict__} for item in q]
+        total_count = await self._get_total_count(len(items))
         return {
-            "total_count": await self._get_total_count(),
+            "total_count": total_count,
             "next_page": self._get_next_page(),
             "previous_page": self._get_previous_page(),
             "items": items,
         }
 
-    async def _get_total_count(self) -> int:
-        count = await self.session.scalar(
-            select(func.count()).select_from(self.query.subquery())
+    async def _get_total_count(self, page_size: int) -> typing.Optional[int]:
+        count = await total_counter.count(
+            self.session, self.query, mode=self.count_mode
         )
-        self.number_of_pages = self._get_number_of_pages(count)
+        self.number_of_pages = self._get_number_of_pages(count, page_size)
         return count
 
 
@@ -91,7 +110,7 @@ class RawPaginator(BasePaginator):
         super().__init__(page, per_page)
 
     def paginate_raw_sql_query(
-        self, total_count: int, items: list | dict
+        self, total_count: typing.Optional[int], items: list | dict
     ) -> dict[
         typing.Literal["total_count"]
         | typing.Literal["next_page"]
@@ -99,7 +118,9 @@ class RawPaginator(BasePaginator):
         | typing.Literal["items"],
         typing.Any,
     ]:
-        self.number_of_pages = self._get_number_of_pages(total_count)
+        self.number_of_pages = self._get_number_of_pages(
+            total_count, len(items) if isinstance(items, list) else 1
+        )
         return {
             "total_count": total_count,
             "next_page": self._get_next_page(),
@@ -108,22 +129,152 @@ class RawPaginator(BasePaginator):
         }
 
 
+class CursorPaginator:
+    """
+    Keyset (cursor) paginator designed for usage with orm queries.
+
+    Pages are selected with `WHERE (key columns) > (last seen values)` instead of
+    `OFFSET`, so with an index on the key columns every page costs the same.
+    The key columns must be unique together, e.g. `(created_at, id)` or
+    `odoo_id`. Cursors are opaque, HMAC-signed with `SECRET_KEY`, and only
+    move forward. Column-projected queries yield dict items, the key columns
+    must be among the selected ones.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        query: Select,
+        order_by: typing.Sequence[InstrumentedAttribute],
+        per_page: int,
+        cursor: typing.Optional[str] = None,
+    ):
+        self.session = session
+        self.query = query
+        self.order_by = order_by
+        self.per_page = per_page
+        self.cursor = cursor
+        self.request = request_object.get()
+
+    @staticmethod
+    def _sign(payload: bytes) -> str:
+        digest = hmac.new(settings.SECRET_KEY.encode(), payload, hashlib.sha256)
+        return base64.urlsafe_b64encode(digest.digest()[:16]).decode().rstrip("=")
+
+    def encode_cursor(self, item: typing.Any) -> str:
+        values = []
+        for column in self.order_by:
+            if isinstance(item, typing.Mapping):
+                value = item[column.key]
+            else:
+                value = getattr(item, column.key)
+            if isinstance(value, uuid.UUID):
+                value = str(value)
+            elif isinstance(value, datetime):
+                value = value.isoformat()
+            values.append(value)
+        payload = json.dumps(values, separators=(",", ":")).encode()
+        encoded = base64.urlsafe_b64encode(payload).decode().rstrip("=")
+        return f"{encoded}.{self._sign(payload)}"
+
+    def decode_cursor(self, cursor: str) -> list[typing.Any]:
+        invalid_cursor = HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+        try:
+            encoded, signature = cursor.split(".")
+            payload = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+        except ValueError:
+            raise invalid_cursor
+        # bytes, `compare_digest` raises TypeError on non-ASCII strings
+        if not hmac.compare_digest(signature.encode(), self._sign(payload).encode()):
+            raise invalid_cursor
+
+        values = json.loads(payload)
+        if len(values) != len(self.order_by):
+            raise invalid_cursor
+        decoded = []
+        for column, value in zip(self.order_by, values):
+            python_type = column.type.python_type
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is uuid.UUID:
+                value = uuid.UUID(value)
+            decoded.append(value)
+        return decoded
+
+    @staticmethod
+    def _selects_entity(query: Select) -> bool:
+        descriptions = query.column_descriptions
+        return (
+            len(descriptions) == 1
+            and descriptions[0]["expr"] is descriptions[0]["entity"]
+        )
+
+    def _get_next_page(self, next_cursor: typing.Optional[str]) -> typing.Optional[str]:
+        if not next_cursor:
+            return
+        url = self.request.url.include_query_params(cursor=next_cursor)
+        return str(url)
+
+    async def get_response(
+        self, cast_to: typing.Optional[typing.Type[M]] = None
+    ) -> dict:
+        query = self.query.order_by(*self.order_by)
+        if self.cursor:
+            query = query.where(
+                tuple_(*self.order_by) > tuple_(*self.decode_cursor(self.cursor))
+            )
+        # one extra row tells whether there is a next page
+        result = await self.session.execute(query.limit(self.per_page + 1))
+        if self._selects_entity(query):
+            rows = list(result.scalars())
+        else:
+            rows = [dict(row) for row in result.mappings()]
+        has_next = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        next_cursor = self.encode_cursor(rows[-1]) if has_next else None
+
+        if cast_to:
+            items = [cast_to.model_validate(row, from_attributes=True) for row in rows]
+        else:
+            items = rows
+        return {
+            "next_cursor": next_cursor,
+            "next_page": self._get_next_page(next_cursor),
+            "items": items,
+        }
+
+
 async def paginate(
     db: AsyncSession,
     query: Select,
     cast_to: typing.Optional[typing.Type[M]],
     page: int,
     per_page: int,
+    count_mode: typing.Optional[CountMode] = None,
 ) -> dict:
-    paginator = Paginator(db, query, page, per_page)
+    paginator = Paginator(db, query, page, per_page, count_mode=count_mode)
     return await paginator.get_response(cast_to=cast_to)
 
 
 def paginate_raw(
     page: int,
     per_page: int,
-    total_count: int,
+    total_count: typing.Optional[int],
     items: list[typing.Optional[dict]] | dict,
 ):
     paginator = RawPaginator(page=page, per_page=per_page)
     return paginator.paginate_raw_sql_query(total_count=total_count, items=items)
+
+
+async def paginate_cursor(
+    db: AsyncSession,
+    query: Select,
+    order_by: typing.Sequence[InstrumentedAttribute],
+    per_page: int,
+    cursor: typing.Optional[str] = None,
+    cast_to: typing.Optional[typing.Type[M]] = None,
+) -> dict:
+    paginator = CursorPaginator(db, query, order_by, per_page, cursor)
+    return await paginator.get_response(cast_to=cast_to)
@@ -1,10 +1,22 @@
 from logging import getLogger
-from typing import Any, Generic, Iterable, List, Optional, Type, TypeVar, Union
+from typing import (
+    Any,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+)
 from uuid import UUID
 
 from pydantic import BaseModel
-from sqlalchemy import delete, func, select, update
+from sqlalchemy import Select, delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
 from src.db.base import Base
 
@@ -20,10 +32,35 @@ class CRUDBase(Generic[ModelType]):
     async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
         return await db.get(self.model, id)
 
+    def _load_only(self, columns: Optional[Sequence[str]]) -> list[Any]:
+        """
+        `load_only` option for the given column names, the primary key is always
+        loaded. Accessing another column raises instead of lazy loading it, which
+        would fail in async code anyway.
+        """
+        if not columns:
+            return []
+        return [
+            load_only(*(getattr(self.model, name) for name in columns), raiseload=True)
+        ]
+
     async def get_multi(
-        self, db: AsyncSession, *, offset: int = 0, limit: int = 100
+        self,
+        db: AsyncSession,
+        *,
+        offset: int = 0,
+        limit: int = 100,
+        columns: Optional[Sequence[str]] = None,
     ) -> List[ModelType]:
-        statement = select(self.model).offset(offset).limit(limit)
+        """
+        :param columns - only load these columns of the entities
+        """
+        statement = (
+            select(self.model)
+            .options(*self._load_only(columns))
+            .offset(offset)
+            .limit(limit)
+        )
         result = await db.scalars(statement)
         return result.all()
 
@@ -39,6 +76,69 @@ class CRUDBase(Generic[ModelType]):
         await db.refresh(db_obj)
         return db_obj
 
+    async def bulk_upsert(
+        self,
+        db: AsyncSession,
+        rows: Sequence[Union[dict[str, Any], SchemaType]],
+        conflict_cols: Sequence[str],
+        update_cols: Optional[Sequence[str]] = None,
+        commit: bool = True,
+    ) -> int:
+        """
+        Insert rows or update existing ones with `INSERT ... ON CONFLICT DO UPDATE`.
+        Rows whose content did not change are left untouched, so `updated_at` and
+        the returned count only reflect real changes.
+
+        :param rows - dicts or schemas, all with the same keys
+        :param conflict_cols - columns of a unique constraint, e.g. ["odoo_id"]
+        :param update_cols - columns to overwrite on conflict, all non-conflict
+        columns of the rows by default
+        :param commit - commit the transaction after the upsert
+        :return number of inserted or changed rows
+        """
+        if not rows:
+            return 0
+
+        # a statement can't touch the same row twice, last occurrence wins
+        unique_rows = {}
+        for row in rows:
+            if isinstance(row, BaseModel):
+                row = row.model_dump(mode="json")
+            unique_rows[tuple(row[col] for col in conflict_cols)] = row
+        values = list(unique_rows.values())
+
+        if update_cols is None:
+            update_cols = [col for col in values[0] if col not in conflict_cols]
+
+        table = self.model.__table__
+        statement = insert(self.model)
+        if update_cols:
+            set_ = {col: statement.excluded[col] for col in update_cols}
+            if "updated_at" in table.c and "updated_at" not in set_:
+                set_["updated_at"] = func.now()
+            statement = statement.on_conflict_do_update(
+                index_elements=list(conflict_cols),
+                set_=set_,
+                where=or_(
+                    *(
+                        table.c[col].is_distinct_from(statement.excluded[col])
+                        for col in update_cols
+                    )
+                ),
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(
+                index_elements=list(conflict_cols)
+            )
+        statement = statement.returning(table.c[conflict_cols[0]])
+
+        # executemany, batched into multi-row VALUES by sqlalchemy
+        result = await db.execute(statement, values)
+        affected = len(result.all())
+        if commit:
+            await db.commit()
+        return affected
+
     async def update(
         self,
         db: AsyncSession,
@@ -66,21 +166,79 @@ class CRUDBase(Generic[ModelType]):
         return obj
 
     async def get_by_filters(
-        self, db: AsyncSession, **filters: Any
+        self,
+        db: AsyncSession,
+        columns: Optional[Sequence[str]] = None,
+        **filters: Any,
     ) -> Optional[ModelType]:
         """
+        :param columns - only load these columns of the entity
         :param filters - kwarg key is column name, kwarg value is filter value
         """
-        statement = select(self.model).filter_by(**filters)
+        statement = (
+            select(self.model).options(*self._load_only(columns)).filter_by(**filters)
+        )
         return await db.scalar(statement)
 
+    def select_by_filters(self, **filters: Any) -> Select:
+        """
+        :param filters - kwarg key is column name, kwarg value is filter value
+        """
+        return select(self.model).filter_by(**filters)
+
+    def select_columns_by_filters(
+        self, columns: Sequence[str], **filters: Any
+    ) -> Select:
+        """
+        :param columns - names of the selected columns, results are rows instead
+        of entities
+        :param filters - kwarg key is column name, kwarg value is filter value
+        """
+        return select(*(getattr(self.model, name) for name in columns)).filter_by(
+            **filters
+        )
+
+    async def get_rows_by_filters(
+        self,
+        db: AsyncSession,
+        columns: Sequence[str],
+        offset: int = 0,
+        limit: int = 100,
+        order_by: Optional[Sequence[Any]] = None,
+        **filters: Any,
+    ) -> List[dict[str, Any]]:
+        """
+        Column-projected `get_multi_by_filters`, skips building ORM entities.
+
+        :param columns - names of the selected columns
+        :param order_by - columns to order by, gives a stable order across pages
+        :param filters - kwarg key is column name, kwarg value is filter value
+        """
+        statement = self.select_columns_by_filters(columns, **filters)
+        if order_by:
+            statement = statement.order_by(*order_by)
+        statement = statement.offset(offset).limit(limit)
+        result = await db.execute(statement)
+        return [dict(row) for row in result.mappings()]
+
     async def get_multi_by_filters(
-        self, db: AsyncSession, offset: int = 0, limit: int = 100, **filters: Any
+        self,
+        db: AsyncSession,
+        offset: int = 0,
+        limit: int = 100,
+        order_by: Optional[Sequence[Any]] = None,
+        columns: Optional[Sequence[str]] = None,
+        **filters: Any,
     ) -> List[ModelType]:
         """
+        :param order_by - columns to order by, gives a stable order across pages
+        :param columns - only load these columns of the entities
         :param filters - kwarg key is column name, kwarg value is filter value
         """
-        statement = select(self.model).filter_by(**filters).offset(offset).limit(limit)
+        statement = self.select_by_filters(**filters).options(*self._load_only(columns))
+        if order_by:
+            statement = statement.order_by(*order_by)
+        statement = statement.offset(offset).limit(limit)
         result = await db.scalars(statement)
         return result.all()
 
@@ -90,9 +248,17 @@ class CRUDBase(Generic[ModelType]):
         ids: list[UUID | str],
         offset: int = 0,
         limit: int = 100,
+        columns: Optional[Sequence[str]] = None,
     ):
+        """
+        :param columns - only load these columns of the entities
+        """
         statement = (
-            select(self.model).where(self.model.id.in_(ids)).offset(offset).limit(limit)
+            select(self.model)
+            .options(*self._load_only(columns))
+            .where(self.model.id.in_(ids))
+            .offset(offset)
+            .limit(limit)
         )
         result = await db.scalars(statement)
         return result.all()
@@ -102,9 +268,14 @@ class CRUDBase(Generic[ModelType]):
         return [getattr(model, k) == v for k, v in filters.items()]
 
     async def get_by_filters_with_options(
-        self, db: AsyncSession, *options: Iterable[Any], **filters: Any
+        self,
+        db: AsyncSession,
+        *options: Iterable[Any],
+        columns: Optional[Sequence[str]] = None,
+        **filters: Any,
     ):
         """
+        :param columns - only load these columns of the entity
         :param filters - kwarg key is column name, kwarg value is filter value
         :param options - args with sqlalchemy compatible `.options()` values, such as
         ```
@@ -114,7 +285,11 @@ class CRUDBase(Generic[ModelType]):
         ]
         ```
         """
-        statement = select(self.model).where(*self._apply_filters(self.model, filters))
+        statement = (
+            select(self.model)
+            .where(*self._apply_filters(self.model, filters))
+            .options(*self._load_only(columns))
+        )
         if options:
             statement = statement.options(*options)
         return await db.scalar(statement)
@@ -125,9 +300,11 @@ class CRUDBase(Generic[ModelType]):
         offset: int = 0,
         limit: int = 100,
         *options: Iterable[Any],
+        columns: Optional[Sequence[str]] = None,
         **filters: Any,
     ) -> List[ModelType]:
         """
+        :param columns - only load these columns of the entities
         :param filters - kwarg key is column name, kwarg value is filter value
         :param options - args with sqlalchemy compatible `.options()` values, such as
         ```
@@ -140,6 +317,7 @@ class CRUDBase(Generic[ModelType]):
         statement = (
             select(self.model)
             .where(*self._apply_filters(self.model, filters))
+            .options(*self._load_only(columns))
             .offset(offset)
             .limit(limit)
         )
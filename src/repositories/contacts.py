@@ -1,22 +1,51 @@
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import Select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models import OdooContact
 from src.repositories.base import CRUDBase
+from src.repositories.staging import StagingTableLoader
+from src.schemas.odoo.schemas import OdooContactRead
 
 
 class OdooContactRepository(CRUDBase[OdooContact]):
+    # unique, backed by the (is_company, odoo_id) index for keyset pagination
+    cursor_key = (OdooContact.odoo_id,)
+    # columns of the API representation
+    read_columns = tuple(OdooContactRead.model_fields)
+
     def __init__(self):
         super().__init__(OdooContact)
 
+    def contacts_query(
+        self, is_company: bool = False, columns: Optional[Sequence[str]] = None
+    ) -> Select:
+        """
+        :param columns - select these columns instead of `OdooContact` entities
+        """
+        if columns:
+            return self.select_columns_by_filters(columns, is_company=is_company)
+        return self.select_by_filters(is_company=is_company)
+
     async def get_contacts(
         self,
         db: AsyncSession,
         is_company: bool = False,
         limit: int = 100,
         offset: int = 0,
-    ) -> list[OdooContact]:
-        return await self.get_multi_by_filters(
-            db, is_company=is_company, limit=limit, offset=offset
+        columns: Optional[Sequence[str]] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        :param columns - selected columns, `read_columns` by default
+        """
+        return await self.get_rows_by_filters(
+            db,
+            columns=columns or self.read_columns,
+            is_company=is_company,
+            limit=limit,
+            offset=offset,
+            order_by=self.cursor_key,
         )
 
     async def get_by_odoo_id(
@@ -24,8 +53,10 @@ class OdooContactRepository(CRUDBase[OdooContact]):
     ) -> OdooContact:
         return await self.get_by_filters(db=db, odoo_id=odoo_contact_id)
 
-    async def count_contacts(self, db: AsyncSession, is_company: bool = False) -> int:
-        return await self.count_with_filters(db=db, is_company=is_company)
-
 
 odoo_contact_repository = OdooContactRepository()
+odoo_contact_staging_loader = StagingTableLoader(
+    OdooContact,
+    columns=["odoo_id", "name", "email", "company_name", "company_id"],
+    key="odoo_id",
+)
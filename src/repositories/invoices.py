@@ -1,20 +1,48 @@
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import Select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models import OdooInvoice
 from src.repositories.base import CRUDBase
+from src.repositories.staging import StagingTableLoader
+from src.schemas.odoo.schemas import OdooInvoiceRead
 
 
 class OdooInvoiceRepository(CRUDBase[OdooInvoice]):
+    # unique, backed by the odoo_id index for keyset pagination
+    cursor_key = (OdooInvoice.odoo_id,)
+    # columns of the API representation
+    read_columns = tuple(OdooInvoiceRead.model_fields)
+
     def __init__(self):
         super().__init__(OdooInvoice)
 
-    async def get_invoices(
-        self, db: AsyncSession, limit: int = 100, offset: int = 0
-    ) -> list[OdooInvoice]:
-        return await self.get_multi_by_filters(db=db, limit=limit, offset=offset)
+    def invoices_query(self, columns: Optional[Sequence[str]] = None) -> Select:
+        """
+        :param columns - select these columns instead of `OdooInvoice` entities
+        """
+        if columns:
+            return self.select_columns_by_filters(columns)
+        return self.select_by_filters()
 
-    async def count_invoices(self, db: AsyncSession) -> int:
-        return await self.count_with_filters(db=db)
+    async def get_invoices(
+        self,
+        db: AsyncSession,
+        limit: int = 100,
+        offset: int = 0,
+        columns: Optional[Sequence[str]] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        :param columns - selected columns, `read_columns` by default
+        """
+        return await self.get_rows_by_filters(
+            db=db,
+            columns=columns or self.read_columns,
+            limit=limit,
+            offset=offset,
+            order_by=self.cursor_key,
+        )
 
     async def get_by_odoo_id(
         self, db: AsyncSession, odoo_invoice_id: int
@@ -23,3 +51,16 @@ class OdooInvoiceRepository(CRUDBase[OdooInvoice]):
 
 
 odoo_invoice_repository = OdooInvoiceRepository()
+odoo_invoice_staging_loader = StagingTableLoader(
+    OdooInvoice,
+    columns=[
+        "odoo_id",
+        "name",
+        "partner_id",
+        "invoice_date",
+        "amount_total",
+        "state",
+        "move_type",
+    ],
+    key="odoo_id",
+)
@@ -0,0 +1,165 @@
+import json
+from logging import getLogger
+from typing import Any, Generic, Optional, Sequence, Type
+
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    MetaData,
+    Table,
+    func,
+    literal,
+    null,
+    or_,
+    select,
+    text,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.repositories.base import ModelType
+
+logger = getLogger(__name__)
+
+TIMESTAMP_COLUMNS = ("created_at", "updated_at")
+
+
+class StagingTableLoader(Generic[ModelType]):
+    """
+    Bulk loader for very large imports.
+
+    Rows are streamed into an UNLOGGED `<table>_staging` copy of the model table
+    with asyncpg's binary `COPY`, then merged into the real table with a single
+    `INSERT ... SELECT ... ON CONFLICT DO UPDATE`. The staging table is a regular
+    table on purpose, it survives a crashed worker so the import can resume.
+    The same key may be staged twice (e.g. a page re-fetched after a resume), the
+    merge keeps the most recently staged row.
+    """
+
+    def __init__(self, model: Type[ModelType], columns: Sequence[str], key: str):
+        """
+        :param model - target model
+        :param columns - model columns provided by the loaded rows
+        :param key - unique column used to merge rows, e.g. "odoo_id"
+        """
+        self.model = model
+        self.columns = list(columns)
+        self.key = key
+        target = model.__table__
+        self.staging = Table(
+            f"{target.name}_staging",
+            MetaData(),
+            *(Column(name, target.c[name].type) for name in self.columns),
+            Column("staged_at", DateTime(timezone=True), server_default=func.now()),
+            prefixes=["UNLOGGED"],
+        )
+        self._json_columns = {
+            name for name in self.columns if isinstance(target.c[name].type, JSON)
+        }
+
+    async def create(self, db: AsyncSession) -> None:
+        conn = await db.connection()
+        await conn.run_sync(self.staging.create, checkfirst=True)
+
+    async def drop(self, db: AsyncSession) -> None:
+        conn = await db.connection()
+        await conn.run_sync(self.staging.drop, checkfirst=True)
+
+    async def reset(self, db: AsyncSession) -> None:
+        """Drop leftovers of a previous import and create an empty staging table."""
+        await self.drop(db)
+        await self.create(db)
+
+    async def count(self, db: AsyncSession) -> int:
+        return await db.scalar(select(func.count()).select_from(self.staging))
+
+    def _to_record(self, row: dict[str, Any]) -> tuple:
+        # sqlalchemy's asyncpg json/jsonb codecs take already serialized json
+        return tuple(
+            json.dumps(row.get(name))
+            if name in self._json_columns and row.get(name) is not None
+            else row.get(name)
+            for name in self.columns
+        )
+
+    async def copy(self, db: AsyncSession, rows: Sequence[dict[str, Any]]) -> int:
+        """
+        Append rows to the staging table with binary `COPY`, within the
+        transaction of `db`.
+        """
+        if not rows:
+            return 0
+        conn = await db.connection()
+        raw_connection = await conn.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        if not driver_connection.is_in_transaction():
+            # the asyncpg adapter begins its transaction with the first statement,
+            # COPY on the raw connection alone would autocommit
+            await conn.execute(select(1))
+        await driver_connection.copy_records_to_table(
+            self.staging.name,
+            records=[self._to_record(row) for row in rows],
+            columns=self.columns,
+        )
+        return len(rows)
+
+    def _default(self, name: str):
+        column = self.model.__table__.c[name]
+        if column.primary_key:
+            return func.gen_random_uuid()
+        if name in TIMESTAMP_COLUMNS:
+            return func.now()
+        if column.default is not None and column.default.is_scalar:
+            return literal(column.default.arg, column.type)
+        return null()
+
+    async def merge(
+        self, db: AsyncSession, update_cols: Optional[Sequence[str]] = None
+    ) -> int:
+        """
+        Merge the staging table into the model table in one statement. Existing
+        rows are only updated when their content changed.
+
+        :param update_cols - columns to overwrite on conflict, all staged columns
+        except the key by default
+        :return number of inserted or changed rows
+        """
+        target = self.model.__table__
+        if update_cols is None:
+            update_cols = [name for name in self.columns if name != self.key]
+
+        latest = (
+            select(*(self.staging.c[name] for name in self.columns))
+            .distinct(self.staging.c[self.key])
+            .order_by(self.staging.c[self.key], self.staging.c.staged_at.desc())
+            .subquery()
+        )
+        insert_cols = [column.name for column in target.columns]
+        source = select(
+            *(
+                latest.c[name] if name in self.columns else self._default(name)
+                for name in insert_cols
+            )
+        )
+        statement = insert(self.model).from_select(insert_cols, source)
+        set_ = {name: statement.excluded[name] for name in update_cols}
+        if "updated_at" in target.c:
+            set_["updated_at"] = func.now()
+        statement = statement.on_conflict_do_update(
+            index_elements=[self.key],
+            set_=set_,
+            where=or_(
+                *(
+                    target.c[name].is_distinct_from(statement.excluded[name])
+                    for name in update_cols
+                )
+            ),
+        )
+        result = await db.execute(statement)
+        logger.info(f"merged {self.staging.name} into {target.name}")
+        return result.rowcount
+
+    async def analyze(self, db: AsyncSession) -> None:
+        """Refresh planner stats of the target table after a large merge."""
+        await db.execute(text(f"ANALYZE {self.model.__table__.name}"))
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import OdooSyncState
+from src.repositories.base import CRUDBase
+
+
+class OdooSyncStateRepository(CRUDBase[OdooSyncState]):
+    def __init__(self):
+        super().__init__(OdooSyncState)
+
+    async def get_by_model(
+        self, db: AsyncSession, model: str
+    ) -> Optional[OdooSyncState]:
+        return await self.get_by_filters(db=db, model=model)
+
+    @staticmethod
+    def is_full_sync_due(state: Optional[OdooSyncState], interval_seconds: int) -> bool:
+        """
+        Full reconciliation is due when the model was never synced or the last
+        full sync is older than `interval_seconds`.
+        """
+        if state is None or state.last_write_date is None:
+            return True
+        if state.last_full_sync_at is None:
+            return True
+        deadline = datetime.now(timezone.utc) - timedelta(seconds=interval_seconds)
+        return state.last_full_sync_at < deadline
+
+    async def save_mark(
+        self,
+        db: AsyncSession,
+        model: str,
+        last_write_date: Optional[str],
+        last_odoo_id: Optional[int],
+        full_sync: bool = False,
+    ) -> OdooSyncState:
+        """
+        Persist the high-water mark, an empty run keeps the previous mark.
+        """
+        state = await self.get_by_model(db, model)
+        values = {}
+        if last_write_date is not None:
+            values["last_write_date"] = last_write_date
+            values["last_odoo_id"] = last_odoo_id
+        if full_sync:
+            values["last_full_sync_at"] = datetime.now(timezone.utc)
+
+        if state is None:
+            return await self.create(db, obj_in={"model": model, **values})
+        return await self.update(db, db_obj=state, obj_in=values)
+
+    async def save_import_checkpoint(
+        self, db: AsyncSession, model: str, checkpoint_id: Optional[int]
+    ) -> OdooSyncState:
+        """
+        Persist the Odoo id up to which an import is staged, `None` once the
+        import is merged.
+        """
+        state = await self.get_by_model(db, model)
+        values = {"import_checkpoint_id": checkpoint_id}
+        if state is None:
+            return await self.create(db, obj_in={"model": model, **values})
+        return await self.update(db, db_obj=state, obj_in=values)
+
+
+odoo_sync_state_repository = OdooSyncStateRepository()
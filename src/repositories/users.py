@@ -1,10 +1,11 @@
-from typing import Optional
+from typing import Any, Optional, Union
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.auth.user_cache import auth_user_cache
 from src.models import User
-from src.repositories.base import CRUDBase
+from src.repositories.base import CRUDBase, SchemaType
 
 
 class UserRepository(CRUDBase[User]):
@@ -21,5 +22,23 @@ class UserRepository(CRUDBase[User]):
         result = await db.execute(query)
         return result.scalar_one_or_none()
 
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: User,
+        obj_in: Union[dict[str, Any], SchemaType],
+    ) -> User:
+        email = db_obj.email
+        user = await super().update(db, db_obj=db_obj, obj_in=obj_in)
+        await auth_user_cache.invalidate(email)
+        return user
+
+    async def delete(self, db: AsyncSession, id: Any) -> Optional[User]:
+        user = await super().delete(db, id)
+        if user:
+            await auth_user_cache.invalidate(user.email)
+        return user
+
 
 user_repository = UserRepository()
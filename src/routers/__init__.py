@@ -1,6 +1,7 @@
 from src.routers.auth import router as auth_router
 from src.routers.contacts import router as contacts_router
 from src.routers.invoices import router as invoices_router
+from src.routers.jobs import router as jobs_router
 from src.routers.odoo import router as odoo_router
 
 __all__ = (
@@ -8,4 +9,5 @@ __all__ = (
     "contacts_router",
     "odoo_router",
     "invoices_router",
+    "jobs_router",
 )
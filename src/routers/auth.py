@@ -11,8 +11,7 @@ from src.repositories.users import user_repository
 from src.schemas.user import Token, UserCreate, UserRead
 from src.utils.auth import (
     create_access_token,
-    get_password_hash,
-    verify_password,
+    password_hasher,
 )
 
 settings = get_settings()
@@ -28,7 +27,7 @@ async def register(user_in: UserCreate, db: AsyncDBSession):
             detail="User with this username already exists.",
         )
 
-    hashed_password = get_password_hash(user_in.password)
+    hashed_password = await password_hasher.hash(user_in.password)
     user_data = user_in.model_dump()
     user_data["hashed_password"] = hashed_password
     del user_data["password"]
@@ -42,12 +41,22 @@ async def login(
     db: AsyncDBSession,
 ):
     user = await user_repository.get_by_username(db, username=form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    verified, new_hash = False, None
+    if user:
+        verified, new_hash = await password_hasher.verify_and_update(
+            form_data.password, user.hashed_password
+        )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash:
+        # cost factor changed since the password was hashed
+        await user_repository.update(
+            db, db_obj=user, obj_in={"hashed_password": new_hash}
+        )
 
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
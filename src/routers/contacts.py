@@ -1,38 +1,136 @@
+from typing import Optional
+
 from fastapi import APIRouter
 
 from src.core.auth.dependencies import CurrentUserDep
+from src.core.cache import response_cache
 from src.db.session import AsyncDBSession
-from src.pagination.pagination import paginate_raw
+from src.models import OdooContact
+from src.pagination.counts import CountMode, total_counter
+from src.pagination.pagination import PaginationMode, paginate_cursor, paginate_raw
 from src.repositories.contacts import odoo_contact_repository
+from src.schemas.api.pagination import CursorPage, Page
+from src.schemas.odoo.schemas import OdooContactPartialRead, OdooContactRead
+from src.services.export import ExportFormat, export_response
+from src.utils.helpers import parse_fields
 
 router = APIRouter(prefix="/api/contacts", tags=["contacts"])
 
 
-@router.get("")
+# `response_cache` returns the serialized page as is, so the schema only
+# documents the response
+@router.get(
+    "",
+    response_model=None,
+    responses={
+        200: {
+            "model": Page[OdooContactPartialRead] | CursorPage[OdooContactPartialRead],
+            "description": "Offset or cursor page",
+        }
+    },
+)
 async def get_contacts(
     db: AsyncDBSession,
     user: CurrentUserDep,
     is_company: bool = False,
     page: int = 1,
     per_page: int = 100,
+    pagination: PaginationMode = "offset",
+    cursor: Optional[str] = None,
+    count: Optional[CountMode] = None,
+    fields: Optional[str] = None,
 ):
-    contacts = await odoo_contact_repository.get_contacts(
-        db=db, is_company=is_company, limit=per_page, offset=(page - 1) * per_page
+    """
+    `pagination=cursor` switches to keyset pagination, follow `next_page` (or pass
+    `next_cursor` as `cursor`) to get the next page, `page` is ignored.
+    `count` picks how `total_count` is computed (`exact`, `cached`, `estimated`,
+    `auto` or `none`), see `TotalCounter`.
+    `fields` is a comma separated list of the returned fields, e.g.
+    `fields=name,email`, `odoo_id` is always returned.
+    """
+    columns = parse_fields(
+        fields,
+        allowed=odoo_contact_repository.read_columns,
+        always=[column.key for column in odoo_contact_repository.cursor_key],
     )
-    total_count = await odoo_contact_repository.count_contacts(
-        db=db, is_company=is_company
+
+    async def load():
+        if pagination == "cursor":
+            return await paginate_cursor(
+                db=db,
+                query=odoo_contact_repository.contacts_query(
+                    is_company=is_company,
+                    columns=columns,
+                ),
+                order_by=odoo_contact_repository.cursor_key,
+                per_page=per_page,
+                cursor=cursor,
+            )
+
+        contacts = await odoo_contact_repository.get_contacts(
+            db=db,
+            is_company=is_company,
+            limit=per_page,
+            offset=(page - 1) * per_page,
+            columns=columns,
+        )
+        total_count = await total_counter.count(
+            db,
+            query=odoo_contact_repository.contacts_query(is_company=is_company),
+            mode=count,
+        )
+        return paginate_raw(
+            items=contacts, page=page, per_page=per_page, total_count=total_count
+        )
+
+    return await response_cache.get_or_load(
+        "contacts", tables=[OdooContact.__tablename__], load=load
     )
-    return paginate_raw(
-        items=contacts, page=page, per_page=per_page, total_count=total_count
+
+
+@router.get("/export")
+async def export_contacts(
+    user: CurrentUserDep,
+    is_company: bool = False,
+    format: ExportFormat = "ndjson",
+    compress: bool = False,
+):
+    """
+    Stream every contact matching the filters as NDJSON or CSV, ordered by Odoo
+    id. `compress=true` gzips the stream.
+    """
+    return export_response(
+        query=odoo_contact_repository.contacts_query(is_company=is_company).order_by(
+            *odoo_contact_repository.cursor_key
+        ),
+        columns=list(OdooContact.__table__.columns),
+        export_format=format,
+        filename="contacts",
+        compress=compress,
     )
 
 
-@router.get("/{contact_id}")
+# validated in `load`, `response_cache` returns the serialized row as is
+@router.get(
+    "/{contact_id}",
+    response_model=None,
+    responses={
+        200: {"model": Optional[OdooContactRead], "description": "The contact or null"}
+    },
+)
 async def get_contact(
     db: AsyncDBSession,
     user: CurrentUserDep,
     odoo_contact_id: int,
 ):
-    return await odoo_contact_repository.get_by_odoo_id(
-        db=db, odoo_contact_id=odoo_contact_id
+    async def load():
+        contact = await odoo_contact_repository.get_by_odoo_id(
+            db=db, odoo_contact_id=odoo_contact_id
+        )
+        return OdooContactRead.model_validate(contact) if contact else None
+
+    return await response_cache.get_or_load(
+        "contact",
+        tables=[OdooContact.__tablename__],
+        load=load,
     )
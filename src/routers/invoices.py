@@ -1,35 +1,125 @@
+from typing import Optional
+
 from fastapi import APIRouter
 
 from src.core.auth.dependencies import CurrentUserDep
+from src.core.cache import response_cache
 from src.db.session import AsyncDBSession
-from src.pagination.pagination import paginate_raw
+from src.models import OdooInvoice
+from src.pagination.counts import CountMode, total_counter
+from src.pagination.pagination import PaginationMode, paginate_cursor, paginate_raw
 from src.repositories.invoices import odoo_invoice_repository
+from src.schemas.api.pagination import CursorPage, Page
+from src.schemas.odoo.schemas import OdooInvoicePartialRead, OdooInvoiceRead
+from src.services.export import ExportFormat, export_response
+from src.utils.helpers import parse_fields
 
 router = APIRouter(prefix="/api/invoices", tags=["invoices"])
 
 
-@router.get("")
+# `response_cache` returns the serialized page as is, so the schema only
+# documents the response
+@router.get(
+    "",
+    response_model=None,
+    responses={
+        200: {
+            "model": Page[OdooInvoicePartialRead] | CursorPage[OdooInvoicePartialRead],
+            "description": "Offset or cursor page",
+        }
+    },
+)
 async def get_invoices(
     db: AsyncDBSession,
     user: CurrentUserDep,
     page: int = 1,
     per_page: int = 100,
+    pagination: PaginationMode = "offset",
+    cursor: Optional[str] = None,
+    count: Optional[CountMode] = None,
+    fields: Optional[str] = None,
 ):
-    invoices = await odoo_invoice_repository.get_invoices(
-        db=db, limit=per_page, offset=(page - 1) * per_page
+    """
+    `pagination=cursor` switches to keyset pagination, follow `next_page` (or pass
+    `next_cursor` as `cursor`) to get the next page, `page` is ignored.
+    `count` picks how `total_count` is computed (`exact`, `cached`, `estimated`,
+    `auto` or `none`), see `TotalCounter`.
+    `fields` is a comma separated list of the returned fields, e.g.
+    `fields=name,amount_total`, `odoo_id` is always returned.
+    """
+    columns = parse_fields(
+        fields,
+        allowed=odoo_invoice_repository.read_columns,
+        always=[column.key for column in odoo_invoice_repository.cursor_key],
+    )
+
+    async def load():
+        if pagination == "cursor":
+            return await paginate_cursor(
+                db=db,
+                query=odoo_invoice_repository.invoices_query(columns=columns),
+                order_by=odoo_invoice_repository.cursor_key,
+                per_page=per_page,
+                cursor=cursor,
+            )
+
+        invoices = await odoo_invoice_repository.get_invoices(
+            db=db, limit=per_page, offset=(page - 1) * per_page, columns=columns
+        )
+        total_count = await total_counter.count(
+            db, query=odoo_invoice_repository.invoices_query(), mode=count
+        )
+        return paginate_raw(
+            items=invoices, page=page, per_page=per_page, total_count=total_count
+        )
+
+    return await response_cache.get_or_load(
+        "invoices", tables=[OdooInvoice.__tablename__], load=load
     )
-    total_count = await odoo_invoice_repository.count_invoices(db=db)
-    return paginate_raw(
-        items=invoices, page=page, per_page=per_page, total_count=total_count
+
+
+@router.get("/export")
+async def export_invoices(
+    user: CurrentUserDep,
+    format: ExportFormat = "ndjson",
+    compress: bool = False,
+):
+    """
+    Stream every invoice as NDJSON or CSV, ordered by Odoo id. `compress=true`
+    gzips the stream.
+    """
+    return export_response(
+        query=odoo_invoice_repository.invoices_query().order_by(
+            *odoo_invoice_repository.cursor_key
+        ),
+        columns=list(OdooInvoice.__table__.columns),
+        export_format=format,
+        filename="invoices",
+        compress=compress,
     )
 
 
-@router.get("/{invoice_id}")
+# validated in `load`, `response_cache` returns the serialized row as is
+@router.get(
+    "/{invoice_id}",
+    response_model=None,
+    responses={
+        200: {"model": Optional[OdooInvoiceRead], "description": "The invoice or null"}
+    },
+)
 async def get_invoice(
     db: AsyncDBSession,
     user: CurrentUserDep,
     invoice_id: int,
 ):
-    return await odoo_invoice_repository.get_by_odoo_id(
-        db=db, odoo_invoice_id=invoice_id
+    async def load():
+        invoice = await odoo_invoice_repository.get_by_odoo_id(
+            db=db, odoo_invoice_id=invoice_id
+        )
+        return OdooInvoiceRead.model_validate(invoice) if invoice else None
+
+    return await response_cache.get_or_load(
+        "invoice",
+        tables=[OdooInvoice.__tablename__],
+        load=load,
     )
@@ -0,0 +1,29 @@
+from celery.result import AsyncResult
+from fastapi import APIRouter
+
+from src.celery.celery_app import celery_app
+from src.core.auth.dependencies import CurrentUserDep
+from src.schemas.api.jobs import JobStatus
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+@router.get("/{job_id}", response_model=JobStatus)
+def get_job(job_id: str, user: CurrentUserDep):
+    """
+    Status of a job enqueued by an endpoint called with `?async=true`, read
+    from the Celery result backend.
+    Args:
+        job_id: str
+
+    Returns:
+        JobStatus: `PENDING` (queued, or unknown id), `STARTED`, `RETRY`,
+            `SUCCESS` with the result or `FAILURE` with the error
+    """
+    result = AsyncResult(job_id, app=celery_app)
+    job = JobStatus(job_id=job_id, status=result.state, name=result.name)
+    if result.successful():
+        job.result = result.result
+    elif result.failed():
+        job.error = repr(result.result)
+    return job
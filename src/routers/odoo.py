@@ -1,11 +1,29 @@
-from fastapi import APIRouter
+import asyncio
+
+from celery import Task
+from fastapi import APIRouter, HTTPException, Query, status
 
 from src.core.auth.dependencies import CurrentUserDep
-from src.db.session import AsyncDBSession
+from src.core.auth.user_cache import auth_user_cache
+from src.core.cache import response_cache
+from src.celery.tasks import create_odoo_contact, create_odoo_invoice
+from src.db.session import AsyncDBSession, engine, get_pool_stats
 from src.repositories.contacts import odoo_contact_repository
-from src.schemas.api.odoo import InvoiceCreatePayload
+from src.rpc.async_client import async_odoo_client
+from src.rpc.pool import odoo_client_pool
+from src.core.settings import get_settings
+from src.utils.serialization import JSONResponse
+from src.schemas.api.jobs import JobCreated
+from src.schemas.api.odoo import (
+    BulkCreateResult,
+    ContactCreatePayload,
+    InvoiceBulkCreatePayload,
+    InvoiceCreatePayload,
+)
 from src.services.odoo import OdooServiceDep
+from src.utils.auth import password_hasher
 
+settings = get_settings()
 router = APIRouter(prefix="/api/utils", tags=["utils"])
 
 # NOTE: all endpoints/interfaces from this router are for utils and testing purposes of odoo API functionality
@@ -27,7 +45,7 @@ async def get_contacts_from_odoo(
     Returns:
         list[OdooContact]: list of Odoo contacts
     """
-    return odoo_service.get_contacts_from_odoo(limit=limit, offset=offset)
+    return await odoo_service.get_contacts_from_odoo(limit=limit, offset=offset)
 
 
 @router.post("/odoo-create-contact")
@@ -39,6 +57,7 @@ async def create_contact(
     name: str,
     email: str,
     company_name: str,
+    async_: bool = Query(False, alias="async"),
 ):
     """
     Helper endpoint to create a contact in Odoo for tests during the development.
@@ -46,13 +65,51 @@ async def create_contact(
         name: str
         email: str
         company_name: str
+        async_: enqueue the creation as a job and return its ID right away
 
     Returns:
-        int: Odoo contact ID
+        int: Odoo contact ID, or JobCreated with `?async=true`
     """
+    if async_:
+        return await _enqueue(create_odoo_contact, name, email, company_name)
     return await odoo_service.create_and_insert_contact(db, name, email, company_name)
 
 
+async def _enqueue(task: Task, *args) -> JSONResponse:
+    # the broker publish is blocking I/O, kept off the event loop
+    result = await asyncio.to_thread(task.delay, *args)
+    job = JobCreated(job_id=result.id, status_url=f"/api/jobs/{result.id}")
+    return JSONResponse(job, status_code=status.HTTP_202_ACCEPTED)
+
+
+def _check_bulk_size(items: list) -> None:
+    if len(items) > settings.ODOO_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.ODOO_BULK_MAX_ITEMS} items per request",
+        )
+
+
+@router.post("/odoo-create-contacts-bulk", response_model=BulkCreateResult)
+async def create_contacts_bulk(
+    user: CurrentUserDep,
+    odoo_service: OdooServiceDep,
+    db: AsyncDBSession,
+    contacts: list[ContactCreatePayload],
+):
+    """
+    Create many contacts in Odoo with batched calls and insert them into the DB.
+    Items failing in Odoo are reported and skipped, the others are created.
+    Args:
+        contacts: list[ContactCreatePayload]
+
+    Returns:
+        BulkCreateResult: Odoo contact ID or error of every item, by index
+    """
+    _check_bulk_size(contacts)
+    return await odoo_service.create_and_insert_contacts_bulk(db, contacts)
+
+
 @router.get("/odoo-contacts")
 async def get_contacts(
     db: AsyncDBSession,
@@ -92,7 +149,7 @@ async def get_invoices_from_odoo(
     Returns:
         list[OdooInvoice]: list of Odoo invoices
     """
-    return odoo_service.get_invoices_from_odoo(limit=limit, offset=offset)
+    return await odoo_service.get_invoices_from_odoo(limit=limit, offset=offset)
 
 
 @router.post("/odoo-create-invoice")
@@ -102,21 +159,46 @@ async def create_invoice(
     db: AsyncDBSession,
     partner_id: int,
     invoice_lines: list[InvoiceCreatePayload],
+    async_: bool = Query(False, alias="async"),
 ):
     """
     Helper endpoint to create an invoice in Odoo for tests during the development.
     Args:
         partner_id: int
         invoice_lines: list[InvoiceCreatePayload]
+        async_: enqueue the creation as a job and return its ID right away
 
     Returns:
-        int: Odoo invoice ID
+        int: Odoo invoice ID, or JobCreated with `?async=true`
     """
+    if async_:
+        lines = [line.model_dump() for line in invoice_lines]
+        return await _enqueue(create_odoo_invoice, partner_id, lines)
     return await odoo_service.create_and_insert_invoice(
         db=db, partner_id=partner_id, invoice_lines=invoice_lines
     )
 
 
+@router.post("/odoo-create-invoices-bulk", response_model=BulkCreateResult)
+async def create_invoices_bulk(
+    user: CurrentUserDep,
+    odoo_service: OdooServiceDep,
+    db: AsyncDBSession,
+    invoices: list[InvoiceBulkCreatePayload],
+):
+    """
+    Create many invoices in Odoo with batched calls and insert them into the DB.
+    Items failing in Odoo are reported and skipped, the others are created.
+    Args:
+        invoices: list[InvoiceBulkCreatePayload]
+
+    Returns:
+        BulkCreateResult: Odoo invoice ID or error of every item, by index
+    """
+    _check_bulk_size(invoices)
+    return await odoo_service.create_and_insert_invoices_bulk(db, invoices)
+
+
 @router.get("/odoo-partners-list")
 async def get_partners_from_odoo(
     user: CurrentUserDep,
@@ -133,4 +215,66 @@ async def get_partners_from_odoo(
     Returns:
         list[OdooPartner]: list of Odoo partners
     """
-    return odoo_service.client.get_partners(limit=limit, offset=offset)
+    return await odoo_service.client.get_partners(limit=limit, offset=offset)
+
+
+@router.get("/odoo-pool-stats")
+async def get_odoo_pool_stats(user: CurrentUserDep, check_health: bool = False):
+    """
+    Helper endpoint to inspect the Odoo connection pools of this API process:
+    the async client used by the handlers, and the XML-RPC client pool used by
+    the sync paths (Celery tasks, sync traversal), idle unless they run here.
+    Args:
+        check_health: bool - ping Odoo with a pooled connection of the async client
+
+    Returns:
+        dict: pool limits, usage and authentication stats of both clients
+    """
+    stats = {
+        "async_client": async_odoo_client.stats(),
+        "xmlrpc_pool": odoo_client_pool.stats(),
+    }
+    if check_health:
+        try:
+            await async_odoo_client.version()
+            stats["healthy"] = True
+        except Exception:
+            stats["healthy"] = False
+    return stats
+
+
+@router.get("/db-pool-stats")
+async def get_db_pool_stats(user: CurrentUserDep):
+    """
+    Helper endpoint to inspect the database connection pool of this API process.
+
+    Returns:
+        dict: pool size, checked in/out and overflow connections, event counters
+    """
+    return get_pool_stats("api", engine)
+
+
+@router.get("/cache-stats")
+async def get_cache_stats(user: CurrentUserDep):
+    """
+    Helper endpoint to inspect the caches of this API process.
+
+    Returns:
+        dict: response cache hits, misses and errors per cached endpoint,
+            authenticated user cache size and hits
+    """
+    return {
+        "responses": response_cache.stats(),
+        "auth_users": auth_user_cache.stats(),
+    }
+
+
+@router.get("/password-hash-stats")
+async def get_password_hash_stats(user: CurrentUserDep):
+    """
+    Helper endpoint to inspect the password hashing executor of this API process.
+
+    Returns:
+        dict: worker cap, running and queued hash/verify calls
+    """
+    return password_hasher.stats()
@@ -0,0 +1,417 @@
+import asyncio
+import logging
+import time
+import xmlrpc.client
+from typing import Any, Optional
+
+import httpx
+from tenacity import AsyncRetrying
+
+from src.core.metrics import odoo_rpc_labels, track_odoo_rpc
+from src.core.settings import get_settings
+from src.rpc.circuit_breaker import AsyncRedisCircuitBreaker
+from src.rpc.client import (
+    DEFAULT_INVOICE_DOMAIN,
+    INVOICE_FIELDS,
+    PARTNER_FIELDS,
+    RETRYABLE_METHODS,
+    OdooCallBatcher,
+    build_contact_values,
+    build_invoice_values,
+    is_access_denied,
+    is_transient_error,
+    retry_options,
+)
+from src.schemas.api.odoo import InvoiceCreatePayload
+from src.utils.exceptions import OdooFaultError, OdooProtocolError
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class AsyncOdooClient:
+    """
+    asyncio-native counterpart of `OdooClient`.
+
+    Speaks the same XML-RPC protocol over a shared `httpx.AsyncClient`, so calls
+    never block the event loop. Connections are kept alive in a bounded pool and
+    the number of in-flight calls is capped by a semaphore. Concurrent `create`
+    and `read` calls are coalesced by `OdooCallBatcher`. Calls go through a
+    circuit breaker, idempotent ones are retried on transient errors.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = settings.ODOO_ASYNC_MAX_CONNECTIONS,
+        max_concurrency: int = settings.ODOO_ASYNC_MAX_CONCURRENCY,
+        timeout: float = settings.ODOO_RPC_TIMEOUT,
+    ):
+        # NOTE: https is required by Odoo even if port 443 is specified
+        self.url = f"{settings.ODOO_PROTOCOL}://{settings.ODOO_HOST}:{settings.ODOO_PORT}/xmlrpc/2"  # noqa: E501
+        self.db = settings.ODOO_DATABASE
+        self.username = settings.ODOO_USER
+        self.api_key = settings.ODOO_API_KEY
+
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.http: Optional[httpx.AsyncClient] = None
+        self.uid: Optional[int] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._auth_lock = asyncio.Lock()
+        self.batcher = OdooCallBatcher(self._execute_kw)
+        self.circuit_breaker = AsyncRedisCircuitBreaker()
+        # stats
+        self.in_flight = 0
+        self.calls = 0
+        self.errors = 0
+        self.authentications = 0
+        self.last_authenticated_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    async def connect(self) -> None:
+        """
+        Create the HTTP connection pool and log in to Odoo.
+        Authentication failures are logged only, the client retries lazily.
+        """
+        if self.http is None:
+            self.http = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                headers={"Content-Type": "text/xml"},
+            )
+        try:
+            await self.authenticate()
+        except (OdooFaultError, OdooProtocolError, httpx.HTTPError) as err:
+            self.last_error = str(err)
+            logger.warning(f"Async Odoo client warm-up failed: {err}")
+
+    async def disconnect(self) -> None:
+        if self.http is not None:
+            await self.http.aclose()
+            self.http = None
+        self.uid = None
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.disconnect()
+
+    async def authenticate(self) -> int:
+        """
+        Log in to Odoo and cache the UID on the client.
+
+        Returns:
+            int: Odoo user ID
+        """
+        uid = await self._call(
+            "common", "authenticate", self.db, self.username, self.api_key, {}
+        )
+        if not uid:
+            raise OdooFaultError("Authentication failed with Odoo")
+
+        logger.info(f"Authenticated with Odoo, UID: {uid}")
+        self.uid = uid
+        self.authentications += 1
+        self.last_authenticated_at = time.time()
+        return uid
+
+    async def version(self) -> dict:
+        return await self._call("common", "version")
+
+    async def _call(self, service: str, method: str, *params) -> Any:
+        """
+        Make a RPC call to Odoo through the circuit breaker.
+        Args:
+            service: XML-RPC endpoint, `common` or `object`
+            method: the method to call
+            *params: the arguments to pass to the method
+
+        Returns:
+            Any: the result of the RPC call
+        Raises:
+            OdooCircuitOpenError: Odoo is failing, the call wasn't made
+        """
+        await self.circuit_breaker.before_call()
+        try:
+            with track_odoo_rpc(*odoo_rpc_labels(method, params)):
+                result = await self._rpc(service, method, *params)
+        except Exception as err:
+            if is_transient_error(err):
+                await self.circuit_breaker.on_failure()
+            else:
+                await self.circuit_breaker.on_success()
+            raise
+        await self.circuit_breaker.on_success()
+        return result
+
+    async def _rpc(self, service: str, method: str, *params) -> Any:
+        if self.http is None:
+            raise OdooProtocolError(
+                "Async Odoo client is not connected. Call 'connect' first."
+            )
+
+        url = f"{self.url}/{service}"
+        payload = xmlrpc.client.dumps(params, methodname=method)
+        async with self._semaphore:
+            self.in_flight += 1
+            self.calls += 1
+            try:
+                response = await self.http.post(url, content=payload)
+                if response.status_code != 200:
+                    details = {
+                        "url": url,
+                        "errcode": response.status_code,
+                        "errmsg": response.reason_phrase,
+                        "headers": dict(response.headers),
+                    }
+                    logger.error(
+                        f"Odoo Protocol Error: {response.status_code} "
+                        f"{response.reason_phrase}",
+                        extra=details,
+                    )
+                    raise OdooProtocolError(
+                        f"Odoo error: {response.status_code} "
+                        f"{response.reason_phrase}, details: {details}",
+                        details=details,
+                    )
+                result, _ = xmlrpc.client.loads(response.content)
+                return result[0]
+
+            except xmlrpc.client.Fault as err:
+                details = {
+                    "faultCode": err.faultCode,
+                    "faultString": err.faultString,
+                }
+                logger.error(
+                    f"Odoo Fault: {err.faultCode} - {err.faultString}", extra=details
+                )
+                raise OdooFaultError(
+                    f"Odoo Fault: {err.faultString}", details=details
+                ) from err
+
+            except OdooProtocolError as err:
+                self.errors += 1
+                self.last_error = err.message
+                raise
+
+            except Exception as err:
+                self.errors += 1
+                self.last_error = str(err)
+                logger.exception("Unexpected error during Odoo RPC call")
+                raise err
+
+            finally:
+                self.in_flight -= 1
+
+    async def _ensure_authenticated(self, stale_uid: Optional[int] = None) -> int:
+        # a single login even when many concurrent calls hit a stale UID
+        async with self._auth_lock:
+            if self.uid is None or self.uid == stale_uid:
+                await self.authenticate()
+            return self.uid
+
+    async def _execute_kw(
+        self, model: str, method: str, args: list, kwargs: Optional[dict] = None
+    ) -> Any:
+        """
+        Call `execute_kw` on the object endpoint with the cached credentials.
+        Re-authenticates once and retries if Odoo rejects the cached UID.
+        Idempotent methods are retried with backoff on transient errors.
+        """
+        if method not in RETRYABLE_METHODS:
+            return await self._execute_kw_once(model, method, args, kwargs)
+        async for attempt in AsyncRetrying(**retry_options()):
+            with attempt:
+                return await self._execute_kw_once(model, method, args, kwargs)
+
+    async def _execute_kw_once(
+        self, model: str, method: str, args: list, kwargs: Optional[dict] = None
+    ) -> Any:
+        uid = self.uid
+        if uid is None:
+            uid = await self._ensure_authenticated()
+
+        call_args = [model, method, args] + ([kwargs] if kwargs else [])
+        try:
+            return await self._call(
+                "object", "execute_kw", self.db, uid, self.api_key, *call_args
+            )
+        except OdooFaultError as err:
+            if not is_access_denied(err):
+                raise
+            logger.warning("Odoo rejected cached UID, re-authenticating")
+            uid = await self._ensure_authenticated(stale_uid=uid)
+            return await self._call(
+                "object", "execute_kw", self.db, uid, self.api_key, *call_args
+            )
+
+    async def get_data(
+        self,
+        model: str,
+        fields: list[str],
+        domain: list,
+        limit: int = 100,
+        offset: int = 0,
+        order: Optional[str] = None,
+    ) -> list[dict]:
+        options = {"fields": fields, "limit": limit, "offset": offset}
+        if order:
+            options["order"] = order
+        return await self._execute_kw(model, "search_read", [domain], options)
+
+    async def create_data(self, model: str, values: dict) -> int:
+        return await self.batcher.call(model, "create", [values])
+
+    async def create_many(self, model: str, values: list[dict]) -> list[int]:
+        """Create several records in one call, IDs follow the order of `values`."""
+        if not values:
+            return []
+        return await self._execute_kw(model, "create", [values])
+
+    async def read_data(
+        self, model: str, ids: list[int], fields: list[str]
+    ) -> list[dict]:
+        return await self.batcher.call(model, "read", [ids], {"fields": fields})
+
+    async def update_data(self, model: str, id: int, values: dict) -> bool:
+        return await self._execute_kw(model, "write", [[id], values])
+
+    async def delete_data(self, model: str, id: int) -> bool:
+        return await self._execute_kw(model, "unlink", [[id]])
+
+    async def delete_many(self, model: str, ids: list[int]) -> bool:
+        return await self._execute_kw(model, "unlink", [ids])
+
+    async def get_count(self, model: str, domain: list) -> int:
+        return await self._execute_kw(model, "search_count", [domain])
+
+    async def get_contacts(
+        self,
+        is_company: bool = False,
+        limit: int = 100,
+        offset: int = 0,
+        order: Optional[str] = None,
+    ) -> list[dict]:
+        """
+        :param is_company: if True, return companies, if False, return contacts
+        :param limit: number of records to return
+        :param offset: number of records to skip
+        :param order: Odoo `order` spec, e.g. "id asc"
+        """
+        return await self.get_data(
+            model="res.partner",
+            fields=PARTNER_FIELDS,
+            domain=[("is_company", "=", is_company)],
+            limit=limit,
+            offset=offset,
+            order=order,
+        )
+
+    async def create_contact(self, name: str, email: str, company_name: str) -> int:
+        """
+        Create a contact in Odoo, see `OdooClient.create_contact`.
+        """
+        company_id = await self.create_data(
+            model="res.partner",
+            values={
+                "name": company_name,
+                "is_company": True,
+            },
+        )
+        return await self.create_data(
+            model="res.partner",
+            values=build_contact_values(name, email, company_id),
+        )
+
+    async def create_contacts_bulk(self, contacts: list[dict]) -> list[int]:
+        """
+        Create contacts and their companies in Odoo in two RPC calls, see
+        `OdooClient.create_contacts_bulk`.
+        """
+        if not contacts:
+            return []
+        company_ids = await self.create_many(
+            model="res.partner",
+            values=[
+                {"name": contact["company_name"], "is_company": True}
+                for contact in contacts
+            ],
+        )
+        return await self.create_many(
+            model="res.partner",
+            values=[
+                build_contact_values(contact["name"], contact["email"], company_id)
+                for contact, company_id in zip(contacts, company_ids)
+            ],
+        )
+
+    async def get_invoices(
+        self,
+        domain: list | None = None,
+        limit: int = 100,
+        offset: int = 0,
+        order: Optional[str] = None,
+    ) -> list[dict]:
+        if domain is None:
+            domain = DEFAULT_INVOICE_DOMAIN
+        return await self.get_data(
+            model="account.move",
+            fields=INVOICE_FIELDS,
+            domain=domain,
+            limit=limit,
+            offset=offset,
+            order=order,
+        )
+
+    async def get_partners(
+        self,
+        domain: list | None = None,
+        limit: int = 100,
+        offset: int = 0,
+        order: Optional[str] = None,
+    ) -> list[dict]:
+        if domain is None:
+            domain = []
+        return await self.get_data(
+            model="res.partner",
+            fields=PARTNER_FIELDS,
+            domain=domain,
+            limit=limit,
+            offset=offset,
+            order=order,
+        )
+
+    async def create_invoice(
+        self,
+        partner_id: int,
+        invoice_lines: list[InvoiceCreatePayload],
+        move_type: str = "out_invoice",
+        **kwargs,
+    ) -> int:
+        values = build_invoice_values(partner_id, invoice_lines, move_type, **kwargs)
+        return await self.create_data(model="account.move", values=values)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "max_connections": self.max_connections,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "errors": self.errors,
+            "connected": self.http is not None,
+            "authenticated": self.uid is not None,
+            "authentications": self.authentications,
+            "last_authenticated_at": self.last_authenticated_at,
+            "last_error": self.last_error,
+            "batching": self.batcher.stats(),
+            "circuit_breaker": self.circuit_breaker.stats(),
+        }
+
+
+async_odoo_client = AsyncOdooClient()
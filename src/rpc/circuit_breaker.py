@@ -0,0 +1,247 @@
+import logging
+import threading
+import time
+from typing import Any, Literal, Optional
+
+import redis
+
+from src.core.redis_client import AsyncRedisClient, redis_cache_client
+from src.core.settings import get_settings
+from src.utils.exceptions import OdooCircuitOpenError
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker guarding the Odoo RPC calls of a process.
+
+    - `closed`: calls go through, consecutive transient failures are counted
+    - `open`: reached `failure_threshold`, calls fail fast with
+      `OdooCircuitOpenError` for `reset_timeout` seconds
+    - `half_open`: after the timeout a single trial call goes through, its
+      success closes the circuit, its failure opens it again
+
+    This class only holds the state machine, the subclasses share the moment
+    the circuit opened with the other processes through Redis, so one worker
+    noticing an Odoo outage makes every API and Celery process fail fast.
+    """
+
+    def __init__(
+        self,
+        name: str = "odoo",
+        failure_threshold: int = settings.ODOO_CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: int = settings.ODOO_CIRCUIT_RESET_TIMEOUT,
+        sync_interval: float = settings.ODOO_CIRCUIT_SYNC_INTERVAL,
+        shared: bool = settings.ODOO_CIRCUIT_SHARED,
+    ):
+        """
+        Args:
+            name: circuit name, part of the shared Redis key
+            failure_threshold: consecutive failures opening the circuit
+            reset_timeout: seconds before a trial call is let through
+            sync_interval: seconds between reads of the shared state
+            shared: share the state with other processes
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.sync_interval = sync_interval
+        self.shared = shared
+        self._lock = threading.Lock()
+        self.state: CircuitState = "closed"
+        self.failures = 0
+        # wall clock, comparable across processes
+        self.opened_at = 0.0
+        self._probe_started_at: Optional[float] = None
+        self._synced_at = 0.0
+        # stats
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def shared_key(self) -> str:
+        return f"circuit:{self.name}:opened_at"
+
+    def _retry_after(self) -> float:
+        return max(self.opened_at + self.reset_timeout - time.time(), 0.0)
+
+    def _open(self, opened_at: float) -> None:
+        self.state = "open"
+        self.opened_at = opened_at
+        self._probe_started_at = None
+        self.times_opened += 1
+
+    def _should_sync(self) -> bool:
+        if not self.shared:
+            return False
+        now = time.monotonic()
+        if now - self._synced_at < self.sync_interval:
+            return False
+        self._synced_at = now
+        return True
+
+    def _apply_shared(self, value: Optional[Any]) -> None:
+        """Open the circuit opened by another process."""
+        if value is None:
+            return
+        opened_at = float(value)
+        with self._lock:
+            if self.state == "closed" and opened_at > self.opened_at:
+                logger.warning(f"circuit {self.name} opened by another process")
+                self._open(opened_at)
+
+    def allow(self) -> None:
+        """
+        Raises:
+            OdooCircuitOpenError: the circuit is open, or half-open with the
+                trial call in flight
+        """
+        with self._lock:
+            if self.state == "open" and self._retry_after() <= 0:
+                logger.info(f"circuit {self.name} half-open, letting a trial call")
+                self.state = "half_open"
+            # a trial call that never reported back doesn't block the circuit
+            if self.state == "half_open" and (
+                self._probe_started_at is None
+                or time.monotonic() - self._probe_started_at > self.reset_timeout
+            ):
+                self._probe_started_at = time.monotonic()
+                return
+            if self.state == "closed":
+                return
+            self.rejected += 1
+            retry_after = self._retry_after()
+        raise OdooCircuitOpenError(
+            f"Odoo circuit is open, retry in {retry_after:.0f}s",
+            details={"circuit": self.name, "retry_after": retry_after},
+        )
+
+    def record_success(self) -> bool:
+        """
+        Returns:
+            bool: True when the call closed the circuit
+        """
+        with self._lock:
+            self.failures = 0
+            if self.state == "closed":
+                return False
+            logger.info(f"circuit {self.name} closed")
+            self.state = "closed"
+            self._probe_started_at = None
+            return True
+
+    def record_failure(self) -> bool:
+        """
+        Returns:
+            bool: True when the failure opened the circuit
+        """
+        with self._lock:
+            self.failures += 1
+            if self.state == "open":
+                return False
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                logger.warning(
+                    f"circuit {self.name} open for {self.reset_timeout}s after "
+                    f"{self.failures} consecutive failures"
+                )
+                self._open(time.time())
+                return True
+            return False
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_after": self._retry_after() if self.state == "open" else 0,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "shared": self.shared,
+        }
+
+
+class RedisCircuitBreaker(CircuitBreaker):
+    """
+    `CircuitBreaker` of the blocking `OdooClient`, shared through a blocking
+    Redis connection with short timeouts. Thread-safe, one per process.
+    """
+
+    def __init__(self, *args, redis_url: str = settings.REDIS_CACHE_URI, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.redis_url = redis_url
+        self._redis: Optional[redis.Redis] = None
+
+    @property
+    def redis(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.Redis.from_url(
+                self.redis_url,
+                decode_responses=True,
+                socket_connect_timeout=0.5,
+                socket_timeout=0.5,
+            )
+        return self._redis
+
+    def before_call(self) -> None:
+        if self._should_sync():
+            try:
+                self._apply_shared(self.redis.get(self.shared_key))
+            except Exception as e:
+                logger.debug(f"failed to read shared circuit state: {e}")
+        self.allow()
+
+    def on_success(self) -> None:
+        if self.record_success() and self.shared:
+            try:
+                self.redis.delete(self.shared_key)
+            except Exception as e:
+                logger.debug(f"failed to share closed circuit: {e}")
+
+    def on_failure(self) -> None:
+        if self.record_failure() and self.shared:
+            try:
+                self.redis.set(self.shared_key, self.opened_at, ex=self.reset_timeout)
+            except Exception as e:
+                logger.debug(f"failed to share open circuit: {e}")
+
+
+class AsyncRedisCircuitBreaker(CircuitBreaker):
+    """
+    `CircuitBreaker` of `AsyncOdooClient`, shared through the Redis cache client.
+    """
+
+    def __init__(
+        self, *args, redis_client: AsyncRedisClient = redis_cache_client, **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.redis_client = redis_client
+
+    async def before_call(self) -> None:
+        if self._should_sync():
+            try:
+                self._apply_shared(await self.redis_client.get_value(self.shared_key))
+            except Exception as e:
+                logger.debug(f"failed to read shared circuit state: {e}")
+        self.allow()
+
+    async def on_success(self) -> None:
+        if self.record_success() and self.shared:
+            try:
+                await self.redis_client.del_value(self.shared_key)
+            except Exception as e:
+                logger.debug(f"failed to share closed circuit: {e}")
+
+    async def on_failure(self) -> None:
+        if self.record_failure() and self.shared:
+            try:
+                await self.redis_client.set_value(
+                    self.shared_key, self.opened_at, ttl_seconds=self.reset_timeout
+                )
+            except Exception as e:
+                logger.debug(f"failed to share open circuit: {e}")
+
+
+odoo_circuit_breaker = RedisCircuitBreaker()
@@ -1,8 +1,22 @@
+import asyncio
+import http.client
+import json
 import logging
 import xmlrpc.client
-from typing import Any
+from typing import Any, Awaitable, Callable, Optional
 
+import httpx
+from tenacity import (
+    Retrying,
+    before_sleep_log,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+from src.core.metrics import odoo_rpc_labels, track_odoo_rpc
 from src.core.settings import get_settings
+from src.rpc.circuit_breaker import RedisCircuitBreaker, odoo_circuit_breaker
 from src.schemas.api.odoo import InvoiceCreatePayload
 from src.utils.exceptions import OdooFaultError, OdooProtocolError
 
@@ -10,30 +24,374 @@ settings = get_settings()
 logger = logging.getLogger(__name__)
 
 
+ACCESS_DENIED_MARKERS = ("AccessDenied", "Access Denied", "Access denied")
+PARTNER_FIELDS = ["id", "name", "email", "display_name", "company_id", "write_date"]
+INVOICE_FIELDS = [
+    "id",
+    "name",
+    "partner_id",
+    "invoice_date",
+    "amount_total",
+    "state",
+    "move_type",
+    "write_date",
+]
+DEFAULT_INVOICE_DOMAIN = [("move_type", "=", "out_invoice")]
+# methods whose concurrent calls can be merged into one `execute_kw`
+BATCHABLE_METHODS = ("create", "read")
+# read-only methods, safe to call again after a transient error
+RETRYABLE_METHODS = ("search_read", "search_count", "search", "read")
+# HTTP statuses of an overloaded or unavailable Odoo
+TRANSIENT_HTTP_STATUSES = (429, 500, 502, 503, 504)
+
+
+def is_access_denied(err: OdooFaultError) -> bool:
+    fault_string = str(err.details.get("faultString", ""))
+    return any(marker in fault_string for marker in ACCESS_DENIED_MARKERS)
+
+
+def is_transient_error(err: BaseException) -> bool:
+    """
+    Network errors, timeouts and 429/5xx responses, they count towards the
+    circuit breaker and are retried. Odoo faults are answers from a healthy
+    server and are neither.
+    """
+    if isinstance(err, OdooProtocolError):
+        return err.details.get("errcode") in TRANSIENT_HTTP_STATUSES
+    return isinstance(err, (OSError, http.client.HTTPException, httpx.TransportError))
+
+
+def retry_options() -> dict[str, Any]:
+    """
+    tenacity options of idempotent Odoo calls, exponential backoff with full
+    jitter so retries of concurrent callers don't hit Odoo in lockstep.
+    """
+    return dict(
+        stop=stop_after_attempt(settings.ODOO_RPC_RETRIES),
+        wait=wait_random_exponential(
+            multiplier=0.5, max=settings.ODOO_RPC_RETRY_MAX_WAIT
+        ),
+        retry=retry_if_exception(is_transient_error),
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+        reraise=True,
+    )
+
+
+def is_batchable(method: str, args: list) -> bool:
+    """
+    `create` of a single values dict, or `read` of a list of ids.
+    """
+    if method == "create":
+        return len(args) == 1 and isinstance(args[0], dict)
+    if method == "read":
+        return len(args) == 1 and isinstance(args[0], list)
+    return False
+
+
+def combine_calls(method: str, calls: list[list]) -> list:
+    """
+    Merge the positional args of batchable calls into the args of one call,
+    Odoo's `create` takes a list of values dicts, `read` a list of ids.
+    """
+    if method == "create":
+        return [[args[0] for args in calls]]
+    if method == "read":
+        return [sorted({id_ for args in calls for id_ in args[0]})]
+    raise ValueError(f"{method} calls can't be batched")
+
+
+def split_result(method: str, calls: list[list], result: Any) -> list:
+    """
+    Split the result of a combined call back into one result per call.
+    """
+    if method == "create":
+        return list(result)
+    if method == "read":
+        records = {record["id"]: record for record in result}
+        return [[records[id_] for id_ in args[0] if id_ in records] for args in calls]
+    raise ValueError(f"{method} calls can't be batched")
+
+
+def build_contact_values(name: str, email: str, company_id: int) -> dict:
+    return {
+        "name": name,
+        "email": email,
+        "is_company": False,
+        "parent_id": company_id,
+    }
+
+
+def build_invoice_values(
+    partner_id: int,
+    invoice_lines: list[InvoiceCreatePayload],
+    move_type: str = "out_invoice",
+    **kwargs,
+) -> dict:
+    lines = [(0, 0, line.model_dump(mode="json")) for line in invoice_lines]
+    return {
+        "partner_id": partner_id,
+        "move_type": move_type,
+        "invoice_line_ids": lines,
+        **kwargs,
+    }
+
+
+class _TimeoutMixin:
+    """Socket timeout of the XML-RPC transports, the default ones wait forever."""
+
+    def __init__(self, timeout: float, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timeout = timeout
+
+    def make_connection(self, host):
+        connection = super().make_connection(host)
+        connection.timeout = self.timeout
+        return connection
+
+
+class TimeoutTransport(_TimeoutMixin, xmlrpc.client.Transport):
+    pass
+
+
+class TimeoutSafeTransport(_TimeoutMixin, xmlrpc.client.SafeTransport):
+    pass
+
+
+def make_transport(
+    protocol: str = settings.ODOO_PROTOCOL, timeout: float = settings.ODOO_RPC_TIMEOUT
+) -> xmlrpc.client.Transport:
+    if protocol == "https":
+        return TimeoutSafeTransport(timeout)
+    return TimeoutTransport(timeout)
+
+
+ExecuteKwFn = Callable[[str, str, list, Optional[dict]], Awaitable[Any]]
+
+
+class OdooCallBatcher:
+    """
+    Coalesces concurrent `create`/`read` calls on the same model into a single
+    `execute_kw` call with list arguments.
+
+    The first call of a batch waits `window` seconds for others to join, the
+    batch is flushed earlier once it reaches `max_size`. Every caller gets its
+    own part of the result. Odoo runs a call in one transaction, so when it
+    rejects the combined call with a fault, the calls are re-run one by one and
+    only the offending callers get an error. Network errors are not fanned out,
+    a `create` may have gone through, every caller of the batch gets them.
+    Other methods, and calls that already pass lists, are executed directly.
+    """
+
+    def __init__(
+        self,
+        execute: ExecuteKwFn,
+        window: float = settings.ODOO_BATCH_WINDOW_MS / 1000,
+        max_size: int = settings.ODOO_BATCH_MAX_SIZE,
+    ):
+        """
+        Args:
+            execute: `execute_kw` coroutine, `(model, method, args, kwargs)`
+            window: seconds to wait for concurrent calls, 0 disables batching
+            max_size: max number of calls per batch
+        """
+        self.execute = execute
+        self.window = window
+        self.max_size = max_size
+        # (model, method, kwargs) -> calls waiting for the next flush
+        self._pending: dict[tuple, list[tuple[list, asyncio.Future]]] = {}
+        self._tasks: set[asyncio.Task] = set()
+        # stats
+        self.calls = 0
+        self.batches = 0
+
+    async def call(
+        self, model: str, method: str, args: list, kwargs: Optional[dict] = None
+    ) -> Any:
+        self.calls += 1
+        if self.window <= 0 or not is_batchable(method, args):
+            self.batches += 1
+            return await self.execute(model, method, args, kwargs)
+
+        key = (model, method, json.dumps(kwargs, sort_keys=True))
+        future = asyncio.get_running_loop().create_future()
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = []
+            self._spawn(self._flush_later(key, batch))
+        batch.append((args, future))
+        if len(batch) >= self.max_size:
+            self._spawn(self._flush(key, batch))
+        return await future
+
+    def _spawn(self, coro: Awaitable[None]) -> None:
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush_later(self, key: tuple, batch: list) -> None:
+        await asyncio.sleep(self.window)
+        await self._flush(key, batch)
+
+    async def _flush(self, key: tuple, batch: list) -> None:
+        if self._pending.get(key) is not batch:
+            return  # already flushed
+        del self._pending[key]
+
+        model, method, kwargs = key[0], key[1], json.loads(key[2])
+        calls = [args for args, _ in batch]
+        self.batches += 1
+        results: list[Any]
+        try:
+            if len(calls) == 1:
+                results = [await self.execute(model, method, calls[0], kwargs)]
+            else:
+                result = await self.execute(
+                    model, method, combine_calls(method, calls), kwargs
+                )
+                results = split_result(method, calls, result)
+                logger.debug("coalesced %s %s.%s calls", len(calls), model, method)
+        except OdooFaultError as err:
+            if len(calls) == 1:
+                results = [err]
+            else:
+                # one invalid create or missing id fails the combined call, Odoo
+                # rolled it back, so each call is re-run on its own to fail alone
+                logger.warning(
+                    f"coalesced {model}.{method} of {len(calls)} calls failed, "
+                    f"running them one by one: {err}"
+                )
+                self.batches += len(calls)
+                results = await asyncio.gather(
+                    *(self.execute(model, method, args, kwargs) for args in calls),
+                    return_exceptions=True,
+                )
+        except Exception as err:
+            # network errors and open circuits would fail the single calls too
+            results = [err] * len(calls)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "window_ms": self.window * 1000,
+            "max_size": self.max_size,
+            "calls": self.calls,
+            "rpc_calls": self.batches,
+            "pending": sum(len(batch) for batch in self._pending.values()),
+        }
+
+
 class OdooClient:
-    def __init__(self):
-        self.url = f"https://{settings.ODOO_HOST}:{settings.ODOO_PORT}/xmlrpc/2"  # NOTE: https is required even if port 443 is specified  # noqa: E501
+    """
+    XML-RPC client for Odoo external API.
+
+    `xmlrpc.client.ServerProxy` keeps its HTTP(S) connection alive between calls,
+    so an instance is meant to be long-lived and reused (see `OdooClientPool`)
+    instead of being created per request.
+    """
+
+    def __init__(
+        self,
+        uid: Optional[int] = None,
+        on_authenticate: Optional[Callable[[int], None]] = None,
+        circuit_breaker: RedisCircuitBreaker = odoo_circuit_breaker,
+        timeout: float = settings.ODOO_RPC_TIMEOUT,
+    ):
+        """
+        Args:
+            uid: already known Odoo user ID, skips the `authenticate` round trip
+            on_authenticate: callback invoked with the new UID after each login
+            circuit_breaker: breaker shared by the clients of the process
+            timeout: socket timeout of the RPC calls in seconds
+        """
+        # NOTE: https is required by Odoo even if port 443 is specified
+        self.url = f"{settings.ODOO_PROTOCOL}://{settings.ODOO_HOST}:{settings.ODOO_PORT}/xmlrpc/2"  # noqa: E501
         self.db = settings.ODOO_DATABASE
         self.username = settings.ODOO_USER
         self.api_key = settings.ODOO_API_KEY
+        self.on_authenticate = on_authenticate
+        self.circuit_breaker = circuit_breaker
 
-        self.common = xmlrpc.client.ServerProxy(f"{self.url}/common")
-        self.uid = self._call(
-            self.common.authenticate, self.db, self.username, self.api_key, {}
+        self.common = xmlrpc.client.ServerProxy(
+            f"{self.url}/common",
+            transport=make_transport(settings.ODOO_PROTOCOL, timeout),
         )
-        logger.info(f"Authenticated with Odoo, UID: {self.uid}")
+        self.models = xmlrpc.client.ServerProxy(
+            f"{self.url}/object",
+            transport=make_transport(settings.ODOO_PROTOCOL, timeout),
+        )
+
+        self.uid = uid
+        if self.uid is None:
+            self.authenticate()
+
+    def authenticate(self) -> int:
+        """
+        Log in to Odoo and cache the UID on the client.
 
-        if not self.uid:
+        Returns:
+            int: Odoo user ID
+        """
+        uid = self._call(
+            self.common.authenticate, self.db, self.username, self.api_key, {}
+        )
+        if not uid:
             raise OdooFaultError("Authentication failed with Odoo")
 
-        self.models = xmlrpc.client.ServerProxy(f"{self.url}/object")
+        logger.info(f"Authenticated with Odoo, UID: {uid}")
+        self.uid = uid
+        if self.on_authenticate:
+            self.on_authenticate(uid)
+        return uid
+
+    def close(self) -> None:
+        """Close the underlying keep-alive connections."""
+        self.common("close")()
+        self.models("close")()
 
     def version(self) -> str:
         return self.common.version()
 
+    def _execute_kw(
+        self, model: str, method: str, args: list, kwargs: Optional[dict] = None
+    ) -> Any:
+        """
+        Call `execute_kw` on the object endpoint with the cached credentials.
+        Re-authenticates once and retries if Odoo rejects the cached UID.
+        Idempotent methods are retried with backoff on transient errors.
+        """
+        if method not in RETRYABLE_METHODS:
+            return self._execute_kw_once(model, method, args, kwargs)
+        for attempt in Retrying(**retry_options()):
+            with attempt:
+                return self._execute_kw_once(model, method, args, kwargs)
+
+    def _execute_kw_once(
+        self, model: str, method: str, args: list, kwargs: Optional[dict] = None
+    ) -> Any:
+        call_args = [model, method, args] + ([kwargs] if kwargs else [])
+        try:
+            return self._call(
+                self.models.execute_kw, self.db, self.uid, self.api_key, *call_args
+            )
+        except OdooFaultError as err:
+            if not is_access_denied(err):
+                raise
+            logger.warning("Odoo rejected cached UID, re-authenticating")
+            self.authenticate()
+            return self._call(
+                self.models.execute_kw, self.db, self.uid, self.api_key, *call_args
+            )
+
     def _call(self, service_method, *args, **kwargs) -> Any:
         """
-        Make a RPC call to Odoo.
+        Make a RPC call to Odoo through the circuit breaker.
         Args:
             service_method: the method to call
             *args: the arguments to pass to the method
@@ -41,7 +399,25 @@ class OdooClient:
 
         Returns:
             Any: the result of the RPC call
+        Raises:
+            OdooCircuitOpenError: Odoo is failing, the call wasn't made
         """
+        # `_Method` of `ServerProxy` keeps the XML-RPC method name private
+        method = getattr(service_method, "_Method__name", "unknown")
+        self.circuit_breaker.before_call()
+        try:
+            with track_odoo_rpc(*odoo_rpc_labels(method, args)):
+                result = self._rpc(service_method, *args, **kwargs)
+        except Exception as err:
+            if is_transient_error(err):
+                self.circuit_breaker.on_failure()
+            else:
+                self.circuit_breaker.on_success()
+            raise
+        self.circuit_breaker.on_success()
+        return result
+
+    def _rpc(self, service_method, *args, **kwargs) -> Any:
         try:
             return service_method(*args, **kwargs)
         except xmlrpc.client.ProtocolError as err:
@@ -82,82 +458,66 @@ class OdooClient:
         domain: list,
         limit: int = 100,
         offset: int = 0,
+        order: Optional[str] = None,
     ) -> list[dict]:
-        return self._call(
-            self.models.execute_kw,
-            self.db,
-            self.uid,
-            self.api_key,
-            model,
-            "search_read",
-            [domain],
-            {"fields": fields, "limit": limit, "offset": offset},
-        )
+        options = {"fields": fields, "limit": limit, "offset": offset}
+        if order:
+            options["order"] = order
+        return self._execute_kw(model, "search_read", [domain], options)
 
     def create_data(self, model: str, values: dict) -> int:
-        return self._call(
-            self.models.execute_kw,
-            self.db,
-            self.uid,
-            self.api_key,
-            model,
-            "create",
-            [values],
-        )
+        return self._execute_kw(model, "create", [values])
+
+    def create_many(self, model: str, values: list[dict]) -> list[int]:
+        """Create several records in one call, IDs follow the order of `values`."""
+        if not values:
+            return []
+        return self._execute_kw(model, "create", [values])
+
+    def read_data(self, model: str, ids: list[int], fields: list[str]) -> list[dict]:
+        return self._execute_kw(model, "read", [ids], {"fields": fields})
 
     def update_data(self, model: str, id: int, values: dict) -> bool:
-        return self._call(
-            self.models.execute_kw,
-            self.db,
-            self.uid,
-            self.api_key,
-            model,
-            "write",
-            [[id], values],
-        )
+        return self._execute_kw(model, "write", [[id], values])
 
     def delete_data(self, model: str, id: int) -> bool:
-        return self._call(
-            self.models.execute_kw,
-            self.db,
-            self.uid,
-            self.api_key,
-            model,
-            "unlink",
-            [[id]],
-        )
+        return self._execute_kw(model, "unlink", [[id]])
 
     def get_count(self, model: str, domain: list) -> int:
-        return self._call(
-            self.models.execute_kw,
-            self.db,
-            self.uid,
-            self.api_key,
-            model,
-            "search_count",
-            [domain],
-        )
+        return self._execute_kw(model, "search_count", [domain])
+
+    def search_ids(
+        self,
+        model: str,
+        domain: list,
+        limit: Optional[int] = None,
+        order: Optional[str] = None,
+    ) -> list[int]:
+        options = {"limit": limit} if limit else {}
+        if order:
+            options["order"] = order
+        return self._execute_kw(model, "search", [domain], options)
 
     def get_contacts(
-        self, is_company: bool = False, limit: int = 100, offset: int = 0
+        self,
+        is_company: bool = False,
+        limit: int = 100,
+        offset: int = 0,
+        order: Optional[str] = None,
     ) -> list[dict]:
         """
         :param is_company: if True, return companies, if False, return contacts
         :param limit: number of records to return
         :param offset: number of records to skip
+        :param order: Odoo `order` spec, e.g. "id asc"
         """
         return self.get_data(
             model="res.partner",
-            fields=[
-                "id",
-                "name",
-                "email",
-                "display_name",
-                "company_id",
-            ],
+            fields=PARTNER_FIELDS,
             domain=[("is_company", "=", is_company)],
             limit=limit,
             offset=offset,
+            order=order,
         )
 
     def create_contact(
@@ -185,16 +545,41 @@ class OdooClient:
         )
         return self.create_data(
             model="res.partner",
-            values={
-                "name": name,
-                "email": email,
-                "is_company": False,
-                "parent_id": company_id,
-            },
+            values=build_contact_values(name, email, company_id),
+        )
+
+    def create_contacts_bulk(self, contacts: list[dict]) -> list[int]:
+        """
+        Create contacts and their companies in Odoo, two RPC calls in total.
+        Args:
+            contacts: list of dicts with `name`, `email` and `company_name` keys
+
+        Returns:
+            list[int]: Odoo contact IDs, in the order of `contacts`
+        """
+        if not contacts:
+            return []
+        company_ids = self.create_many(
+            model="res.partner",
+            values=[
+                {"name": contact["company_name"], "is_company": True}
+                for contact in contacts
+            ],
+        )
+        return self.create_many(
+            model="res.partner",
+            values=[
+                build_contact_values(contact["name"], contact["email"], company_id)
+                for contact, company_id in zip(contacts, company_ids)
+            ],
         )
 
     def get_invoices(
-        self, domain: list | None = None, limit: int = 100, offset: int = 0
+        self,
+        domain: list | None = None,
+        limit: int = 100,
+        offset: int = 0,
+        order: Optional[str] = None,
     ) -> list[dict]:
         """
         Get invoices from Odoo.
@@ -202,39 +587,38 @@ class OdooClient:
             domain: list of tuples for filtering
             limit: max number of records
             offset: number of records to skip
+            order: Odoo `order` spec, e.g. "id asc"
 
         Returns:
             list[dict]: list of invoices
         """
         if domain is None:
-            domain = [("move_type", "=", "out_invoice")]
+            domain = DEFAULT_INVOICE_DOMAIN
         return self.get_data(
             model="account.move",
-            fields=[
-                "id",
-                "name",
-                "partner_id",
-                "invoice_date",
-                "amount_total",
-                "state",
-                "move_type",
-            ],
+            fields=INVOICE_FIELDS,
             domain=domain,
             limit=limit,
             offset=offset,
+            order=order,
         )
 
     def get_partners(
-        self, domain: list | None = None, limit: int = 100, offset: int = 0
+        self,
+        domain: list | None = None,
+        limit: int = 100,
+        offset: int = 0,
+        order: Optional[str] = None,
     ) -> list[dict]:
         if domain is None:
             domain = []
         return self.get_data(
             model="res.partner",
-            fields=["id", "name", "email", "display_name", "company_id"],
+            fields=PARTNER_FIELDS,
             domain=domain,
             limit=limit,
             offset=offset,
+            order=order,
         )
 
     def create_invoice(
@@ -255,12 +639,5 @@ class OdooClient:
         Returns:
             int: Odoo invoice ID
         """
-        lines = [(0, 0, line.model_dump(mode="json")) for line in invoice_lines]
-
-        values = {
-            "partner_id": partner_id,
-            "move_type": move_type,
-            "invoice_line_ids": lines,
-            **kwargs,
-        }
+        values = build_invoice_values(partner_id, invoice_lines, move_type, **kwargs)
         return self.create_data(model="account.move", values=values)
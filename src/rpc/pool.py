@@ -0,0 +1,163 @@
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from src.core.settings import get_settings
+from src.rpc.circuit_breaker import odoo_circuit_breaker
+from src.rpc.client import OdooClient
+from src.utils.exceptions import OdooError
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class OdooClientPool:
+    """
+    Process-wide registry of authenticated `OdooClient` instances.
+
+    Odoo is logged in to once, the UID is shared by every pooled client and each
+    client keeps its keep-alive connection between checkouts. A client is never
+    used by two threads at the same time, since `ServerProxy` is not thread-safe.
+    """
+
+    def __init__(
+        self,
+        max_size: int = settings.ODOO_POOL_MAX_SIZE,
+        acquire_timeout: float = settings.ODOO_POOL_ACQUIRE_TIMEOUT,
+    ):
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self._idle: queue.LifoQueue[OdooClient] = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._size = 0
+        self._in_use = 0
+        self._uid: Optional[int] = None
+        # stats
+        self.authentications = 0
+        self.acquire_timeouts = 0
+        self.last_authenticated_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def uid(self) -> Optional[int]:
+        return self._uid
+
+    def _on_authenticate(self, uid: int) -> None:
+        with self._lock:
+            self._uid = uid
+            self.authentications += 1
+            self.last_authenticated_at = time.time()
+
+    def _create_client(self) -> OdooClient:
+        return OdooClient(uid=self._uid, on_authenticate=self._on_authenticate)
+
+    def open(self) -> None:
+        """
+        Authenticate with Odoo and pre-warm one client.
+        Failures are logged only, the pool retries lazily on the next `acquire`.
+        """
+        if self._size:
+            return
+        try:
+            with self.acquire():
+                pass
+        except OdooError as err:
+            self.last_error = err.message
+            logger.warning(f"Odoo client pool warm-up failed: {err.message}")
+        except OSError as err:
+            self.last_error = str(err)
+            logger.warning(f"Odoo client pool warm-up failed: {err}")
+
+    def close(self) -> None:
+        """Close every idle client connection and forget the cached UID."""
+        while True:
+            try:
+                client = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                client.close()
+            except Exception:
+                logger.debug("Failed to close Odoo client", exc_info=True)
+            with self._lock:
+                self._size -= 1
+        self._uid = None
+
+    def _checkout(self) -> OdooClient:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_grow = self._size < self.max_size
+            if can_grow:
+                self._size += 1
+
+        if can_grow:
+            try:
+                return self._create_client()
+            except Exception as err:
+                with self._lock:
+                    self._size -= 1
+                self.last_error = str(err)
+                raise
+
+        try:
+            return self._idle.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            self.acquire_timeouts += 1
+            raise OdooError(
+                "Timed out waiting for a free Odoo client",
+                details={"max_size": self.max_size},
+            )
+
+    @contextmanager
+    def acquire(self) -> Iterator[OdooClient]:
+        """
+        Check out a client for exclusive use, blocks up to `acquire_timeout`
+        when every client is busy and the pool is at `max_size`.
+        """
+        client = self._checkout()
+        if self._uid is not None and client.uid != self._uid:
+            # another client re-authenticated in the meantime
+            client.uid = self._uid
+        with self._lock:
+            self._in_use += 1
+        try:
+            yield client
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._idle.put(client)
+
+    def health_check(self) -> bool:
+        """Ping Odoo with the `version` call using a pooled connection."""
+        try:
+            with self.acquire() as client:
+                client.version()
+        except Exception as err:
+            self.last_error = str(err)
+            return False
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "max_size": self.max_size,
+                "size": self._size,
+                "in_use": self._in_use,
+                "idle": self._idle.qsize(),
+                "authenticated": self._uid is not None,
+                "authentications": self.authentications,
+                "last_authenticated_at": self.last_authenticated_at,
+                "acquire_timeouts": self.acquire_timeouts,
+                "last_error": self.last_error,
+                "circuit_breaker": odoo_circuit_breaker.stats(),
+            }
+
+
+odoo_client_pool = OdooClientPool()
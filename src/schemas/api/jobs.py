@@ -0,0 +1,16 @@
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+
+class JobCreated(BaseModel):
+    job_id: str
+    status_url: str
+
+
+class JobStatus(BaseModel):
+    job_id: str
+    status: str
+    name: Optional[str] = None
+    result: Any = None
+    error: Optional[str] = None
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
@@ -5,3 +7,29 @@ class InvoiceCreatePayload(BaseModel):
     name: str
     quantity: int
     price_unit: float
+
+
+class ContactCreatePayload(BaseModel):
+    name: str
+    email: str
+    company_name: str
+
+
+class InvoiceBulkCreatePayload(BaseModel):
+    partner_id: int
+    invoice_lines: list[InvoiceCreatePayload]
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    # set along with `error` when the record exists in Odoo but not in the DB
+    odoo_id: Optional[int] = None
+    error: Optional[str] = None
+    # company created for a contact that failed and could not be removed
+    orphaned_company_id: Optional[int] = None
+
+
+class BulkCreateResult(BaseModel):
+    created: int
+    failed: int
+    items: list[BulkItemResult]
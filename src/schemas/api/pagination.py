@@ -0,0 +1,18 @@
+from typing import Generic, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    total_count: Optional[int] = None
+    next_page: Optional[str] = None
+    previous_page: Optional[str] = None
+    items: list[T]
+
+
+class CursorPage(BaseModel, Generic[T]):
+    next_cursor: Optional[str] = None
+    next_page: Optional[str] = None
+    items: list[T]
@@ -1,6 +1,8 @@
+from datetime import datetime
 from typing import Optional
+from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class OdooContactCreate(BaseModel):
@@ -35,3 +37,61 @@ class OdooInvoiceUpdate(BaseModel):
     amount_total: Optional[float] = None
     state: Optional[str] = None
     move_type: Optional[str] = None
+
+
+class OdooContactRead(BaseModel):
+    id: UUID
+    odoo_id: int
+    name: Optional[str] = None
+    email: Optional[str] = None
+    company_name: Optional[str] = None
+    company_id: Optional[list[int | str | dict] | bool] = None
+    is_company: bool
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class OdooInvoiceRead(BaseModel):
+    id: UUID
+    odoo_id: int
+    name: Optional[str] = None
+    partner_id: Optional[list[int | str | dict] | bool] = None
+    invoice_date: Optional[str] = None
+    amount_total: Optional[float] = None
+    state: Optional[str] = None
+    move_type: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class OdooContactPartialRead(BaseModel):
+    """Listing row, `fields=` limits it to `odoo_id` and the picked columns."""
+
+    id: Optional[UUID] = None
+    odoo_id: int
+    name: Optional[str] = None
+    email: Optional[str] = None
+    company_name: Optional[str] = None
+    company_id: Optional[list[int | str | dict] | bool] = None
+    is_company: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class OdooInvoicePartialRead(BaseModel):
+    """Listing row, `fields=` limits it to `odoo_id` and the picked columns."""
+
+    id: Optional[UUID] = None
+    odoo_id: int
+    name: Optional[str] = None
+    partner_id: Optional[list[int | str | dict] | bool] = None
+    invoice_date: Optional[str] = None
+    amount_total: Optional[float] = None
+    state: Optional[str] = None
+    move_type: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
@@ -0,0 +1,113 @@
+import csv
+import io
+import json
+import logging
+import zlib
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Literal, Sequence
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Column, Select
+
+from src.core.settings import get_settings
+from src.db.session import async_session
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+ExportFormat = Literal["ndjson", "csv"]
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+async def stream_rows(
+    query: Select,
+    columns: Sequence[Column],
+    export_format: ExportFormat,
+    batch_size: int = settings.EXPORT_BATCH_SIZE,
+) -> AsyncIterator[bytes]:
+    """
+    Stream the rows of `query` from a server-side cursor, one chunk per batch,
+    so memory stays flat whatever the number of rows.
+
+    Args:
+        query: filtered listing query, only `columns` are selected
+        columns: exported columns
+        export_format: `ndjson` (one JSON object per line) or `csv` (with header)
+        batch_size: rows fetched from the cursor and encoded per chunk
+    Yields:
+        bytes: encoded rows
+    """
+    names = [column.name for column in columns]
+    query = query.with_only_columns(*columns).execution_options(yield_per=batch_size)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if export_format == "csv":
+        writer.writerow(names)
+
+    exported = 0
+    # a dedicated session, the response outlives the request handler
+    async with async_session() as db:
+        result = await db.stream(query)
+        async for rows in result.partitions():
+            if export_format == "csv":
+                writer.writerows([_csv_value(value) for value in row] for row in rows)
+            else:
+                for row in rows:
+                    buffer.write(
+                        json.dumps(dict(zip(names, row)), default=_json_default)
+                    )
+                    buffer.write("\n")
+            exported += len(rows)
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if export_format == "csv" and not exported:
+        yield buffer.getvalue().encode()
+    logger.info(f"exported {exported} rows as {export_format}")
+
+
+async def _gzip(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)  # gzip container
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_response(
+    query: Select,
+    columns: Sequence[Column],
+    export_format: ExportFormat,
+    filename: str,
+    compress: bool = False,
+) -> StreamingResponse:
+    """
+    `StreamingResponse` downloading `query` rows as `<filename>.<format>`,
+    gzip-compressed when `compress` is set.
+    """
+    chunks = stream_rows(query, columns, export_format)
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}.{export_format}"'
+    }
+    if compress:
+        chunks = _gzip(chunks)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        chunks, media_type=MEDIA_TYPES[export_format], headers=headers
+    )
@@ -1,22 +1,125 @@
-from typing import Annotated
+import asyncio
+import logging
+from typing import Annotated, Awaitable, Callable, Optional
 
 from fastapi import Depends, HTTPException
+from pydantic import BaseModel
 
+from src.core.cache import bump_table_versions
+from src.core.redis_client import AsyncRedisClient, redis_cache_client
+from src.core.settings import get_settings
 from src.db.session import AsyncDBSession
 from src.repositories.contacts import odoo_contact_repository
 from src.repositories.invoices import odoo_invoice_repository
-from src.rpc.client import OdooClient
-from src.schemas.api.odoo import InvoiceCreatePayload
+from src.rpc.async_client import AsyncOdooClient, async_odoo_client
+from src.rpc.client import OdooClient, build_contact_values, build_invoice_values
+from src.schemas.api.odoo import (
+    BulkCreateResult,
+    BulkItemResult,
+    ContactCreatePayload,
+    InvoiceBulkCreatePayload,
+    InvoiceCreatePayload,
+)
 from src.schemas.odoo.schemas import (
     OdooContactCreate,
     OdooContactUpdate,
     OdooInvoiceCreate,
 )
+from src.utils.exceptions import OdooCircuitOpenError, OdooError, OdooFaultError
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+CONTACTS_TABLE = odoo_contact_repository.model.__tablename__
+INVOICES_TABLE = odoo_invoice_repository.model.__tablename__
+
+
+class BaseOdooService:
+    """DB side of the Odoo integration, shared by the sync and async services."""
+
+    # client used to invalidate the API caches of written tables, None when the
+    # caller invalidates them itself
+    cache_client: Optional[AsyncRedisClient] = None
+
+    async def _invalidate(self, table: str) -> None:
+        if self.cache_client is not None:
+            await bump_table_versions(table, client=self.cache_client)
+
+    async def insert_contact(self, db: AsyncDBSession, obj_in: OdooContactCreate):
+        contact = await odoo_contact_repository.create(
+            db=db,
+            obj_in=obj_in,
+        )
+        await self._invalidate(CONTACTS_TABLE)
+        return contact
+
+    async def insert_invoice(self, db: AsyncDBSession, obj_in: OdooInvoiceCreate):
+        invoice = await odoo_invoice_repository.create(
+            db=db,
+            obj_in=obj_in,
+        )
+        await self._invalidate(INVOICES_TABLE)
+        return invoice
 
+    @staticmethod
+    def invoice_row(odoo_id: int, partner_id: int) -> OdooInvoiceCreate:
+        """Local row of an invoice created through the API."""
+        return OdooInvoiceCreate(
+            odoo_id=odoo_id,
+            # odoo many2one values are [id, display name], the name isn't known here
+            partner_id=[partner_id],
+            move_type="out_invoice",
+        )
+
+    async def update_contact_in_db(
+        self, db: AsyncDBSession, contact_id: int, obj_in: OdooContactUpdate
+    ):
+        db_obj = await odoo_contact_repository.get(db, contact_id)
+        contact = await odoo_contact_repository.update(db, db_obj=db_obj, obj_in=obj_in)
+        await self._invalidate(CONTACTS_TABLE)
+        return contact
+
+    async def delete_contact(self, db: AsyncDBSession, contact_id: int):
+        db_obj = await odoo_contact_repository.get(db, contact_id)
+        if not db_obj:
+            raise HTTPException(status_code=404, detail="Contact not found")
+        contact = await odoo_contact_repository.delete(db, db_obj)
+        await self._invalidate(CONTACTS_TABLE)
+        return contact
+
+    async def insert_contacts(
+        self, db: AsyncDBSession, rows: list[OdooContactCreate]
+    ) -> int:
+        """Insert contacts with a single multi-row statement."""
+        changed = await odoo_contact_repository.bulk_upsert(
+            db, rows, conflict_cols=["odoo_id"]
+        )
+        await self._invalidate(CONTACTS_TABLE)
+        return changed
+
+    async def insert_invoices(
+        self, db: AsyncDBSession, rows: list[OdooInvoiceCreate]
+    ) -> int:
+        """Insert invoices with a single multi-row statement."""
+        changed = await odoo_invoice_repository.bulk_upsert(
+            db, rows, conflict_cols=["odoo_id"]
+        )
+        await self._invalidate(INVOICES_TABLE)
+        return changed
 
-class OdooService:
-    def __init__(self):
-        self.client = OdooClient()  # normally injected via DI
+
+class OdooService(BaseOdooService):
+    """
+    Service backed by the blocking `OdooClient`, used by Celery workers.
+    Caches are not invalidated unless `cache_client` is given, the module-level
+    Redis client is not connected in the workers.
+    """
+
+    def __init__(
+        self, client: OdooClient, cache_client: Optional[AsyncRedisClient] = None
+    ):
+        self.client = client
+        self.cache_client = cache_client
 
     def get_contacts_from_odoo(self, limit: int = 100, offset: int = 0) -> list[dict]:
         return self.client.get_contacts(limit=limit, offset=offset)
@@ -48,30 +151,6 @@ class OdooService:
             await self.insert_contact(db, obj_in=obj_in)
         return id_
 
-    async def insert_contact(self, db: AsyncDBSession, obj_in: OdooContactCreate):
-        return await odoo_contact_repository.create(
-            db=db,
-            obj_in=obj_in,
-        )
-
-    async def insert_invoice(self, db: AsyncDBSession, obj_in: OdooInvoiceCreate):
-        return await odoo_invoice_repository.create(
-            db=db,
-            obj_in=obj_in,
-        )
-
-    async def update_contact_in_db(
-        self, db: AsyncDBSession, contact_id: int, obj_in: OdooContactUpdate
-    ):
-        db_obj = await odoo_contact_repository.get(db, contact_id)
-        return await odoo_contact_repository.update(db, db_obj=db_obj, obj_in=obj_in)
-
-    async def delete_contact(self, db: AsyncDBSession, contact_id: int):
-        db_obj = await odoo_contact_repository.get(db, contact_id)
-        if not db_obj:
-            raise HTTPException(status_code=404, detail="Contact not found")
-        return await odoo_contact_repository.delete(db, db_obj)
-
     def get_invoices_from_odoo(self, limit: int = 100, offset: int = 0) -> list[dict]:
         return self.client.get_invoices(limit=limit, offset=offset)
 
@@ -88,11 +167,291 @@ class OdooService:
     ) -> int:
         id_ = self.create_invoice(partner_id, invoice_lines)
         if id_:
-            obj_in = OdooInvoiceCreate(
-                odoo_id=id_, partner_id=partner_id, invoice_lines=invoice_lines
+            await self.insert_invoice(db, obj_in=self.invoice_row(id_, partner_id))
+        return id_
+
+
+class AsyncOdooService(BaseOdooService):
+    """Service backed by `AsyncOdooClient`, used by API handlers."""
+
+    def __init__(
+        self,
+        client: AsyncOdooClient,
+        cache_client: Optional[AsyncRedisClient] = redis_cache_client,
+    ):
+        self.client = client
+        self.cache_client = cache_client
+
+    async def get_contacts_from_odoo(
+        self, limit: int = 100, offset: int = 0
+    ) -> list[dict]:
+        return await self.client.get_contacts(limit=limit, offset=offset)
+
+    async def version(self) -> dict:
+        return await self.client.version()
+
+    async def create_contact(self, name: str, email: str, company_name: str) -> int:
+        return await self.client.create_contact(name, email, company_name)
+
+    async def create_and_insert_contact(
+        self, db: AsyncDBSession, name: str, email: str, company_name: str
+    ) -> int:
+        """
+        Create a contact in Odoo and insert it into the database.
+        Args:
+            db: AsyncDBSession
+            name: str
+            email: str
+            company_name: str
+        Returns:
+            int: Odoo API contact ID
+        """
+        id_ = await self.create_contact(name, email, company_name)
+        if id_:
+            obj_in = OdooContactCreate(
+                odoo_id=id_, name=name, email=email, company_name=company_name
             )
-            await self.insert_invoice(db, obj_in=obj_in)
+            await self.insert_contact(db, obj_in=obj_in)
         return id_
 
+    async def get_invoices_from_odoo(
+        self, limit: int = 100, offset: int = 0
+    ) -> list[dict]:
+        return await self.client.get_invoices(limit=limit, offset=offset)
+
+    async def create_invoice(
+        self, partner_id: int, invoice_lines: list[InvoiceCreatePayload]
+    ) -> int:
+        return await self.client.create_invoice(partner_id, invoice_lines)
+
+    async def create_and_insert_invoice(
+        self,
+        db: AsyncDBSession,
+        partner_id: int,
+        invoice_lines: list[InvoiceCreatePayload],
+    ) -> int:
+        id_ = await self.create_invoice(partner_id, invoice_lines)
+        if id_:
+            await self.insert_invoice(db, obj_in=self.invoice_row(id_, partner_id))
+        return id_
+
+    @staticmethod
+    def _create_error(err: BaseException) -> Exception:
+        """
+        Faults and an open circuit mean nothing was created. After other errors
+        (network, timeouts, 5xx) the records may exist in Odoo anyway.
+        """
+        if isinstance(err, (OdooFaultError, OdooCircuitOpenError)):
+            return err
+        return OdooError(f"outcome unknown, the record may have been created: {err}")
+
+    async def _create_with_fallback(
+        self, model: str, values: list[dict]
+    ) -> list[int | Exception]:
+        """
+        Create records in one Odoo call. Odoo creates them in one transaction,
+        so when it rejects the call with a fault, each record is retried on its
+        own to find the ones to blame. Other errors are reported for every
+        record without a retry, `create` is not idempotent.
+
+        Returns:
+            list[int | Exception]: Odoo ID or error, in the order of `values`
+        """
+        if not values:
+            return []
+        try:
+            return await self.client.create_many(model, values)
+        except OdooFaultError as err:
+            if len(values) == 1:
+                return [err]
+            logger.warning(
+                f"bulk create of {len(values)} {model} failed, retrying one by one:"
+                f" {err}"
+            )
+        except Exception as err:
+            logger.warning(f"bulk create of {len(values)} {model} failed: {err}")
+            return [self._create_error(err)] * len(values)
+        results = await asyncio.gather(
+            *(self.client.create_many(model, [value]) for value in values),
+            return_exceptions=True,
+        )
+        return [
+            result[0] if isinstance(result, list) else self._create_error(result)
+            for result in results
+        ]
+
+    async def _remove_companies(self, company_ids: list[int]) -> bool:
+        """Unlink companies created for contacts that failed, best effort."""
+        if not company_ids:
+            return True
+        try:
+            await self.client.delete_many("res.partner", company_ids)
+        except Exception as err:
+            logger.warning(f"failed to remove orphaned companies {company_ids}: {err}")
+            return False
+        return True
+
+    @staticmethod
+    def _chunks(items: list, size: int = settings.ODOO_BULK_CHUNK_SIZE):
+        for start in range(0, len(items), size):
+            yield items[start : start + size]
+
+    async def _store_chunk(
+        self,
+        db: AsyncDBSession,
+        insert: Callable[[AsyncDBSession, list], Awaitable[int]],
+        rows: list[tuple[int, BaseModel]],
+        unsaved: dict[int, str],
+    ) -> None:
+        """
+        Insert the `(index, row)` pairs of a chunk already created in Odoo. On a
+        DB error the chunk is rolled back and its items are reported as failed
+        with their Odoo ID, so the caller can tell they exist in Odoo.
+        """
+        if not rows:
+            return
+        try:
+            await insert(db, [row for _, row in rows])
+        except Exception as err:
+            await db.rollback()
+            logger.error(f"failed to store {len(rows)} records created in Odoo: {err}")
+            for index, _ in rows:
+                unsaved[index] = f"created in Odoo but not stored locally: {err}"
+
+    @staticmethod
+    def _bulk_result(
+        results: list[int | Exception],
+        orphaned_companies: Optional[dict[int, int]] = None,
+        unsaved: Optional[dict[int, str]] = None,
+    ) -> BulkCreateResult:
+        orphaned_companies = orphaned_companies or {}
+        unsaved = unsaved or {}
+        items = [
+            BulkItemResult(
+                index=index,
+                error=str(result),
+                orphaned_company_id=orphaned_companies.get(index),
+            )
+            if isinstance(result, Exception)
+            else BulkItemResult(index=index, odoo_id=result, error=unsaved.get(index))
+            for index, result in enumerate(results)
+        ]
+        failed = sum(1 for item in items if item.error)
+        return BulkCreateResult(created=len(items) - failed, failed=failed, items=items)
+
+    async def create_and_insert_contacts_bulk(
+        self, db: AsyncDBSession, contacts: list[ContactCreatePayload]
+    ) -> BulkCreateResult:
+        """
+        Create contacts (and their companies) in Odoo in chunks of
+        `ODOO_BULK_CHUNK_SIZE`, two Odoo calls per chunk, and insert the created
+        ones into the database with one statement per chunk. Companies of
+        contacts that failed are removed again, or reported when that's not
+        possible or the contact may exist after all. Contacts of a chunk whose
+        insert fails are reported as failed along with their Odoo ID.
+        Args:
+            db: AsyncDBSession
+            contacts: list[ContactCreatePayload]
+        Returns:
+            BulkCreateResult: Odoo ID or error of every contact
+        """
+        results: list[int | Exception] = []
+        # index -> company left in Odoo for a failed contact
+        orphaned_companies: dict[int, int] = {}
+        # index -> error of a contact created in Odoo but not in the DB
+        unsaved: dict[int, str] = {}
+        for chunk in self._chunks(contacts):
+            company_ids = await self._create_with_fallback(
+                "res.partner",
+                [
+                    {"name": contact.company_name, "is_company": True}
+                    for contact in chunk
+                ],
+            )
+            # contacts whose company could not be created are not sent
+            pending = [
+                (position, contact, company_id)
+                for position, (contact, company_id) in enumerate(
+                    zip(chunk, company_ids)
+                )
+                if not isinstance(company_id, Exception)
+            ]
+            contact_ids = await self._create_with_fallback(
+                "res.partner",
+                [
+                    build_contact_values(contact.name, contact.email, company_id)
+                    for _, contact, company_id in pending
+                ],
+            )
+            chunk_results: list[int | Exception] = list(company_ids)
+            # companies of failed contacts, removed unless the contact may exist
+            removable: dict[int, int] = {}
+            for (position, _, company_id), contact_id in zip(pending, contact_ids):
+                chunk_results[position] = contact_id
+                if not isinstance(contact_id, Exception):
+                    continue
+                if isinstance(contact_id, (OdooFaultError, OdooCircuitOpenError)):
+                    removable[position] = company_id
+                else:
+                    orphaned_companies[len(results) + position] = company_id
+            if not await self._remove_companies(list(removable.values())):
+                for position, company_id in removable.items():
+                    orphaned_companies[len(results) + position] = company_id
+
+            rows = [
+                (
+                    len(results) + position,
+                    OdooContactCreate(
+                        odoo_id=odoo_id,
+                        name=contact.name,
+                        email=contact.email,
+                        company_name=contact.company_name,
+                    ),
+                )
+                for position, (contact, odoo_id) in enumerate(zip(chunk, chunk_results))
+                if not isinstance(odoo_id, Exception)
+            ]
+            await self._store_chunk(db, self.insert_contacts, rows, unsaved)
+            results.extend(chunk_results)
+        return self._bulk_result(results, orphaned_companies, unsaved)
+
+    async def create_and_insert_invoices_bulk(
+        self, db: AsyncDBSession, invoices: list[InvoiceBulkCreatePayload]
+    ) -> BulkCreateResult:
+        """
+        Create invoices in Odoo in chunks of `ODOO_BULK_CHUNK_SIZE`, one Odoo call
+        per chunk, and insert the created ones into the database with one
+        statement per chunk. Invoices of a chunk whose insert fails are reported
+        as failed along with their Odoo ID.
+        Args:
+            db: AsyncDBSession
+            invoices: list[InvoiceBulkCreatePayload]
+        Returns:
+            BulkCreateResult: Odoo ID or error of every invoice
+        """
+        results: list[int | Exception] = []
+        # index -> error of an invoice created in Odoo but not in the DB
+        unsaved: dict[int, str] = {}
+        for chunk in self._chunks(invoices):
+            chunk_results = await self._create_with_fallback(
+                "account.move",
+                [
+                    build_invoice_values(invoice.partner_id, invoice.invoice_lines)
+                    for invoice in chunk
+                ],
+            )
+            rows = [
+                (len(results) + position, self.invoice_row(odoo_id, invoice.partner_id))
+                for position, (invoice, odoo_id) in enumerate(zip(chunk, chunk_results))
+                if not isinstance(odoo_id, Exception)
+            ]
+            await self._store_chunk(db, self.insert_invoices, rows, unsaved)
+            results.extend(chunk_results)
+        return self._bulk_result(results, unsaved=unsaved)
+
+
+async def get_async_odoo_service() -> AsyncOdooService:
+    return AsyncOdooService(async_odoo_client)
+
 
-OdooServiceDep = Annotated[OdooService, Depends(OdooService)]
+OdooServiceDep = Annotated[AsyncOdooService, Depends(get_async_odoo_service)]
@@ -0,0 +1,238 @@
+import asyncio
+import functools
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from src.core.settings import get_settings
+from src.rpc.client import OdooClient
+from src.rpc.pool import OdooClientPool, odoo_client_pool
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+CountFn = Callable[[OdooClient], int]
+FetchPageFn = Callable[[OdooClient, int, int], list[dict]]
+SearchIdsFn = Callable[[OdooClient, int, int], list[int]]
+FetchIdsFn = Callable[[OdooClient, list[int]], list[dict]]
+# returns the next page fetch to run on the thread pool, None when done
+NextJobFn = Callable[[], Awaitable[Optional[Callable[[], tuple[int, list[dict]]]]]]
+
+
+class OdooPageTraversal:
+    """
+    Walks a whole Odoo dataset page by page.
+
+    `search_count` plans the page set up front, pages are then fetched
+    concurrently on a thread pool (each thread checks out its own client from
+    `OdooClientPool`) and yielded in completion order, so the DB writer can
+    consume a page while the next ones are still in flight. The number of
+    fetched-but-not-consumed pages is bounded to keep memory flat.
+
+    Usage:
+    ```
+    traversal = OdooPageTraversal(
+        count=lambda client: client.get_count("res.partner", []),
+        fetch_page=lambda client, limit, offset: client.get_partners(
+            limit=limit, offset=offset, order="id"
+        ),
+    )
+    async for page in traversal.iter_pages():
+        ...
+    ```
+    """
+
+    def __init__(
+        self,
+        count: CountFn,
+        fetch_page: FetchPageFn,
+        page_size: int = settings.ODOO_SYNC_PAGE_SIZE,
+        workers: int = settings.ODOO_SYNC_WORKERS,
+        pool: Optional[OdooClientPool] = None,
+    ):
+        """
+        Args:
+            count: returns the total number of records to traverse
+            fetch_page: returns records for the given `limit` and `offset`,
+                should use a stable order (e.g. by id)
+            page_size: number of records per page
+            workers: number of pages fetched concurrently
+            pool: Odoo client pool, process-wide pool by default
+        """
+        self.count = count
+        self.fetch_page = fetch_page
+        self.page_size = page_size
+        self.workers = workers
+        self.pool = pool or odoo_client_pool
+        # stats
+        self.total_count = 0
+        self.fetched_pages = 0
+        self.fetched_records = 0
+
+    def _get_total_count(self) -> int:
+        with self.pool.acquire() as client:
+            return self.count(client)
+
+    def _fetch(self, offset: int) -> tuple[int, list[dict]]:
+        # transient errors are retried by the client (`ODOO_RPC_RETRIES`), faults
+        # and an open circuit fail the page right away
+        with self.pool.acquire() as client:
+            return offset, self.fetch_page(client, self.page_size, offset)
+
+    async def iter_pages(self) -> AsyncIterator[list[dict]]:
+        """
+        Yield non-empty pages in the order they arrive.
+        Raises the error of the first page that failed.
+        """
+        async for _, page in self.iter_indexed_pages():
+            if page:
+                yield page
+
+    async def iter_indexed_pages(self) -> AsyncIterator[tuple[int, list[dict]]]:
+        """
+        Yield `(offset, page)` pairs in the order they arrive, empty pages included,
+        so callers can track which part of the dataset is done.
+        """
+        self.total_count = await asyncio.to_thread(self._get_total_count)
+        offsets = iter(range(0, self.total_count, self.page_size))
+        logger.info(
+            f"traversing {self.total_count} odoo records, page size "
+            f"{self.page_size}, {self.workers} workers"
+        )
+
+        async def next_job():
+            offset = next(offsets, None)
+            return None if offset is None else functools.partial(self._fetch, offset)
+
+        async for item in self._run(next_job):
+            yield item
+
+    async def _run(self, next_job: NextJobFn) -> AsyncIterator[tuple[int, list[dict]]]:
+        loop = asyncio.get_running_loop()
+        max_pending = self.workers * 2
+        pending: set[asyncio.Future] = set()
+
+        async def submit_next() -> bool:
+            job = await next_job()
+            if job is None:
+                return False
+            pending.add(loop.run_in_executor(executor, job))
+            return True
+
+        executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="odoo-traversal"
+        )
+        try:
+            while len(pending) < max_pending and await submit_next():
+                pass
+
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    key, page = future.result()
+                    await submit_next()
+                    self.fetched_pages += 1
+                    self.fetched_records += len(page)
+                    yield key, page
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+class OdooKeysetTraversal(OdooPageTraversal):
+    """
+    Walks an Odoo dataset in id order, by keyset instead of offsets.
+
+    Ids are listed with `search` after the last listed id, a batch of pages at
+    a time, and the records of each page of ids are read concurrently like
+    `OdooPageTraversal` pages. Records entering or leaving the domain while it
+    runs (e.g. modified under a `write_date` domain) can't shift the pages
+    like they shift offsets, so none of the matching records is skipped.
+
+    Usage:
+    ```
+    traversal = OdooKeysetTraversal(
+        count=lambda client: client.get_count("res.partner", domain),
+        search_ids=lambda client, after_id, limit: client.search_ids(
+            "res.partner", domain + [("id", ">", after_id)], limit, order="id"
+        ),
+        fetch_ids=lambda client, ids: client.get_partners(
+            [("id", "in", ids)], limit=len(ids), order="id"
+        ),
+    )
+    async for page in traversal.iter_pages():
+        ...
+    ```
+    """
+
+    def __init__(
+        self,
+        count: CountFn,
+        search_ids: SearchIdsFn,
+        fetch_ids: FetchIdsFn,
+        page_size: int = settings.ODOO_SYNC_PAGE_SIZE,
+        workers: int = settings.ODOO_SYNC_WORKERS,
+        pool: Optional[OdooClientPool] = None,
+    ):
+        """
+        Args:
+            count: returns the number of records to traverse, only for progress
+            search_ids: returns up to `limit` ids greater than `after_id`,
+                in ascending order
+            fetch_ids: returns the records of the given ids
+            page_size: number of records per page
+            workers: number of pages fetched concurrently
+            pool: Odoo client pool, process-wide pool by default
+        """
+        super().__init__(
+            count=count,
+            fetch_page=None,  # pages are read by id, see `fetch_ids`
+            page_size=page_size,
+            workers=workers,
+            pool=pool,
+        )
+        self.search_ids = search_ids
+        self.fetch_ids = fetch_ids
+
+    def _search(self, after_id: int, limit: int) -> list[int]:
+        with self.pool.acquire() as client:
+            return self.search_ids(client, after_id, limit)
+
+    def _fetch_ids(self, ids: list[int]) -> tuple[int, list[dict]]:
+        with self.pool.acquire() as client:
+            return ids[0], self.fetch_ids(client, ids)
+
+    async def iter_indexed_pages(self) -> AsyncIterator[tuple[int, list[dict]]]:
+        """
+        Yield `(first id, page)` pairs in the order they arrive.
+        """
+        self.total_count = await asyncio.to_thread(self._get_total_count)
+        logger.info(
+            f"traversing ~{self.total_count} odoo records by id, page size "
+            f"{self.page_size}, {self.workers} workers"
+        )
+        # ids of a few pages per `search`, enough to keep the workers busy
+        batch_size = self.page_size * self.workers * 2
+        ids: deque[int] = deque()
+        last_id = 0
+        exhausted = False
+
+        async def next_job():
+            nonlocal last_id, exhausted
+            if not ids and not exhausted:
+                found = await asyncio.to_thread(self._search, last_id, batch_size)
+                exhausted = len(found) < batch_size
+                if found:
+                    last_id = found[-1]
+                    ids.extend(found)
+            if not ids:
+                return None
+            page = [ids.popleft() for _ in range(min(self.page_size, len(ids)))]
+            return functools.partial(self._fetch_ids, page)
+
+        async for item in self._run(next_job):
+            yield item
@@ -1,5 +1,8 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional
+from typing import Any, Callable, Optional, TypeVar
 
 import jwt
 from passlib.context import CryptContext
@@ -7,16 +10,73 @@ from passlib.context import CryptContext
 from src.core.settings import get_settings
 
 settings = get_settings()
+T = TypeVar("T")
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# hashes with another cost factor are flagged by `verify_and_update` for a rehash
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated thread pool, off the event loop.
 
+    bcrypt releases the GIL while hashing, so threads run in parallel and the
+    pool size caps how many CPU cores a login burst can take. Calls beyond the cap
+    wait in the executor queue, its depth is exposed by `stats`.
+    """
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    def __init__(self, max_workers: int = settings.PASSWORD_HASH_WORKERS):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hash"
+        )
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.running = 0
+
+    async def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        def run() -> T:
+            with self._lock:
+                self.running += 1
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self.running -= 1
+
+        self.submitted += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, run)
+        finally:
+            self.submitted -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify_and_update(
+        self, password: str, hashed_password: str
+    ) -> tuple[bool, Optional[str]]:
+        """
+        Returns:
+            tuple[bool, Optional[str]]: whether the password matches, and a new hash
+                when the stored one uses an outdated scheme or cost factor
+        """
+        return await self._run(pwd_context.verify_and_update, password, hashed_password)
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "running": self.running,
+            "queued": self.submitted - self.running,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher()
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
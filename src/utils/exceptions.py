@@ -13,9 +13,17 @@ class OdooError(Exception):
 
 class OdooProtocolError(OdooError):
     """Exception raised for HTTP protocol errors (e.g. 400 Bad Request)"""
+
     pass
 
 
 class OdooFaultError(OdooError):
     """Exception raised for Odoo-level faults (e.g. Access Denied, Invalid Domain)"""
+
+    pass
+
+
+class OdooCircuitOpenError(OdooError):
+    """Exception raised without calling Odoo while the circuit breaker is open"""
+
     pass
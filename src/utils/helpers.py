@@ -0,0 +1,30 @@
+from typing import Optional, Sequence
+
+from fastapi import HTTPException, status
+
+
+def parse_fields(
+    fields: Optional[str], allowed: Sequence[str], always: Sequence[str] = ()
+) -> tuple[str, ...]:
+    """
+    Parse a comma separated `fields` query parameter into column names.
+
+    Args:
+        fields: e.g. "name,email", every allowed column when empty
+        allowed: selectable columns, in response order
+        always: columns selected even when not asked for, e.g. the cursor key
+    Returns:
+        tuple[str, ...]: selected columns, in the order of `allowed`
+    """
+    if not fields:
+        return tuple(allowed)
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}. "
+            f"Allowed: {', '.join(allowed)}",
+        )
+    requested.update(always)
+    return tuple(name for name in allowed if name in requested)
@@ -0,0 +1,29 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+def _default(value: Any) -> Any:
+    # orjson natively handles dicts, lists, datetimes, UUIDs and dataclasses
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class JSONResponse(ORJSONResponse):
+    """
+    orjson-backed response, also renders pydantic models found in the content.
+    Returned directly from a handler, it skips FastAPI's `jsonable_encoder`.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)